@@ -8,6 +8,7 @@ from .helpers.snippet_helpers import get_snippet_urls, get_modelviewset_urls
 from .helpers.modeladmin_helpers import get_modeladmin_urls
 from .helpers.settings_helpers import get_settings_admin_urls
 from .helpers.media_helpers import get_image_admin_urls, get_document_admin_urls
+from .helpers.shard_helpers import filter_shard, parse_shard
 
 
 class UnveilApiView(View):
@@ -21,6 +22,12 @@ class UnveilApiView(View):
         max_instances = int(request.GET.get('max_instances', getattr(settings, 'WAGTAIL_UNVEIL_MAX_INSTANCES', 1)))
         base_url = request.GET.get('base_url', "http://localhost:8000")
         group_by = request.GET.get('group_by', '').lower()
+        shard = request.GET.get('shard', '')
+        if shard:
+            try:
+                shard = parse_shard(shard)
+            except ValueError as e:
+                return JsonResponse({'error': str(e)}, status=400)
         
         # Collect all URLs
         urls_data = []
@@ -88,6 +95,17 @@ class UnveilApiView(View):
                 'url': url
             })
         
+        # Only keep the URLs of the requested shard, e.g. ?shard=2/4
+        if shard:
+            urls_data = filter_shard(
+                [(item['model_name'], item['url_type'], item['url']) for item in urls_data],
+                *shard,
+            )
+            urls_data = [
+                {'model_name': model_name, 'url_type': url_type, 'url': url}
+                for model_name, url_type, url in urls_data
+            ]
+        
         # Count backend and frontend URLs regardless of grouping
         backend_urls = []
         frontend_urls = []
@@ -112,6 +130,7 @@ class UnveilApiView(View):
                 'max_instances': max_instances,
                 'base_url': base_url,
                 'group_by': group_by if group_by else 'none',
+                'shard': f'{shard[0]}/{shard[1]}' if shard else None,
                 'backend_count': len(backend_urls),
                 'frontend_count': len(frontend_urls),
                 'total_urls': len(urls_data)  # Total URLs collected
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class WagtailUnveilAppConfig(AppConfig):
+    name = "wagtail_unveil"
+    label = "wagtail_unveil"
+    verbose_name = "Wagtail Unveil"
+    default_auto_field = "django.db.models.BigAutoField"
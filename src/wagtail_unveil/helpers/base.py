@@ -1,6 +1,42 @@
+import hashlib
+from collections import namedtuple
+from urllib.parse import urlsplit
+
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import DatabaseError, OperationalError
 
+from .change_helpers import filter_changed
+
+
+class UrlRecord(namedtuple("UrlRecord", ["model_name", "url_type", "url"])):
+    """
+    A discovered URL. It behaves like the plain (model_name, url_type, url)
+    tuple the helpers have always returned.
+    """
+
+    __slots__ = ()
+
+    @property
+    def model(self):
+        """The model part of the display name, without the instance name."""
+        return get_model_label(self.model_name)
+
+    @property
+    def url_id(self):
+        """The stable ID of the URL, see get_url_id."""
+        return get_url_id(self.url)
+
+
+def get_url_id(url):
+    """
+    Return a stable ID for a URL to match it across runs and machines.
+
+    The ID is a hash of the URL path and query string, so it doesn't change
+    with the base URL the URLs were checked against.
+    """
+    parts = urlsplit(url)
+    return hashlib.sha1(f"{parts.path}?{parts.query}".encode()).hexdigest()[:16]
+
 
 def safe_query(
     output, query_func, fallback_value=None, model_name=None, error_msg=None
@@ -55,7 +91,7 @@ def safe_import(output, import_func, fallback_value=None, error_msg=None):
         return fallback_value
 
 
-def get_instance_sample(output, model, max_instances=1):
+def get_instance_sample(output, model, max_instances=1, since=None):
     """
     Get a sample of instances from a model with proper error handling.
 
@@ -63,19 +99,19 @@ def get_instance_sample(output, model, max_instances=1):
         output: The stdout writer from the command
         model: The model class to query
         max_instances: Maximum number of instances to return (0 for all)
+        since: Optional datetime, only return instances that changed since then
 
     Returns:
         A queryset of model instances or an empty list if the query fails
     """
-    if max_instances is not None and max_instances > 0:
-
-        def query_func():
-            return model.objects.all()[:max_instances]
-
-    else:
 
-        def query_func():
-            return model.objects.all()
+    def query_func():
+        queryset = model.objects.all()
+        if since is not None:
+            queryset = filter_changed(queryset, since)
+        if max_instances is not None and max_instances > 0:
+            return queryset[:max_instances]
+        return queryset
 
     return safe_query(
         output,
@@ -132,13 +168,28 @@ def format_url_tuple(model_name, instance_name=None, url_type="list", url=None):
         url: The actual URL
 
     Returns:
-        A tuple formatted as (display_name, url_type, url)
+        A UrlRecord formatted as (display_name, url_type, url)
     """
     display_name = model_name
     if instance_name:
         display_name = f"{model_name} ({instance_name})"
 
-    return (display_name, url_type, url)
+    return UrlRecord(display_name, url_type, url)
+
+
+def get_model_label(display_name):
+    """
+    Strip the instance name or note added to a display name.
+
+    Args:
+        display_name: A display name such as "home.homepage (Home)"
+
+    Returns:
+        The model part of the display name, e.g. "home.homepage"
+    """
+    if display_name.endswith(")") and " (" in display_name:
+        return display_name[: display_name.index(" (")]
+    return display_name
 
 
 def truncate_instance_name(instance_name, max_length=50):
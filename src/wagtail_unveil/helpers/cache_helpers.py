@@ -0,0 +1,210 @@
+import sqlite3
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+from .base import UrlRecord
+from .check_helpers import DEFAULT_TIMEOUT, CheckResult, check_url_with_session
+from .stats_helpers import format_size
+
+DEFAULT_CACHE_FILE = ".unveil_cache.sqlite3"
+
+# Seconds a healthy result is reused without requesting the URL again
+DEFAULT_CACHE_TTL = 3600
+
+# Number of results written between two commits
+COMMIT_EVERY = 100
+
+
+def get_cache_scope(base_url, username=None, in_process=False):
+    """
+    Return the part of the cache key identifying who checked which site.
+
+    The URL ID only covers the path and query, so results of staging,
+    production, anonymous and authenticated runs are kept apart by the host
+    of the base URL, the user and how the URLs were checked.
+    """
+    mode = "in-process" if in_process else "http"
+    return f"{urlsplit(base_url or '').netloc}|{username or ''}|{mode}"
+
+
+class CheckCache:
+    """
+    A local SQLite cache of the last check of each URL, keyed by its scope and URL ID.
+
+    It keeps the status, ETag, Last-Modified, response time and size of the
+    latest response, so reruns can skip URLs checked recently and revalidate
+    the others with conditional requests. Only results of the same base URL
+    host, user and check mode are reused, see get_cache_scope. The cache can
+    be shared by the checking threads of one process.
+    """
+
+    def __init__(
+        self,
+        path=DEFAULT_CACHE_FILE,
+        ttl=DEFAULT_CACHE_TTL,
+        base_url=None,
+        username=None,
+        in_process=False,
+    ):
+        self.ttl = ttl
+        self.scope = get_cache_scope(base_url, username, in_process)
+        self.lock = threading.Lock()
+        self.pending_writes = 0
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        columns = [row["name"] for row in self.connection.execute("PRAGMA table_info(check_results)")]
+        if columns and "scope" not in columns:
+            # Cache files of earlier versions keyed results by URL ID alone
+            self.connection.execute("DROP TABLE check_results")
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS check_results (
+                scope TEXT NOT NULL,
+                url_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                status TEXT NOT NULL,
+                status_code INTEGER,
+                etag TEXT,
+                last_modified TEXT,
+                total REAL,
+                size INTEGER,
+                checked_at REAL NOT NULL,
+                PRIMARY KEY (scope, url_id)
+            )
+            """
+        )
+        self.connection.commit()
+
+    def get(self, url_id):
+        """Return the cached row of a URL ID in this scope, or None if it was never checked."""
+        with self.lock:
+            return self.connection.execute(
+                "SELECT * FROM check_results WHERE scope = ? AND url_id = ?", (self.scope, url_id)
+            ).fetchone()
+
+    def is_fresh(self, row, now=None):
+        """Whether a cached row is a healthy result younger than the TTL."""
+        now = time.time() if now is None else now
+        return row["status"] == "OK" and now - row["checked_at"] < self.ttl
+
+    def set(self, record, result, etag=None, last_modified=None):
+        """Store the latest check of a URL."""
+        record = UrlRecord(*record[:3])
+        with self.lock:
+            self.connection.execute(
+                """
+                INSERT OR REPLACE INTO check_results
+                (scope, url_id, url, status, status_code, etag, last_modified, total, size, checked_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    self.scope,
+                    record.url_id,
+                    record.url,
+                    result.status,
+                    result.status_code,
+                    etag,
+                    last_modified,
+                    result.total,
+                    result.size,
+                    time.time(),
+                ),
+            )
+            self.pending_writes += 1
+            if self.pending_writes >= COMMIT_EVERY:
+                self.connection.commit()
+                self.pending_writes = 0
+
+    def close(self):
+        """Commit the remaining results and close the database."""
+        with self.lock:
+            self.connection.commit()
+            self.connection.close()
+
+
+def check_url_cached(cache, session, record, timeout=DEFAULT_TIMEOUT):
+    """
+    Check a URL over HTTP unless the cache has a fresh healthy result for it.
+
+    Fresh results are returned without a request and without timings. A
+    stale healthy result is revalidated with If-None-Match and
+    If-Modified-Since headers, a 304 response counts as healthy. Failed URLs
+    are always checked again.
+
+    Args:
+        cache: The CheckCache
+        session: A requests session, usually from create_admin_session
+        record: The UrlRecord to check
+        timeout: Seconds the request may take
+
+    Returns:
+        A CheckResult, its metrics say whether the result came from the
+        cache ("hit"), was revalidated ("revalidated") or was fetched ("miss")
+    """
+    record = UrlRecord(*record[:3])
+    row = cache.get(record.url_id)
+    if row is not None and cache.is_fresh(row):
+        return CheckResult(
+            status=row["status"],
+            status_code=row["status_code"],
+            size=row["size"],
+            metrics={"cache": "hit", "cached_size": row["size"]},
+        )
+
+    headers = {}
+    if row is not None and row["status"] == "OK":
+        if row["etag"]:
+            headers["If-None-Match"] = row["etag"]
+        if row["last_modified"]:
+            headers["If-Modified-Since"] = row["last_modified"]
+
+    result = check_url_with_session(session, record.url, timeout=timeout, headers=headers)
+    validators = result.metrics or {}
+    etag = validators.get("etag")
+    last_modified = validators.get("last_modified")
+    metrics = {"cache": "miss"}
+    if result.status_code == 304:
+        # The body is unchanged, so is its size and any validator the server left out
+        metrics = {"cache": "revalidated", "cached_size": row["size"]}
+        etag = etag or row["etag"]
+        last_modified = last_modified or row["last_modified"]
+        cache.set(record, result._replace(size=row["size"]), etag=etag, last_modified=last_modified)
+    else:
+        cache.set(record, result, etag=etag, last_modified=last_modified)
+    return result._replace(metrics=metrics)
+
+
+class CacheSummary:
+    """Count the URLs answered from the check cache, revalidated or fetched."""
+
+    title = "CHECK CACHE"
+
+    def __init__(self):
+        self.counts = Counter()
+        # Bytes of the bodies that didn't have to be downloaded
+        self.saved_size = 0
+
+    def add(self, record, metrics):
+        """Add the cache outcome of a checked URL."""
+        if not metrics or "cache" not in metrics:
+            return
+        self.counts[metrics["cache"]] += 1
+        self.saved_size += metrics.get("cached_size") or 0
+
+    def get_report_lines(self):
+        """Return the number of URLs per cache outcome and the download size saved."""
+        total = sum(self.counts.values())
+        if not total:
+            return ["No URLs checked with the cache"]
+        lines = []
+        for outcome, label in [
+            ("hit", "Fresh in the cache, not requested"),
+            ("revalidated", "Revalidated, not modified (304)"),
+            ("miss", "Requested in full"),
+        ]:
+            count = self.counts[outcome]
+            lines.append(f"{label:<36} {count:>8} {count / total:>7.1%}")
+        lines.append(f"{'Download size saved':<36} {format_size(self.saved_size):>8}")
+        return lines
@@ -0,0 +1,91 @@
+from datetime import datetime, time
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from wagtail.models import ModelLogEntry, Page, PageLogEntry
+
+from ..models import CheckJob
+
+# Fields recording when an instance last changed, such as those of pages,
+# snippets with revisions or publishing
+CHANGE_FIELDS = ["latest_revision_created_at", "last_published_at"]
+
+
+def get_last_run_time(base_url):
+    """
+    Return when the latest complete check job for a base URL started.
+
+    Raises:
+        ValueError: If no check job for the base URL has completed
+    """
+    job = CheckJob.objects.filter(base_url=base_url, status=CheckJob.STATUS_COMPLETE).first()
+    if job is None:
+        raise ValueError(f"No complete check job for {base_url} yet, run a full check with --job first")
+    # Content changed while the last run was checking is picked up again
+    return job.started_at or job.created_at
+
+
+def parse_since(value, base_url):
+    """
+    Parse the time given to --since.
+
+    Args:
+        value: "last-run", or an ISO 8601 date or date and time. Times without
+            a time zone are in the current time zone.
+        base_url: The base URL whose last run "last-run" refers to
+
+    Returns:
+        An aware datetime
+
+    Raises:
+        ValueError: If the value isn't a date or there is no last run
+    """
+    if value == "last-run":
+        return get_last_run_time(base_url)
+
+    since = parse_datetime(value)
+    if since is None:
+        date = parse_date(value)
+        if date is None:
+            raise ValueError(f"Invalid --since '{value}', expected last-run or a date such as 2024-05-01T02:00")
+        since = datetime.combine(date, time.min)
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
+def filter_changed(queryset, since):
+    """
+    Limit a queryset to the instances that changed since a time.
+
+    Instances count as changed when a revision was created or they were
+    published since then, or when the audit log has an entry for them, such
+    as for edits of models without revisions. Instances of models with
+    neither are never selected.
+
+    Args:
+        queryset: The queryset of a page, snippet or other model
+        since: An aware datetime
+
+    Returns:
+        The filtered queryset
+    """
+    model = queryset.model
+    field_names = {field.name for field in model._meta.get_fields()}
+    changed = Q(pk__in=[])
+    for field_name in CHANGE_FIELDS:
+        if field_name in field_names:
+            changed |= Q(**{f"{field_name}__gte": since})
+
+    if issubclass(model, Page):
+        changed |= Q(pk__in=PageLogEntry.objects.filter(timestamp__gte=since).values("page_id"))
+    else:
+        # Object IDs are stored as strings, so the IDs are fetched rather than compared in SQL
+        content_type = ContentType.objects.get_for_model(model, for_concrete_model=False)
+        object_ids = ModelLogEntry.objects.filter(
+            content_type=content_type, timestamp__gte=since
+        ).values_list("object_id", flat=True)
+        changed |= Q(pk__in=set(object_ids))
+    return queryset.filter(changed)
@@ -0,0 +1,351 @@
+import re
+import socket
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.template.autoreload import reset_loaders
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NameResolutionError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+# Seconds a URL may take, from sending the request to the end of the response body
+DEFAULT_TIMEOUT = 10
+
+# The outcome of checking a URL. Times are in seconds, dns and connect are
+# None when an existing keep-alive connection was reused. Metrics holds
+# extra measurements, such as SQL query counts for in-process checks.
+CheckResult = namedtuple(
+    "CheckResult",
+    ["status", "status_code", "dns", "connect", "ttfb", "total", "size", "metrics"],
+    defaults=(None, None, None, None, None, None, None),
+)
+
+# Connection timings of the current thread's request
+_connection_timings = threading.local()
+
+
+class TimedConnectionMixin:
+    """
+    Record how long new connections spend on DNS lookups and connecting.
+
+    The host is resolved once with a timed lookup, then each resolved
+    address is tried in turn like urllib3 does, so connecting doesn't look
+    the host up again.
+    """
+
+    def _new_conn(self):
+        host = self._dns_host
+        if host.startswith("["):
+            host = host.strip("[]")
+        start = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        finally:
+            self.dns_time = time.perf_counter() - start
+        if not addresses:
+            raise NewConnectionError(self, "Failed to establish a new connection: no address found")
+
+        dns_host = self._dns_host
+        try:
+            for index, address in enumerate(addresses):
+                # Connecting to an IP address skips the lookup
+                self._dns_host = address[4][0]
+                try:
+                    return super()._new_conn()
+                except (ConnectTimeoutError, NewConnectionError):
+                    if index == len(addresses) - 1:
+                        raise
+        finally:
+            self._dns_host = dns_host
+
+    def connect(self):
+        start = time.perf_counter()
+        self.dns_time = 0.0
+        super().connect()
+        # Connect time includes the TLS handshake for HTTPS connections
+        _connection_timings.dns = self.dns_time
+        _connection_timings.connect = time.perf_counter() - start - self.dns_time
+        # Counts new connections so reused ones can be told apart
+        _connection_timings.count = getattr(_connection_timings, "count", 0) + 1
+
+
+class TimedHTTPConnection(TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimingAdapter(HTTPAdapter):
+    """Transport adapter whose connections record their DNS and connect times."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+
+def get_connection_timings():
+    """
+    Return the connections opened by the current thread so far.
+
+    Returns:
+        A (count, dns, connect) tuple, dns and connect are the times of the
+        latest connection or None if the thread hasn't opened any
+    """
+    return (
+        getattr(_connection_timings, "count", 0),
+        getattr(_connection_timings, "dns", None),
+        getattr(_connection_timings, "connect", None),
+    )
+
+
+def create_session():
+    """Return a requests session that records connection timings."""
+    session = requests.Session()
+    adapter = TimingAdapter()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def write_error(output, message):
+    """Write an error message, styled when the output supports it."""
+    if hasattr(output, "style"):
+        output.write(output.style.ERROR(message))
+    else:
+        output.write(message)
+
+
+def create_admin_session(output, base_url, username, password):
+    """
+    Create and return a requests session logged into the Wagtail admin.
+
+    Args:
+        output: The stdout writer from the command
+        base_url: The base URL of the site to log into
+        username: The admin username
+        password: The admin password
+
+    Returns:
+        The session object if successful, None otherwise
+    """
+    session = create_session()
+
+    # First get the login page to extract CSRF token
+    login_url = urljoin(base_url, "/admin/login/")
+    try:
+        response = session.get(login_url, timeout=10)
+        response.raise_for_status()
+
+        # Extract CSRF token from the login page
+        match = re.search(
+            r'name="csrfmiddlewaretoken" value="([^"]+)"', response.text
+        )
+        if not match:
+            write_error(output, "Could not find CSRF token in login page")
+            return None
+        csrf_token = match.group(1)
+
+        # Now attempt to log in
+        login_data = {
+            "csrfmiddlewaretoken": csrf_token,
+            "username": username,
+            "password": password,
+            "next": "/admin/",
+        }
+
+        response = session.post(
+            login_url, data=login_data, headers={"Referer": login_url}, timeout=10
+        )
+
+        # Check if login was successful by looking for error messages or checking if we're still on login page
+        if (
+            "/admin/login/" in response.url
+            or "Please enter the correct username and password" in response.text
+        ):
+            write_error(output, "Login failed: Invalid credentials")
+            return None
+
+        # Verify access to a protected page to confirm authentication
+        verify_url = urljoin(base_url, "/admin/")
+        verify_response = session.get(verify_url, timeout=10)
+
+        # If we get redirected back to login or get permission denied, authentication failed
+        if (
+            "/admin/login/" in verify_response.url
+            or verify_response.status_code == 403
+        ):
+            write_error(
+                output, "Login verification failed: Redirected to login page"
+            )
+            return None
+
+        return session
+
+    except RequestException as e:
+        write_error(output, f"Error creating admin session: {str(e)}")
+        return None
+
+
+def get_status_label(status_code):
+    """
+    Convert an HTTP status code into the status label used in check output.
+
+    Args:
+        status_code: The HTTP status code of the final response
+
+    Returns:
+        "OK" for a 200 response, or a 304 answering a conditional request,
+        otherwise a short description of the failure
+    """
+    if status_code in (200, 304):
+        return "OK"
+    elif status_code in (401, 403):
+        return "AUTH FAILED"
+    elif status_code in (404, 410):
+        return "NOT FOUND"
+    elif status_code >= 500:
+        return f"SERVER ERROR ({status_code})"
+    return f"ERROR ({status_code})"
+
+
+def check_url_with_session(session, url, timeout=DEFAULT_TIMEOUT, headers=None):
+    """
+    Check if a URL is accessible using an established session.
+
+    Args:
+        session: A requests session, usually from create_admin_session
+        url: The URL to check
+        timeout: Seconds the whole request may take, a response body still
+            arriving after that counts as timed out
+        headers: Optional extra request headers, such as the validators of a
+            conditional request. The metrics of the result then hold the
+            ETag and Last-Modified headers of the response.
+
+    Returns:
+        A CheckResult with the status label and the response timings
+    """
+    _connection_timings.dns = None
+    _connection_timings.connect = None
+    start = time.perf_counter()
+    try:
+        # Consider redirects that end with a 200 as success
+        response = session.get(url, timeout=timeout, allow_redirects=True, stream=True, headers=headers)
+        ttfb = time.perf_counter() - start
+        size = 0
+        for chunk in response.iter_content(chunk_size=65536):
+            size += len(chunk)
+            # The read timeout only applies to each chunk, so a slow body could take much longer
+            if time.perf_counter() - start > timeout:
+                response.close()
+                return CheckResult(
+                    status=f"ERROR (Timed out after {timeout:g}s)",
+                    ttfb=ttfb,
+                    total=time.perf_counter() - start,
+                    size=size,
+                )
+        total = time.perf_counter() - start
+        response.close()
+        metrics = None
+        if headers is not None:
+            metrics = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+        return CheckResult(
+            status=get_status_label(response.status_code),
+            status_code=response.status_code,
+            dns=_connection_timings.dns,
+            connect=_connection_timings.connect,
+            ttfb=ttfb,
+            total=total,
+            size=size,
+            metrics=metrics,
+        )
+    except RequestException as e:
+        # Isolate the most relevant part of the error
+        error_msg = str(e)
+        if len(error_msg) > 50:  # Truncate long error messages
+            error_msg = error_msg[:47] + "..."
+        return CheckResult(
+            status=f"ERROR ({error_msg})", total=time.perf_counter() - start
+        )
+
+
+# Host names of base URLs served from this machine
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1"}
+
+
+def is_local_url(url):
+    """Whether a URL is served from this machine, such as a development server."""
+    hostname = urlsplit(url).hostname or ""
+    return hostname in LOCAL_HOSTS or hostname.endswith(".localhost")
+
+
+def clear_django_caches(aliases=None, local=True):
+    """
+    Clear the local memory caches of this process and the compiled template cache.
+
+    Both belong to the current process, so they only affect URLs rendered
+    in it, such as by in-process checks. Caches shared with other processes,
+    such as Redis, Memcached or database caches, may belong to a live
+    deployment, so they are only cleared when their alias is named.
+
+    Args:
+        aliases: Aliases of shared caches to clear as well
+        local: Whether to clear the caches of this process
+    """
+    if local:
+        for cache in caches.all():
+            if isinstance(cache, LocMemCache):
+                cache.clear()
+        reset_loaders()
+    for alias in aliases or []:
+        caches[alias].clear()
+
+
+def check_cold_warm(check_func, record, clear_cache=False, cache_aliases=None, clear_local=True):
+    """
+    Check a URL twice in a row to compare its cold and warm response times.
+
+    Args:
+        check_func: Callable taking a UrlRecord and returning a CheckResult
+        record: The UrlRecord to check
+        clear_cache: Clear the Django caches before the first request
+        cache_aliases: Aliases of shared caches to clear
+        clear_local: Also clear the caches of this process, only useful for in-process checks
+
+    Returns:
+        The CheckResult of the first request, its metrics hold the cold and
+        warm response times
+    """
+    if clear_cache:
+        clear_django_caches(cache_aliases, local=clear_local)
+    cold = check_func(record)
+    warm = check_func(record)
+    metrics = dict(cold.metrics or {})
+    metrics["cold_time"] = cold.total
+    metrics["warm_time"] = warm.total
+    return cold._replace(metrics=metrics)
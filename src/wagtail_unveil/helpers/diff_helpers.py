@@ -0,0 +1,138 @@
+from ..models import CheckJob
+from .base import UrlRecord
+from .check_helpers import CheckResult
+from .result_helpers import get_check_result, read_results
+from .stats_helpers import format_ms
+
+# Increase of the response time, as a fraction of the earlier time, reported as a regression
+DEFAULT_REGRESSION_THRESHOLD = 0.5
+
+# Smallest increase in seconds reported as a regression, so jitter on fast URLs is ignored
+DEFAULT_MIN_REGRESSION = 0.05
+
+
+def load_run(value):
+    """
+    Load the URLs of a run, given as a check job ID or a results file.
+
+    Args:
+        value: A check job ID, or the path of a file written by --results or --format json
+
+    Returns:
+        A (label, results) tuple, results maps the URL ID of each URL to its
+        (UrlRecord, CheckResult). URLs that weren't checked have a None status.
+
+    Raises:
+        ValueError: If the job doesn't exist or the file isn't a results file
+    """
+    results = {}
+    if value.isdigit():
+        try:
+            job = CheckJob.objects.get(pk=int(value))
+        except CheckJob.DoesNotExist:
+            raise ValueError(f"Check job #{value} does not exist")
+        for row in job.results.order_by("position").iterator():
+            record = UrlRecord(row.model_name, row.url_type, row.url)
+            result = CheckResult(
+                status=row.status or None,
+                total=row.response_time,
+                size=row.response_size,
+                metrics=row.metrics,
+            )
+            # The inventory can list a URL more than once, the first one is kept
+            results.setdefault(row.url_id or record.url_id, (record, result))
+        return f"check job #{job.pk}", results
+
+    for row in read_results(value)["results"]:
+        record, result = get_check_result(row)
+        results.setdefault(row.get("url_id") or record.url_id, (record, result))
+    return value, results
+
+
+class RunDiff:
+    """
+    Compare the URLs and check results of two runs, matching URLs by their URL ID.
+
+    Reports the URLs added and removed since the first run, the URLs whose
+    status changed and the URLs whose response time grew by more than the
+    threshold, so unchanged URLs don't hide what a deploy changed.
+    """
+
+    title = "RUN DIFF"
+
+    def __init__(
+        self,
+        old,
+        new,
+        threshold=DEFAULT_REGRESSION_THRESHOLD,
+        min_regression=DEFAULT_MIN_REGRESSION,
+    ):
+        """
+        Args:
+            old: URL ID to (UrlRecord, CheckResult) mapping of the first run, as from load_run
+            new: The same mapping for the second run
+            threshold: Response time increase, as a fraction of the first time, reported as a regression
+            min_regression: Smallest response time increase in seconds reported as a regression
+        """
+        self.added = [record for url_id, (record, _) in new.items() if url_id not in old]
+        self.removed = [record for url_id, (record, _) in old.items() if url_id not in new]
+        self.status_changes = []
+        self.regressions = []
+        self.compared_count = 0
+        for url_id, (record, result) in new.items():
+            if url_id not in old:
+                continue
+            self.compared_count += 1
+            old_result = old[url_id][1]
+            if old_result.status and result.status and old_result.status != result.status:
+                self.status_changes.append((record, old_result.status, result.status))
+            if old_result.total is not None and result.total is not None:
+                increase = result.total - old_result.total
+                if increase >= min_regression and increase > old_result.total * threshold:
+                    self.regressions.append((record, old_result.total, result.total))
+        self.regressions.sort(key=lambda row: row[2] - row[1], reverse=True)
+
+    @property
+    def new_failures(self):
+        """Status changes of URLs that were OK and no longer are."""
+        return [row for row in self.status_changes if row[1] == "OK"]
+
+    @property
+    def has_changes(self):
+        return bool(self.added or self.removed or self.status_changes or self.regressions)
+
+    def get_report_lines(self):
+        """Return the added and removed URLs, status changes and response time regressions."""
+        lines = [
+            f"{self.compared_count} URLs in both runs, {len(self.added)} added, {len(self.removed)} removed, "
+            f"{len(self.status_changes)} status changes, {len(self.regressions)} slower"
+        ]
+        if not self.has_changes:
+            return lines
+
+        if self.added:
+            lines.append("")
+            lines.append("Added URLs")
+            for record in self.added:
+                lines.append(f"+ {record.url} ({record.url_type}, {record.model_name})")
+        if self.removed:
+            lines.append("")
+            lines.append("Removed URLs")
+            for record in self.removed:
+                lines.append(f"- {record.url} ({record.url_type}, {record.model_name})")
+        if self.status_changes:
+            lines.append("")
+            lines.append("Status changes")
+            for record, old_status, new_status in self.status_changes:
+                lines.append(f"{old_status} -> {new_status}  {record.url} ({record.url_type}, {record.model_name})")
+        if self.regressions:
+            lines.append("")
+            lines.append("Response time regressions")
+            lines.append(f"{'before':>10} {'after':>10} {'change':>8}  URL")
+            for record, old_total, new_total in self.regressions:
+                change = f"+{(new_total - old_total) / old_total:.0%}" if old_total else "-"
+                lines.append(
+                    f"{format_ms(old_total):>10} {format_ms(new_total):>10} {change:>8}  "
+                    f"{record.url} ({record.url_type}, {record.model_name})"
+                )
+        return lines
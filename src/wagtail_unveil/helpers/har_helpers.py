@@ -0,0 +1,213 @@
+import json
+from datetime import datetime, timedelta, timezone
+from importlib.metadata import PackageNotFoundError, version
+from urllib.parse import parse_qsl, urlsplit
+
+from .base import UrlRecord
+from .check_helpers import get_connection_timings
+
+# Header values that would let anyone reading the file use the admin session
+REDACTED_HEADERS = {"authorization", "cookie", "set-cookie"}
+
+REDACTED = "[redacted]"
+
+
+def get_creator_version():
+    """Return the installed version of the package for the HAR creator."""
+    try:
+        return version("wagtail-unveil")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def get_har_headers(headers):
+    """Convert a headers mapping to HAR name/value pairs, redacting credentials."""
+    return [
+        {"name": name, "value": REDACTED if name.lower() in REDACTED_HEADERS else value}
+        for name, value in headers.items()
+    ]
+
+
+def get_http_version(response):
+    """Return the HTTP version of a requests response, such as HTTP/1.1."""
+    raw_version = getattr(response.raw, "version", None)
+    if raw_version in (10, 11):
+        return f"HTTP/1.{raw_version - 10}"
+    if raw_version == 20:
+        return "HTTP/2"
+    return "HTTP/1.1"
+
+
+def get_query_string(url):
+    """Return the query string parameters of a URL as HAR name/value pairs."""
+    return [
+        {"name": name, "value": value}
+        for name, value in parse_qsl(urlsplit(url).query, keep_blank_values=True)
+    ]
+
+
+def to_ms(seconds):
+    """Convert seconds to HAR milliseconds, None becomes -1 for unavailable timings."""
+    return -1 if seconds is None else round(seconds * 1000, 3)
+
+
+class HarRecorder:
+    """
+    Record the requests of an HTTP check run as HAR 1.2 entries.
+
+    on_response is registered as a requests session response hook, so every
+    response is recorded, including the redirects followed to reach a URL.
+    The responses are turned into entries once the check result of the URL
+    is added, as the time spent downloading the body is only known then.
+    Cookie and authorization headers are redacted. A recorder follows a
+    single session, concurrent sessions each need their own.
+    """
+
+    def __init__(self):
+        self.entries = []
+        self.pending = []
+        self.connection_count = 0
+
+    def on_response(self, response, *args, **kwargs):
+        """Requests response hook keeping the response with its connection timings."""
+        count, dns, connect = get_connection_timings()
+        # Connection timings only belong to this response if it opened a new connection
+        if count == self.connection_count:
+            dns = connect = None
+        self.connection_count = count
+        started = datetime.now(timezone.utc) - response.elapsed
+        self.pending.append((response, started, dns, connect))
+
+    def add(self, record, result):
+        """
+        Turn the responses recorded while checking a URL into HAR entries.
+
+        Args:
+            record: The UrlRecord (or model_name, url_type, url tuple) that was checked
+            result: The CheckResult of the check
+        """
+        record = UrlRecord(*record)
+        comment = f"{record.model_name} ({record.url_type}): {result.status}"
+        if not self.pending:
+            # The request failed without a response, such as on a timeout
+            self.entries.append(self.get_failed_entry(record.url, result, comment))
+            return
+
+        last = len(self.pending) - 1
+        for index, (response, started, dns, connect) in enumerate(self.pending):
+            if index == last:
+                receive = None
+                if result.total is not None and result.ttfb is not None:
+                    receive = result.total - result.ttfb
+                entry = self.get_entry(response, started, dns, connect, receive, result.size)
+            else:
+                entry = self.get_entry(response, started, dns, connect, 0, None)
+            entry["comment"] = comment
+            self.entries.append(entry)
+        self.pending = []
+
+    def get_entry(self, response, started, dns, connect, receive, size):
+        """Return the HAR entry of a response."""
+        request = response.request
+        wait = response.elapsed.total_seconds() - (dns or 0) - (connect or 0)
+        timings = {
+            "blocked": -1,
+            "dns": to_ms(dns),
+            "connect": to_ms(connect),
+            "ssl": -1,
+            "send": 0,
+            "wait": to_ms(max(wait, 0)),
+            "receive": to_ms(receive) if receive is not None else 0,
+        }
+        if size is None:
+            content_length = response.headers.get("Content-Length", "")
+            size = int(content_length) if content_length.isdigit() else -1
+        http_version = get_http_version(response)
+        return {
+            "startedDateTime": started.isoformat(),
+            "time": round(sum(value for value in timings.values() if value > 0), 3),
+            "request": {
+                "method": request.method,
+                "url": request.url,
+                "httpVersion": http_version,
+                "cookies": [],
+                "headers": get_har_headers(request.headers),
+                "queryString": get_query_string(request.url),
+                "headersSize": -1,
+                "bodySize": 0,
+            },
+            "response": {
+                "status": response.status_code,
+                "statusText": response.reason or "",
+                "httpVersion": http_version,
+                "cookies": [],
+                "headers": get_har_headers(response.headers),
+                "content": {
+                    "size": size,
+                    "mimeType": response.headers.get("Content-Type", ""),
+                },
+                "redirectURL": response.headers.get("Location", ""),
+                "headersSize": -1,
+                "bodySize": size,
+            },
+            "cache": {},
+            "timings": timings,
+        }
+
+    def get_failed_entry(self, url, result, comment):
+        """Return the HAR entry of a request without a response, with status 0."""
+        total = result.total or 0
+        started = datetime.now(timezone.utc) - timedelta(seconds=total)
+        return {
+            "startedDateTime": started.isoformat(),
+            "time": to_ms(total),
+            "request": {
+                "method": "GET",
+                "url": url,
+                "httpVersion": "HTTP/1.1",
+                "cookies": [],
+                "headers": [],
+                "queryString": get_query_string(url),
+                "headersSize": -1,
+                "bodySize": 0,
+            },
+            "response": {
+                "status": 0,
+                "statusText": result.status,
+                "httpVersion": "",
+                "cookies": [],
+                "headers": [],
+                "content": {"size": 0, "mimeType": ""},
+                "redirectURL": "",
+                "headersSize": -1,
+                "bodySize": -1,
+            },
+            "cache": {},
+            "timings": {"send": 0, "wait": to_ms(total), "receive": 0},
+            "comment": comment,
+        }
+
+    def merge(self, recorders):
+        """
+        Add the entries of other recorders, such as those of other checking
+        threads, keeping every entry in the order its request started.
+        """
+        for recorder in recorders:
+            self.entries.extend(recorder.entries)
+        self.entries.sort(key=lambda entry: entry["startedDateTime"])
+
+    def get_har(self):
+        """Return the recorded entries as a HAR log dictionary."""
+        return {
+            "log": {
+                "version": "1.2",
+                "creator": {"name": "wagtail-unveil", "version": get_creator_version()},
+                "pages": [],
+                "entries": self.entries,
+            }
+        }
+
+    def write(self, path):
+        """Write the HAR log to a file."""
+        with open(path, "w") as f:
+            json.dump(self.get_har(), f, indent=2)
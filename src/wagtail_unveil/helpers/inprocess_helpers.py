@@ -0,0 +1,448 @@
+import heapq
+import re
+import time
+from asyncio import iscoroutinefunction
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from urllib.parse import urlsplit
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import Client
+
+from .base import UrlRecord
+from .check_helpers import CheckResult, get_status_label, write_error
+from .stats_helpers import format_ms, percentile
+
+
+def create_inprocess_client(output, base_url, username):
+    """
+    Create a Django test client logged in as an admin user.
+
+    Requests made with the client are handled in the current process, so no
+    server or password is needed.
+
+    Args:
+        output: The stdout writer from the command
+        base_url: The base URL of the checked site, its host is sent with each request
+        username: The username of the user to log in as
+
+    Returns:
+        The client if the user exists, None otherwise
+    """
+    User = get_user_model()
+    try:
+        user = User._default_manager.get_by_natural_key(username)
+    except User.DoesNotExist:
+        write_error(output, f"User {username} does not exist")
+        return None
+
+    # Errors raised by views are reported as 500 responses like a real server would
+    client = Client(raise_request_exception=False, HTTP_HOST=urlsplit(base_url).netloc)
+    client.force_login(user)
+    return client
+
+
+def check_url_in_process(client, record, probes=()):
+    """
+    Check a URL by rendering it with the Django test client.
+
+    Args:
+        client: A client from create_inprocess_client
+        record: The UrlRecord (or model_name, url_type, url tuple) to check
+        probes: Probes measuring each request, their metrics are added to the result
+
+    Returns:
+        A CheckResult, its metrics hold the measurements of the probes
+    """
+    record = UrlRecord(*record)
+    parts = urlsplit(record.url)
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    metrics = {}
+
+    start = time.perf_counter()
+    try:
+        with ExitStack() as stack:
+            for probe in probes:
+                metrics[probe] = stack.enter_context(probe.measure(record))
+            response = client.get(path, follow=True, secure=parts.scheme == "https")
+            ttfb = time.perf_counter() - start
+            if response.streaming:
+                size = sum(len(chunk) for chunk in response.streaming_content)
+            else:
+                size = len(response.content)
+            total = time.perf_counter() - start
+            response.close()
+    except Exception as e:  # noqa: BLE001 - any error raised while rendering is a failed check
+        error_msg = str(e)
+        if len(error_msg) > 50:  # Truncate long error messages
+            error_msg = error_msg[:47] + "..."
+        return CheckResult(
+            status=f"ERROR ({error_msg})", total=time.perf_counter() - start
+        )
+
+    # Probes fill in their metrics when their measure() context exits
+    merged = {}
+    for probe_metrics in metrics.values():
+        merged.update(probe_metrics)
+
+    return CheckResult(
+        status=get_status_label(response.status_code),
+        status_code=response.status_code,
+        ttfb=ttfb,
+        total=total,
+        size=size,
+        metrics=merged,
+    )
+
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w\".])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_RE = re.compile(r"%s|%\(\w+\)s")
+_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_ROWS_RE = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_sql(sql):
+    """
+    Reduce a SQL statement to its fingerprint by stripping literal values.
+
+    Strings, numbers and parameters become ?, lists of values such as IN
+    clauses and bulk insert rows become (...), so statements differing
+    only by their values share a fingerprint.
+
+    Args:
+        sql: The SQL statement as passed to the database cursor
+
+    Returns:
+        The normalized statement
+    """
+    sql = _STRING_RE.sub("?", sql)
+    sql = _PLACEHOLDER_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _LIST_RE.sub("(...)", sql)
+    sql = _ROWS_RE.sub("(...)", sql)
+    return _WHITESPACE_RE.sub(" ", sql).strip()
+
+
+# Fingerprints stored per URL, so results of pages running many distinct statements stay small
+MAX_URL_FINGERPRINTS = 20
+
+# URLs listed in the SQL queries report, the totals still cover every URL
+MAX_REPORTED_URLS = 20
+
+
+class QueryRecorder:
+    """An execute_wrapper callable recording the SQL and duration of each query."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - start))
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def total_time(self):
+        return sum(duration for _, duration in self.queries)
+
+    @property
+    def duplicate_count(self):
+        """
+        Number of queries repeating the SQL of an earlier query whatever
+        their parameters, a high count usually means an N+1 problem.
+        """
+        return self.count - len({sql for sql, _ in self.queries})
+
+    def get_fingerprints(self, limit=None):
+        """
+        Return a {fingerprint: [count, total_time]} dictionary of the queries.
+
+        Args:
+            limit: Only keep this many fingerprints with the most total time
+        """
+        fingerprints = {}
+        for sql, duration in self.queries:
+            totals = fingerprints.setdefault(normalize_sql(sql), [0, 0.0])
+            totals[0] += 1
+            totals[1] += duration
+        if limit is not None and len(fingerprints) > limit:
+            fingerprints = dict(
+                sorted(fingerprints.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+            )
+        return fingerprints
+
+
+class QueryProbe:
+    """
+    Record the number, time and duplicates of the SQL queries run by each URL.
+
+    measure() wraps each request, add() collects the metrics of each checked
+    URL for the report, including metrics stored by earlier job runs. The
+    SQL fingerprints of the URL come from the same recorder, for the
+    SqlFingerprintProbe report, so each query is only wrapped once.
+    """
+
+    title = "SQL QUERIES"
+
+    def __init__(self, fingerprint_limit=MAX_URL_FINGERPRINTS, top_count=MAX_REPORTED_URLS):
+        """
+        Args:
+            fingerprint_limit: The most fingerprints stored per URL, the most costly are kept
+            top_count: The number of URLs with the most queries listed in the report
+        """
+        self.fingerprint_limit = fingerprint_limit
+        self.top_count = top_count
+        # Min-heap of the URLs with the most queries seen so far
+        self.rows = []
+        self.counter = 0
+        self.url_count = 0
+        self.total_queries = 0
+        self.total_time = 0
+
+    @contextmanager
+    def measure(self, record):
+        recorder = QueryRecorder()
+        metrics = {}
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            yield metrics
+
+        metrics["queries"] = recorder.count
+        metrics["sql_time"] = recorder.total_time
+        metrics["duplicate_queries"] = recorder.duplicate_count
+        metrics["sql_fingerprints"] = recorder.get_fingerprints(self.fingerprint_limit)
+
+    def add(self, record, metrics):
+        """Add the query metrics of a checked URL, URLs without any are ignored."""
+        if not metrics or metrics.get("queries") is None:
+            return
+        self.url_count += 1
+        self.total_queries += metrics["queries"]
+        self.total_time += metrics["sql_time"]
+
+        # The counter keeps heap entries with equal query counts comparable
+        self.counter += 1
+        entry = (
+            metrics["queries"],
+            self.counter,
+            UrlRecord(*record),
+            metrics["sql_time"],
+            metrics["duplicate_queries"],
+        )
+        if len(self.rows) < self.top_count:
+            heapq.heappush(self.rows, entry)
+        elif entry > self.rows[0]:
+            heapq.heapreplace(self.rows, entry)
+
+    def get_report_lines(self):
+        """Return the queries of the URLs with the most queries as lines of text, most first."""
+        if not self.rows:
+            return ["No queries recorded"]
+
+        lines = [f"{'queries':>8} {'sql time':>10} {'dupes':>6}  URL"]
+        for queries, _, record, sql_time, duplicates in sorted(self.rows, reverse=True):
+            lines.append(
+                f"{queries:>8} {format_ms(sql_time):>10} {duplicates:>6}  "
+                f"{record.url} ({record.url_type}, {record.model_name})"
+            )
+        lines.append("")
+        lines.append(
+            f"Total: {self.total_queries} queries across {self.url_count} URLs, "
+            f"{format_ms(self.total_time)} SQL time"
+        )
+        return lines
+
+
+class SqlFingerprintProbe:
+    """
+    Aggregate normalized SQL statements across every URL of a check run.
+
+    Shows which query pattern costs the most over the whole admin, rather
+    than which single page is slowest. It only reports, the fingerprints of
+    each URL are recorded by QueryProbe.
+    """
+
+    title = "SQL FINGERPRINTS"
+    SORT_KEYS = {
+        "time": lambda item: item[1]["time"],
+        "calls": lambda item: item[1]["calls"],
+        "urls": lambda item: len(item[1]["urls"]),
+    }
+
+    def __init__(self, sort="time", limit=50, max_urls=5):
+        self.sort = sort
+        self.limit = limit
+        self.max_urls = max_urls
+        self.fingerprints = defaultdict(lambda: {"calls": 0, "time": 0.0, "urls": {}})
+
+    def add(self, record, metrics):
+        """Add the fingerprints of a checked URL, URLs without any are ignored."""
+        if not metrics or not metrics.get("sql_fingerprints"):
+            return
+        record = UrlRecord(*record)
+        for fingerprint, (calls, total_time) in metrics["sql_fingerprints"].items():
+            totals = self.fingerprints[fingerprint]
+            totals["calls"] += calls
+            totals["time"] += total_time
+            # A dict keeps the URLs unique and in the order they were checked
+            totals["urls"][record.url] = None
+
+    def get_report_lines(self):
+        """Return the most costly fingerprints as lines of text, sorted by self.sort."""
+        if not self.fingerprints:
+            return ["No queries recorded"]
+
+        items = sorted(
+            self.fingerprints.items(), key=self.SORT_KEYS[self.sort], reverse=True
+        )
+        lines = [
+            f"{len(items)} distinct statements, sorted by {self.sort}",
+            "",
+            f"{'calls':>7} {'total':>10} {'avg':>9} {'urls':>5}  SQL",
+        ]
+        for fingerprint, totals in items[: self.limit]:
+            urls = list(totals["urls"])
+            lines.append(
+                f"{totals['calls']:>7} {format_ms(totals['time']):>10} "
+                f"{format_ms(totals['time'] / totals['calls']):>9} {len(urls):>5}  {fingerprint}"
+            )
+            for url in urls[: self.max_urls]:
+                lines.append(f"{'':>35}{url}")
+            if len(urls) > self.max_urls:
+                lines.append(f"{'':>35}... and {len(urls) - self.max_urls} more")
+        if len(items) > self.limit:
+            lines.append("")
+            lines.append(f"{len(items) - self.limit} more statements not shown")
+        return lines
+
+
+class MiddlewareProbe:
+    """
+    Measure the time spent in each configured middleware and in the view.
+
+    The middleware chain of the client is rebuilt with a timer around the
+    get_response of each layer. The time of a middleware is the time of its
+    layer minus the time of the layers below it, the view time includes
+    process_view hooks and template response middleware.
+    """
+
+    title = "MIDDLEWARE"
+    VIEW = "view"
+
+    def __init__(self, client, limit=10):
+        self.limit = limit
+        # Layer names from the outermost middleware to the view
+        self.layers = []
+        self.times = defaultdict(list)
+        self.overheads = []
+        self.inclusive = None
+        self.instrument(client.handler)
+
+    def instrument(self, handler):
+        """Load the middleware of a client handler with every layer timed."""
+        original = handler.adapt_method_mode
+        # The handler passed to each middleware is the layer below it, which is
+        # the previous middleware unless it raised MiddlewareNotUsed
+        state = {"method": None, "name": None, "layer": self.VIEW}
+
+        def adapt_method_mode(is_async, method, method_is_async=None, debug=False, name=None):
+            adapted = original(is_async, method, method_is_async, debug=debug, name=name)
+            if not name or not name.startswith("middleware "):
+                return adapted
+            if state["method"] is not None and method is not state["method"]:
+                state["layer"] = state["name"]
+            state["method"] = method
+            state["name"] = name[len("middleware ") :]
+            return self.timed(adapted, state["layer"])
+
+        handler.adapt_method_mode = adapt_method_mode
+        try:
+            handler.load_middleware()
+        finally:
+            del handler.adapt_method_mode
+
+        if state["method"] is not None and handler._middleware_chain is not state["method"]:
+            state["layer"] = state["name"]
+        handler._middleware_chain = self.timed(handler._middleware_chain, state["layer"])
+
+    def timed(self, get_response, layer):
+        """Wrap the get_response of a layer to add its duration to the current request."""
+        if iscoroutinefunction(get_response):
+            return get_response
+        if layer not in self.layers:
+            self.layers.insert(0, layer)
+
+        def timed_get_response(request):
+            start = time.perf_counter()
+            try:
+                return get_response(request)
+            finally:
+                if self.inclusive is not None:
+                    self.inclusive[layer] = (
+                        self.inclusive.get(layer, 0.0) + time.perf_counter() - start
+                    )
+
+        return timed_get_response
+
+    @contextmanager
+    def measure(self, record):
+        self.inclusive = {}
+        metrics = {}
+        try:
+            yield metrics
+        finally:
+            inclusive, self.inclusive = self.inclusive, None
+
+        layer_times = {}
+        for layer, inner_layer in zip(self.layers, self.layers[1:] + [None]):
+            if layer in inclusive:
+                layer_times[layer] = inclusive[layer] - inclusive.get(inner_layer, 0.0)
+        metrics["middleware"] = layer_times
+
+    def add(self, record, metrics):
+        """Add the layer times of a checked URL, URLs without any are ignored."""
+        if not metrics or not metrics.get("middleware"):
+            return
+        overhead = 0.0
+        for layer, seconds in metrics["middleware"].items():
+            self.times[layer].append(seconds)
+            if layer != self.VIEW:
+                overhead += seconds
+        self.overheads.append((overhead, UrlRecord(*record)))
+
+    def get_report_lines(self):
+        """Return the time of each layer across the run and the URLs with most overhead."""
+        if not self.times:
+            return ["No middleware timings recorded"]
+
+        # Layers of stored results that are no longer configured come last
+        layers = [layer for layer in self.layers if layer in self.times]
+        layers += [layer for layer in self.times if layer not in layers]
+        grand_total = sum(sum(values) for values in self.times.values())
+
+        lines = [f"{'mean':>9} {'p90':>9} {'max':>9} {'share':>6}  Layer"]
+        for layer in layers:
+            values = sorted(self.times[layer])
+            share = sum(values) / grand_total * 100 if grand_total else 0
+            lines.append(
+                f"{format_ms(sum(values) / len(values)):>9} {format_ms(percentile(values, 90)):>9} "
+                f"{format_ms(values[-1]):>9} {share:>5.1f}%  {layer}"
+            )
+
+        lines.append("")
+        lines.append("Most middleware overhead")
+        for overhead, record in sorted(self.overheads, key=lambda row: row[0], reverse=True)[
+            : self.limit
+        ]:
+            lines.append(f"{format_ms(overhead):>9}  {record.url} ({record.url_type}, {record.model_name})")
+        return lines
@@ -0,0 +1,444 @@
+import os
+import socket
+import time
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from ..models import CheckJob, CheckJobResult
+from .base import UrlRecord, get_url_id
+from .throttle_helpers import DeadlineExceeded
+from .url_helpers import collect_urls
+
+# Number of URLs checked between two checkpoints
+DEFAULT_BATCH_SIZE = 50
+
+# Seconds without a checkpoint after which a running job is considered abandoned
+DEFAULT_STALE_AFTER = 300
+
+# Seconds a worker holds a batch of URLs before other workers may take it
+# over. Leases are renewed while the batch is being checked.
+DEFAULT_LEASE_SECONDS = 600
+
+# Worker errors in a row, without a checkpoint in between, after which a job is failed
+MAX_WORKER_FAILURES = 3
+
+
+def create_check_job(base_url, max_instances, urls=None, since=None):
+    """
+    Create a new check job, optionally storing its URL inventory straight away.
+
+    Args:
+        base_url: The base URL the job's URLs are checked against
+        max_instances: Maximum number of instances per model (0 for all)
+        urls: Optional list of (model_name, url_type, url) tuples
+        since: Optional datetime, the URLs only cover instances changed since then
+
+    Returns:
+        The new CheckJob
+    """
+    job = CheckJob.objects.create(base_url=base_url, max_instances=max_instances, since=since)
+    if urls is not None:
+        add_job_urls(job, urls)
+    return job
+
+
+def add_job_urls(job, urls, batch_size=500):
+    """
+    Store the URL inventory of a job as pending result rows.
+
+    Args:
+        job: The CheckJob to add the URLs to
+        urls: List of (model_name, url_type, url) tuples
+        batch_size: Number of rows inserted per query
+    """
+    CheckJobResult.objects.bulk_create(
+        [
+            CheckJobResult(
+                job=job,
+                position=position,
+                model_name=model_name,
+                url_type=url_type,
+                url=url,
+                url_id=get_url_id(url),
+            )
+            for position, (model_name, url_type, url) in enumerate(urls)
+        ],
+        batch_size=batch_size,
+    )
+    job.total_count = len(urls)
+    job.save(update_fields=["total_count"])
+
+
+def populate_job(output, job):
+    """
+    Discover the URLs of a job that was queued without an inventory.
+
+    Jobs created from the report view only record the base URL, the
+    discovery then happens in the process that runs the job.
+    """
+    if job.total_count or job.results.exists():
+        return
+    urls = collect_urls(output, job.base_url, job.max_instances)
+    try:
+        with transaction.atomic():
+            add_job_urls(job, urls)
+    except IntegrityError:
+        # Another worker stored the inventory first
+        job.refresh_from_db()
+
+
+def get_resumable_job(base_url, since=None):
+    """
+    Return the most recent unfinished job for a base URL, if there is one.
+
+    Only jobs listing instances changed since the same time are resumed, so a
+    run with --since never resumes a full job and the other way around.
+    """
+    return (
+        CheckJob.objects.filter(base_url=base_url, since=since)
+        .exclude(status__in=[CheckJob.STATUS_COMPLETE, CheckJob.STATUS_FAILED])
+        .first()
+    )
+
+
+def _claimable_filter(stale_after):
+    stale_before = timezone.now() - timedelta(seconds=stale_after)
+    return Q(status__in=[CheckJob.STATUS_PENDING, CheckJob.STATUS_INTERRUPTED]) | Q(
+        status=CheckJob.STATUS_RUNNING, heartbeat_at__lt=stale_before
+    )
+
+
+def claim_job(job, stale_after=DEFAULT_STALE_AFTER, force=False):
+    """
+    Atomically mark a job as running so that only one process works on it.
+
+    Args:
+        job: The CheckJob to claim
+        stale_after: Seconds after which a running job may be taken over
+        force: Claim the job even if another process is running it
+
+    Returns:
+        True if the job was claimed, False if it is finished or owned elsewhere
+    """
+    jobs = CheckJob.objects.filter(pk=job.pk).exclude(
+        status__in=[CheckJob.STATUS_COMPLETE, CheckJob.STATUS_FAILED]
+    )
+    if not force:
+        jobs = jobs.filter(_claimable_filter(stale_after))
+
+    now = timezone.now()
+    if not jobs.update(status=CheckJob.STATUS_RUNNING, heartbeat_at=now):
+        return False
+
+    job.refresh_from_db()
+    if job.started_at is None:
+        job.started_at = now
+        job.save(update_fields=["started_at"])
+    return True
+
+
+def claim_next_job(stale_after=DEFAULT_STALE_AFTER):
+    """Claim the oldest job waiting to be run, returns None if there is none."""
+    for job in CheckJob.objects.filter(_claimable_filter(stale_after)).order_by(
+        "created_at", "id"
+    ):
+        if claim_job(job, stale_after=stale_after):
+            return job
+    return None
+
+
+def get_worker_id():
+    """Return an identifier of the current process, unique across machines, for leases."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _free_lease_filter(now):
+    return Q(lease_expires_at__isnull=True) | Q(lease_expires_at__lt=now)
+
+
+def get_next_leasable_job():
+    """
+    Return the oldest unfinished job with URLs that no worker holds a lease on.
+
+    Jobs queued without an inventory are returned too so a worker can
+    discover their URLs. Jobs whose URLs have all been checked, such as
+    when a worker stopped after its last checkpoint, are marked complete.
+    """
+    now = timezone.now()
+    jobs = CheckJob.objects.exclude(
+        status__in=[CheckJob.STATUS_COMPLETE, CheckJob.STATUS_FAILED]
+    ).order_by("created_at", "id")
+    for job in jobs:
+        if not job.total_count and not job.results.exists():
+            return job
+        pending = job.results.filter(checked_at__isnull=True)
+        if pending.filter(_free_lease_filter(now)).exists():
+            return job
+        if not pending.exists():
+            finish_job(job)
+    return None
+
+
+def lease_batch(job, worker_id, batch_size=DEFAULT_BATCH_SIZE, lease_seconds=DEFAULT_LEASE_SECONDS):
+    """
+    Lease the next unchecked URLs of a job that no other worker holds.
+
+    Args:
+        job: The CheckJob to take URLs from
+        worker_id: Identifier of the worker, from get_worker_id
+        batch_size: Maximum number of URLs to lease
+        lease_seconds: Seconds until other workers may take the URLs over
+
+    Returns:
+        The leased CheckJobResult rows, empty if there are none left to lease
+    """
+    now = timezone.now()
+    expires_at = now + timedelta(seconds=lease_seconds)
+    free = job.results.filter(checked_at__isnull=True).filter(_free_lease_filter(now))
+    ids = list(free.order_by("position").values_list("pk", flat=True)[:batch_size])
+    if not ids:
+        return []
+    # The update only takes rows that are still free, so when two workers
+    # lease at the same time each URL goes to one of them
+    free.filter(pk__in=ids).update(lease_owner=worker_id, lease_expires_at=expires_at)
+    return list(
+        job.results.filter(
+            pk__in=ids, lease_owner=worker_id, lease_expires_at=expires_at
+        ).order_by("position")
+    )
+
+
+def renew_leases(results, worker_id, lease_seconds=DEFAULT_LEASE_SECONDS):
+    """Extend the leases a worker still holds on a batch of results."""
+    CheckJobResult.objects.filter(
+        pk__in=[result.pk for result in results],
+        lease_owner=worker_id,
+        checked_at__isnull=True,
+    ).update(lease_expires_at=timezone.now() + timedelta(seconds=lease_seconds))
+
+
+def release_leases(job, worker_id):
+    """Give up the leases of a worker on URLs it hasn't checked, so others can take them."""
+    job.results.filter(lease_owner=worker_id, checked_at__isnull=True).update(
+        lease_owner="", lease_expires_at=None
+    )
+
+
+def has_other_workers(job, worker_id):
+    """Whether workers other than worker_id hold live leases on unchecked URLs of a job."""
+    return (
+        job.results.filter(checked_at__isnull=True, lease_expires_at__gt=timezone.now())
+        .exclude(lease_owner=worker_id)
+        .exists()
+    )
+
+
+def record_worker_failure(job, worker_id, error, max_failures=MAX_WORKER_FAILURES):
+    """
+    Release the leases of a worker that hit an error, so other workers check its URLs.
+
+    One worker's error doesn't stop the workers sharing the job. The job is
+    only failed once max_failures worker errors happened without a
+    checkpoint in between, as it can't make progress then. Otherwise a job
+    no other worker is checking is marked as interrupted to be resumed.
+
+    Args:
+        job: The CheckJob the worker was running
+        worker_id: Identifier of the worker, from get_worker_id
+        error: Description of the error
+        max_failures: Worker errors in a row after which the job is failed
+
+    Returns:
+        True if the job was failed
+    """
+    release_leases(job, worker_id)
+    CheckJob.objects.filter(pk=job.pk).update(worker_failures=F("worker_failures") + 1)
+    job.refresh_from_db(fields=["status", "worker_failures"])
+    if job.is_finished:
+        return job.status == CheckJob.STATUS_FAILED
+    if job.worker_failures >= max_failures:
+        fail_job(job, f"{error} ({job.worker_failures} worker errors in a row)")
+        return True
+    if not has_other_workers(job, worker_id):
+        job.status = CheckJob.STATUS_INTERRUPTED
+        job.save(update_fields=["status"])
+    return False
+
+
+def finish_job(job):
+    """Mark a job as complete if all of its URLs have been checked, returns whether it was."""
+    if job.results.filter(checked_at__isnull=True).exists():
+        return False
+    CheckJob.objects.filter(pk=job.pk).exclude(
+        status__in=[CheckJob.STATUS_COMPLETE, CheckJob.STATUS_FAILED]
+    ).update(status=CheckJob.STATUS_COMPLETE, finished_at=timezone.now())
+    job.refresh_from_db()
+    return True
+
+
+def run_check_job(
+    job,
+    check_func,
+    batch_size=DEFAULT_BATCH_SIZE,
+    lease_seconds=DEFAULT_LEASE_SECONDS,
+    worker_id=None,
+):
+    """
+    Check the pending URLs of a job in leased batches, checkpointing after each batch.
+
+    URLs that already have a result are skipped, so running an interrupted
+    job again picks up where it stopped. Several workers can run the same
+    job at once, each leasing its own batches, and batches of a worker that
+    stopped are taken over once their lease expires. If the process is
+    interrupted or the check function raises DeadlineExceeded, the URLs
+    already checked are saved and its leases are released so the job can
+    be resumed. Any other error is recorded with record_worker_failure,
+    which leaves the URLs to other workers, and is raised again.
+
+    Args:
+        job: The CheckJob to run
+        check_func: Callable taking a UrlRecord and returning a CheckResult
+        batch_size: Number of URLs leased and checked between two checkpoints
+        lease_seconds: Seconds until other workers may take over a batch
+        worker_id: Identifier of the worker, defaults to get_worker_id()
+
+    Returns:
+        The updated CheckJob, complete unless other workers still hold
+        leases on some of its URLs
+    """
+    worker_id = worker_id or get_worker_id()
+    checked = []
+    try:
+        while True:
+            batch = lease_batch(job, worker_id, batch_size, lease_seconds)
+            if not batch:
+                break
+
+            renew_at = time.monotonic() + lease_seconds / 2
+            checked = []
+            for result in batch:
+                check_result = check_func(
+                    UrlRecord(result.model_name, result.url_type, result.url)
+                )
+                result.status = check_result.status
+                result.response_time = check_result.total
+                result.response_size = check_result.size
+                result.metrics = check_result.metrics
+                result.checked_at = timezone.now()
+                checked.append(result)
+                if time.monotonic() > renew_at:
+                    renew_leases(batch, worker_id, lease_seconds)
+                    renew_at = time.monotonic() + lease_seconds / 2
+
+            checkpoint_job(job, batch, worker_id)
+            checked = []
+    except (KeyboardInterrupt, DeadlineExceeded):
+        # The URLs of the current batch checked so far don't have to be checked again
+        if checked:
+            checkpoint_job(job, checked, worker_id)
+        release_leases(job, worker_id)
+        # The job is only interrupted if no other worker is still checking it
+        if not has_other_workers(job, worker_id):
+            job.status = CheckJob.STATUS_INTERRUPTED
+            job.save(update_fields=["status"])
+        raise
+    except Exception as e:
+        record_worker_failure(job, worker_id, f"{type(e).__name__}: {e}")
+        raise
+
+    finish_job(job)
+    return job
+
+
+def checkpoint_job(job, results, worker_id):
+    """
+    Save a batch of checked results and the job counters in one transaction.
+
+    Only results the worker still holds the lease on are saved, a result
+    whose lease expired belongs to the worker that took it over. Counters
+    are incremented in the database as other workers update them too.
+    """
+    leased = CheckJobResult.objects.filter(
+        pk__in=[result.pk for result in results],
+        lease_owner=worker_id,
+        checked_at__isnull=True,
+    )
+    with transaction.atomic():
+        # Writing before reading takes the write lock straight away, SQLite
+        # can't upgrade a read lock while other workers are writing
+        leased.update(lease_expires_at=None)
+        owned = set(leased.values_list("pk", flat=True))
+        results = [result for result in results if result.pk in owned]
+        for result in results:
+            result.lease_owner = ""
+            result.lease_expires_at = None
+        CheckJobResult.objects.bulk_update(
+            results,
+            [
+                "status",
+                "response_time",
+                "response_size",
+                "metrics",
+                "checked_at",
+                "lease_owner",
+                "lease_expires_at",
+            ],
+        )
+        successes = sum(1 for result in results if result.is_success)
+        CheckJob.objects.filter(pk=job.pk).update(
+            checked_count=F("checked_count") + len(results),
+            success_count=F("success_count") + successes,
+            failure_count=F("failure_count") + len(results) - successes,
+            heartbeat_at=timezone.now(),
+            # The job made progress, so earlier worker errors don't count towards failing it
+            worker_failures=0,
+        )
+    job.refresh_from_db(
+        fields=[
+            "checked_count",
+            "success_count",
+            "failure_count",
+            "heartbeat_at",
+            "worker_failures",
+        ]
+    )
+
+
+def fail_job(job, error):
+    """Mark a job as failed with the reason it could not be run."""
+    job.status = CheckJob.STATUS_FAILED
+    job.error = error
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "error", "finished_at"])
+
+
+def get_job_summary(job, max_failures=500):
+    """
+    Build a JSON serialisable summary of a job's progress.
+
+    Args:
+        job: The CheckJob to summarise
+        max_failures: Maximum number of failed URLs to include
+
+    Returns:
+        A dictionary with the job status, counters and failed URLs
+    """
+    failures = job.results.exclude(status="").exclude(status="OK")
+    return {
+        "id": job.pk,
+        "status": job.status,
+        "base_url": job.base_url,
+        "total": job.total_count,
+        "checked": job.checked_count,
+        "success": job.success_count,
+        "failure": job.failure_count,
+        "progress": round(job.progress, 1),
+        "error": job.error,
+        "failures": [
+            {"url": result.url, "status": result.status}
+            for result in failures[:max_failures]
+        ],
+    }
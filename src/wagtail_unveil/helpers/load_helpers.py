@@ -0,0 +1,355 @@
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.db import connections
+
+from .base import UrlRecord
+from .stats_helpers import format_ms, percentile
+
+# Upper bounds in seconds of the latency histogram buckets
+HISTOGRAM_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Concurrency levels of a scaling run when none are given
+DEFAULT_SCALE_LEVELS = (1, 2, 4, 8, 16, 32)
+
+# Throughput must grow by this fraction from one level to the next before
+# the site is considered saturated
+SATURATION_GAIN = 0.1
+
+
+def parse_weights(value):
+    """
+    Parse a weighted mix of URL types.
+
+    Args:
+        value: A string such as "list=5,edit=2,frontend=10"
+
+    Returns:
+        A {url_type: weight} dictionary
+
+    Raises:
+        ValueError: If the string is not a list of type=weight pairs
+    """
+    weights = {}
+    for part in value.split(","):
+        url_type, separator, weight = part.partition("=")
+        if not separator or not url_type.strip():
+            raise ValueError(f"Invalid weight '{part}', expected url_type=weight")
+        try:
+            weights[url_type.strip()] = float(weight)
+        except ValueError:
+            raise ValueError(f"Invalid weight '{part}', the weight must be a number")
+        if weights[url_type.strip()] < 0:
+            raise ValueError(f"Invalid weight '{part}', the weight can't be negative")
+    return weights
+
+
+def parse_levels(value):
+    """
+    Parse a list of concurrency levels.
+
+    Args:
+        value: A string such as "1,2,4,8"
+
+    Returns:
+        The levels as a sorted list of unique integers
+
+    Raises:
+        ValueError: If a level is not a positive integer
+    """
+    levels = set()
+    for part in value.split(","):
+        try:
+            level = int(part)
+        except ValueError:
+            raise ValueError(f"Invalid concurrency level '{part}', expected a number")
+        if level < 1:
+            raise ValueError(f"Invalid concurrency level '{part}', it must be at least 1")
+        levels.add(level)
+    return sorted(levels)
+
+
+class UrlMix:
+    """
+    Pick URLs of an inventory at random for a load test.
+
+    Without weights every URL is equally likely. With weights a URL type is
+    picked first according to its weight, types without a weight are left
+    out, then a URL of that type is picked.
+    """
+
+    def __init__(self, urls, weights=None):
+        self.by_type = defaultdict(list)
+        for url_data in urls:
+            record = UrlRecord(*url_data[:3])
+            self.by_type[record.url_type].append(record)
+        self.records = [record for records in self.by_type.values() for record in records]
+        self.weights = weights
+        if weights is not None:
+            self.types = [url_type for url_type in self.by_type if weights.get(url_type, 0) > 0]
+            self.type_weights = [weights[url_type] for url_type in self.types]
+            if not self.types:
+                raise ValueError("None of the weighted URL types have any URLs")
+        elif not self.records:
+            raise ValueError("There are no URLs to request")
+
+    def choose(self, rng):
+        """Return a random UrlRecord using the random.Random instance rng."""
+        if self.weights is None:
+            return rng.choice(self.records)
+        url_type = rng.choices(self.types, weights=self.type_weights)[0]
+        return rng.choice(self.by_type[url_type])
+
+
+class LoadStats:
+    """Collect the response times and errors of load test requests per URL type."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(Counter)
+        self.requests = Counter()
+
+    def add(self, url_type, result):
+        self.requests[url_type] += 1
+        if result.total is not None:
+            self.latencies[url_type].append(result.total)
+        if result.status != "OK":
+            self.errors[url_type][result.status] += 1
+
+    def merge(self, other):
+        """Add the requests of another LoadStats, such as the one of another worker."""
+        self.requests.update(other.requests)
+        for url_type, values in other.latencies.items():
+            self.latencies[url_type].extend(values)
+        for url_type, statuses in other.errors.items():
+            self.errors[url_type].update(statuses)
+
+    @property
+    def total_requests(self):
+        return sum(self.requests.values())
+
+    @property
+    def total_errors(self):
+        return sum(sum(statuses.values()) for statuses in self.errors.values())
+
+    def get_latencies(self):
+        """Return the response times of every request, sorted."""
+        return sorted(value for values in self.latencies.values() for value in values)
+
+    def get_histogram(self):
+        """Return (upper bound, count) pairs of the response times, None bounds the last bucket."""
+        counts = Counter()
+        for value in self.get_latencies():
+            for bound in HISTOGRAM_BUCKETS:
+                if value <= bound:
+                    counts[bound] += 1
+                    break
+            else:
+                counts[None] += 1
+        return [(bound, counts[bound]) for bound in HISTOGRAM_BUCKETS + (None,)]
+
+    def get_report_lines(self, elapsed, concurrency):
+        """Return the throughput, latency histogram and error rates as lines of text."""
+        total = self.total_requests
+        if not total:
+            return ["No requests made"]
+
+        latencies = self.get_latencies()
+        lines = [
+            f"{total} requests in {elapsed:.1f}s with {concurrency} concurrent clients",
+            f"Throughput: {total / elapsed:.1f} requests/s",
+            f"Errors: {self.total_errors} ({self.total_errors / total * 100:.1f}%)",
+            "Latency: "
+            + ", ".join(
+                f"p{p} {format_ms(percentile(latencies, p))}" for p in (50, 90, 99)
+            )
+            + f", max {format_ms(latencies[-1] if latencies else None)}",
+            "",
+            f"{'':<20} {'requests':>9} {'req/s':>8} {'errors':>7} {'p50':>10} {'p90':>10} {'p99':>10} {'max':>10}",
+        ]
+        for url_type in sorted(self.requests):
+            requests = self.requests[url_type]
+            values = sorted(self.latencies[url_type])
+            errors = sum(self.errors[url_type].values())
+            lines.append(
+                f"{url_type[:20]:<20} {requests:>9} {requests / elapsed:>8.1f} "
+                f"{errors / requests * 100:>6.1f}% "
+                + " ".join(
+                    f"{format_ms(percentile(values, p)):>10}" for p in (50, 90, 99)
+                )
+                + f" {format_ms(values[-1] if values else None):>10}"
+            )
+
+        lines.append("")
+        lines.append("Latency histogram")
+        histogram = self.get_histogram()
+        largest = max(count for _, count in histogram) or 1
+        for bound, count in histogram:
+            label = f"<= {format_ms(bound)}" if bound is not None else f"> {format_ms(HISTOGRAM_BUCKETS[-1])}"
+            bar = "#" * round(count / largest * 40)
+            lines.append(f"{label:>12} {count:>8}  {bar}")
+
+        if self.errors:
+            lines.append("")
+            lines.append("Errors by status")
+            statuses = Counter()
+            for url_type_statuses in self.errors.values():
+                statuses.update(url_type_statuses)
+            for status, count in statuses.most_common():
+                lines.append(f"{count:>8}  {status}")
+        return lines
+
+
+def run_load(check_funcs, mix, duration, seed=None):
+    """
+    Request random URLs of a mix from concurrent workers for a duration.
+
+    Args:
+        check_funcs: One check function per worker, each taking a UrlRecord
+            and returning a CheckResult. Workers don't share sessions or clients.
+        mix: The UrlMix to pick URLs from
+        duration: Seconds to keep requesting URLs for
+        seed: Optional seed making the sequence of URLs repeatable
+
+    Returns:
+        A (LoadStats, elapsed seconds) tuple
+
+    Raises:
+        RuntimeError: If a worker failed, the other workers are stopped
+    """
+    worker_stats = [LoadStats() for _ in check_funcs]
+    worker_errors = []
+    clock = {}
+
+    def start_clock():
+        clock["start"] = time.monotonic()
+        clock["deadline"] = clock["start"] + duration
+
+    # The clock starts once every worker thread is running, so slow thread
+    # start up doesn't eat into the duration of the first workers
+    ready = threading.Barrier(len(check_funcs), action=start_clock)
+
+    def worker(index, check_func):
+        try:
+            rng = random.Random(None if seed is None else seed + index)
+            ready.wait()
+            while time.monotonic() < clock["deadline"] and not worker_errors:
+                record = mix.choose(rng)
+                worker_stats[index].add(record.url_type, check_func(record))
+        except threading.BrokenBarrierError:
+            # Another worker failed before every worker was running
+            pass
+        except Exception as e:
+            worker_errors.append((index, e))
+            # Workers still waiting to start would otherwise wait forever
+            ready.abort()
+        finally:
+            # In-process workers open their own database connections
+            connections.close_all()
+
+    threads = [
+        threading.Thread(target=worker, args=(index, check_func), name=f"unveil-load-{index}")
+        for index, check_func in enumerate(check_funcs)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if worker_errors:
+        index, error = worker_errors[0]
+        raise RuntimeError(f"Load test worker {index} failed: {error!r}") from error
+    elapsed = time.monotonic() - clock["start"]
+
+    stats = LoadStats()
+    for other in worker_stats:
+        stats.merge(other)
+    return stats, elapsed
+
+
+class ScalingSummary:
+    """
+    Compare load test runs at increasing concurrency.
+
+    Scaling efficiency is the throughput of a level divided by the single
+    client throughput times the number of clients, so 100% is perfect
+    scaling. The saturation point is the last level after which adding
+    clients no longer raised throughput by SATURATION_GAIN.
+    """
+
+    def __init__(self):
+        self.runs = []
+
+    def add(self, concurrency, stats, elapsed):
+        self.runs.append((concurrency, stats, elapsed))
+        self.runs.sort(key=lambda run: run[0])
+
+    def get_throughput(self, run):
+        _, stats, elapsed = run
+        return stats.total_requests / elapsed if elapsed else 0.0
+
+    def get_efficiency(self, run):
+        """Return the throughput of a run relative to perfect scaling of the first run, or None."""
+        base_concurrency = self.runs[0][0]
+        base = self.get_throughput(self.runs[0]) / base_concurrency
+        if not base:
+            return None
+        return self.get_throughput(run) / (base * run[0])
+
+    def get_saturation_point(self):
+        """Return the concurrency after which throughput stopped growing, or None."""
+        for run, next_run in zip(self.runs, self.runs[1:]):
+            if self.get_throughput(next_run) < self.get_throughput(run) * (1 + SATURATION_GAIN):
+                return run[0]
+        return None
+
+    def get_report_lines(self):
+        """Return throughput, p99 and efficiency per level, then p99 per URL type."""
+        if not self.runs:
+            return ["No load test runs"]
+
+        lines = [
+            f"{'clients':>7} {'requests':>9} {'req/s':>8} {'errors':>7} {'p50':>10} {'p99':>10} {'efficiency':>10}",
+        ]
+        for run in self.runs:
+            concurrency, stats, _ = run
+            latencies = stats.get_latencies()
+            efficiency = self.get_efficiency(run)
+            errors = stats.total_errors / stats.total_requests * 100 if stats.total_requests else 0.0
+            lines.append(
+                f"{concurrency:>7} {stats.total_requests:>9} {self.get_throughput(run):>8.1f} "
+                f"{errors:>6.1f}% {format_ms(percentile(latencies, 50)):>10} "
+                f"{format_ms(percentile(latencies, 99)):>10} "
+                + (f"{efficiency * 100:>9.0f}%" if efficiency is not None else f"{'-':>10}")
+            )
+
+        lines.append("")
+        saturation = self.get_saturation_point()
+        if saturation is None:
+            lines.append(f"Throughput kept growing up to {self.runs[-1][0]} clients")
+        else:
+            lines.append(
+                f"Saturation point: {saturation} clients, more clients raised throughput "
+                f"by less than {SATURATION_GAIN:.0%}"
+            )
+
+        # URL types whose p99 grows with the number of clients serialize somewhere
+        lines.append("")
+        lines.append("p99 by URL type")
+        lines.append(
+            f"{'':<20} " + " ".join(f"{concurrency:>9}" for concurrency, _, _ in self.runs) + f" {'growth':>8}"
+        )
+        url_types = sorted({url_type for _, stats, _ in self.runs for url_type in stats.requests})
+        for url_type in url_types:
+            values = [
+                percentile(sorted(stats.latencies[url_type]), 99) for _, stats, _ in self.runs
+            ]
+            measured = [value for value in values if value is not None]
+            growth = f"{measured[-1] / measured[0]:.1f}x" if len(measured) > 1 and measured[0] else "-"
+            lines.append(
+                f"{url_type[:20]:<20} "
+                + " ".join(f"{format_ms(value):>9}" for value in values)
+                + f" {growth:>8}"
+            )
+        return lines
@@ -25,7 +25,7 @@ def get_document_model():
     return get_document_model_wagtail()
 
 
-def get_image_admin_urls(output, base_url, max_instances):
+def get_image_admin_urls(output, base_url, max_instances, since=None):
     """Get admin URLs for images"""
     urls = []
     base = base_url.rstrip("/")
@@ -42,7 +42,7 @@ def get_image_admin_urls(output, base_url, max_instances):
         urls.append(format_url_tuple(model_name, None, "list", list_url))
 
         # Add edit URLs for actual instances using the helper method
-        instances = get_instance_sample(output, ImageModel, max_instances)
+        instances = get_instance_sample(output, ImageModel, max_instances, since=since)
         for instance in instances:
             instance_name = truncate_instance_name(str(instance))
             edit_url = f"{base}/admin/images/{instance.id}/"
@@ -66,7 +66,7 @@ def get_image_admin_urls(output, base_url, max_instances):
     return urls
 
 
-def get_document_admin_urls(output, base_url, max_instances):
+def get_document_admin_urls(output, base_url, max_instances, since=None):
     """Get admin URLs for documents"""
     urls = []
     base = base_url.rstrip("/")
@@ -83,7 +83,7 @@ def get_document_admin_urls(output, base_url, max_instances):
         urls.append(format_url_tuple(model_name, None, "list", list_url))
 
         # Add edit URLs for actual instances using the helper method
-        instances = get_instance_sample(output, DocumentModel, max_instances)
+        instances = get_instance_sample(output, DocumentModel, max_instances, since=since)
         for instance in instances:
             instance_name = truncate_instance_name(str(instance))
             # The correct edit URL pattern for documents
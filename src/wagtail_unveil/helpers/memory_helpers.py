@@ -0,0 +1,263 @@
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+from contextlib import contextmanager
+
+from .base import UrlRecord
+from .inprocess_helpers import check_url_in_process
+from .stats_helpers import format_ms, format_size
+
+# Number of times each URL is rendered after its warm-up renders
+DEFAULT_REPEATS = 5
+
+# Renders made before measuring, so lazily filled caches are not counted
+WARMUP_RENDERS = 2
+
+# Bytes a URL must retain per render on average before it is flagged. The
+# Django test client itself retains a few hundred bytes per request.
+DEFAULT_MIN_GROWTH = 8 * 1024
+
+# Allocations made by the measurement itself are left out of the sites
+_TRACE_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+# Traced memory and RSS after each repeat, with the sites that grew most.
+# The first values are measured after the warm-up renders.
+MemoryGrowth = namedtuple("MemoryGrowth", ["record", "traced", "rss", "sites"])
+
+
+def get_rss():
+    """
+    Return the resident set size of the process in bytes.
+
+    Uses /proc on Linux, elsewhere falls back to the peak RSS reported by
+    the resource module. Returns None if neither is available.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, other platforms kilobytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def measure_memory_growth(client, record, repeats=DEFAULT_REPEATS, top=5):
+    """
+    Render a URL repeatedly in-process and record the memory it retains.
+
+    The URL is rendered a few times first so caches filled by the first
+    requests are not counted, then garbage is collected after every repeat.
+
+    Args:
+        client: A client from create_inprocess_client
+        record: The UrlRecord (or model_name, url_type, url tuple) to render
+        repeats: Number of renders measured after the warm-up renders
+        top: Number of allocation sites to return
+
+    Returns:
+        A MemoryGrowth
+    """
+    record = UrlRecord(*record)
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        for _ in range(WARMUP_RENDERS):
+            check_url_in_process(client, record)
+        gc.collect()
+        baseline = tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+        traced = [tracemalloc.get_traced_memory()[0]]
+        rss = [get_rss()]
+
+        for _ in range(repeats):
+            check_url_in_process(client, record)
+            gc.collect()
+            traced.append(tracemalloc.get_traced_memory()[0])
+            rss.append(get_rss())
+
+        final = tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+    sites = [
+        (f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", stat.size_diff, stat.count_diff)
+        for stat in final.compare_to(baseline, "lineno")
+        if stat.size_diff > 0
+    ][:top]
+    return MemoryGrowth(record, traced, rss, sites)
+
+
+def is_growing(growth, min_growth=DEFAULT_MIN_GROWTH):
+    """Return whether retained memory grew after every repeat, by min_growth per render on average."""
+    deltas = [after - before for before, after in zip(growth.traced, growth.traced[1:])]
+    return bool(deltas) and all(delta > 0 for delta in deltas) and (
+        sum(deltas) / len(deltas) >= min_growth
+    )
+
+
+def format_growth(size):
+    """Format a signed change in bytes for report output."""
+    if size is None:
+        return "-"
+    return f"{'-' if size < 0 else '+'}{format_size(abs(size))}"
+
+
+class MemoryGrowthSummary:
+    """Collect the memory growth of each URL and report the URLs that keep growing."""
+
+    def __init__(self, repeats=DEFAULT_REPEATS, min_growth=DEFAULT_MIN_GROWTH, limit=10):
+        self.repeats = repeats
+        self.min_growth = min_growth
+        self.limit = limit
+        self.results = []
+
+    def add(self, growth):
+        self.results.append(growth)
+
+    def get_report_lines(self):
+        """Return the growing URLs with their allocation sites, then the largest growth."""
+        if not self.results:
+            return ["No URLs rendered"]
+
+        growing = [growth for growth in self.results if is_growing(growth, self.min_growth)]
+        lines = [
+            f"Rendered each URL {self.repeats} times after {WARMUP_RENDERS} warm-up renders",
+            f"{len(growing)} of {len(self.results)} URLs kept growing",
+            "",
+            f"{'traced':>9} {'rss':>9}  URL",
+        ]
+        for growth in growing:
+            lines.append(f"{self.get_growth_line(growth)}  [GROWING]")
+            for location, size_diff, count_diff in growth.sites:
+                lines.append(
+                    f"{'':>20}{format_growth(size_diff)} ({count_diff:+} blocks)  {location}"
+                )
+
+        others = sorted(
+            (growth for growth in self.results if not is_growing(growth, self.min_growth)),
+            key=lambda growth: growth.traced[-1] - growth.traced[0],
+            reverse=True,
+        )
+        for growth in others[: self.limit]:
+            lines.append(self.get_growth_line(growth))
+        return lines
+
+    def get_growth_line(self, growth):
+        traced = growth.traced[-1] - growth.traced[0]
+        rss = None
+        if growth.rss[0] is not None and growth.rss[-1] is not None:
+            rss = growth.rss[-1] - growth.rss[0]
+        record = growth.record
+        return (
+            f"{format_growth(traced):>9} {format_growth(rss):>9}  "
+            f"{record.url} ({record.url_type}, {record.model_name})"
+        )
+
+
+class GcProbe:
+    """
+    Attribute garbage collections to the URL being rendered.
+
+    A gc.callbacks hook is registered while each URL is rendered to record
+    the collections per generation and the time the collector paused the
+    request. Generation 2 collections walk every tracked object, they are
+    the ones causing latency spikes.
+    """
+
+    title = "GARBAGE COLLECTION"
+
+    def __init__(self, limit=10):
+        self.limit = limit
+        self.rows = []
+
+    @contextmanager
+    def measure(self, record):
+        metrics = {
+            "gc_collections": [0] * len(gc.get_count()),
+            "gc_collected": 0,
+            "gc_pause": 0.0,
+            "gc_gen2_pause": 0.0,
+        }
+        started = []
+
+        def callback(phase, info):
+            if phase == "start":
+                started.append(time.perf_counter())
+            elif started:
+                pause = time.perf_counter() - started.pop()
+                generation = info["generation"]
+                metrics["gc_collections"][generation] += 1
+                metrics["gc_collected"] += info["collected"]
+                metrics["gc_pause"] += pause
+                if generation == 2:
+                    metrics["gc_gen2_pause"] += pause
+
+        blocks = sys.getallocatedblocks()
+        gc.callbacks.append(callback)
+        try:
+            yield metrics
+        finally:
+            gc.callbacks.remove(callback)
+            # Net number of memory blocks still allocated after the request
+            metrics["allocated_blocks"] = sys.getallocatedblocks() - blocks
+
+    def add(self, record, metrics):
+        """Add the collections of a checked URL, URLs without any are ignored."""
+        if not metrics or "gc_collections" not in metrics:
+            return
+        self.rows.append((UrlRecord(*record), metrics))
+
+    def get_report_lines(self):
+        """Return the collection totals, the URLs triggering gen 2 and the longest pauses."""
+        if not self.rows:
+            return ["No collections recorded"]
+
+        totals = [sum(counts) for counts in zip(*(metrics["gc_collections"] for _, metrics in self.rows))]
+        total_pause = sum(metrics["gc_pause"] for _, metrics in self.rows)
+        lines = [
+            "Collections: "
+            + ", ".join(f"gen{generation} {count}" for generation, count in enumerate(totals))
+            + f"; {format_ms(total_pause)} total pause",
+        ]
+
+        gen2 = [row for row in self.rows if row[1]["gc_collections"][2]]
+        lines.append("")
+        if gen2:
+            lines.append(f"{len(gen2)} URLs triggered generation 2 collections")
+            lines.append(f"{'gen2':>5} {'pause':>9} {'blocks':>8}  URL")
+            gen2.sort(key=lambda row: row[1]["gc_gen2_pause"], reverse=True)
+            for record, metrics in gen2:
+                lines.append(
+                    f"{metrics['gc_collections'][2]:>5} {format_ms(metrics['gc_gen2_pause']):>9} "
+                    f"{metrics.get('allocated_blocks', 0):>+8}  {self.get_url_label(record)}"
+                )
+        else:
+            lines.append("No URLs triggered generation 2 collections")
+
+        lines.append("")
+        lines.append("Longest GC pauses")
+        lines.append(f"{'pause':>9} {'collections':>11} {'blocks':>8}  URL")
+        longest = sorted(self.rows, key=lambda row: row[1]["gc_pause"], reverse=True)
+        for record, metrics in longest[: self.limit]:
+            lines.append(
+                f"{format_ms(metrics['gc_pause']):>9} {sum(metrics['gc_collections']):>11} "
+                f"{metrics.get('allocated_blocks', 0):>+8}  {self.get_url_label(record)}"
+            )
+        return lines
+
+    def get_url_label(self, record):
+        return f"{record.url} ({record.url_type}, {record.model_name})"
@@ -41,7 +41,7 @@ def get_modeladmin_models():
 
 
 def get_modeladmin_urls(
-    output, base_url, max_instances
+    output, base_url, max_instances, since=None
 ):
     """Get admin URLs for modeladmin models"""
     urls = []
@@ -88,7 +88,7 @@ def get_modeladmin_urls(
             urls.append(format_url_tuple(model_name, None, "list", list_url))
 
             # Add edit URLs for actual instances
-            instances = get_instance_sample(output, model, max_instances)
+            instances = get_instance_sample(output, model, max_instances, since=since)
             for instance in instances:
                 instance_name = truncate_instance_name(str(instance))
 
@@ -14,7 +14,46 @@ def get_page_models():
     return get_page_models_wagtail()
 
 
-def get_page_urls(output, base_url, max_instances):
+def get_default_base_url(output):
+    """
+    Build the base URL of the site from the default Wagtail site.
+
+    Falls back to http://localhost:8000 when there is no default site.
+
+    Args:
+        output: The stdout writer from the command
+
+    Returns:
+        The base URL, without a trailing slash
+    """
+    try:
+        default_site = Site.objects.filter(is_default_site=True).first()
+        if default_site:
+            # Build URL from site settings
+            if default_site.port == 80 or default_site.port == 443:
+                port_string = ""
+            else:
+                port_string = f":{default_site.port}"
+
+            protocol = "https" if default_site.port == 443 else "http"
+            base_url = f"{protocol}://{default_site.hostname}{port_string}"
+            output.write(f"Using auto-detected URL from default site: {base_url}")
+        else:
+            # Fallback to localhost if no default site exists
+            base_url = "http://localhost:8000"
+            output.write(f"No default site found, using fallback URL: {base_url}")
+    except (AttributeError, Site.DoesNotExist, ImportError) as e:
+        # Fallback if there's an error
+        base_url = "http://localhost:8000"
+        message = f"Error detecting site URL: {str(e)}. Using fallback URL: {base_url}"
+        if hasattr(output, "style"):
+            output.write(output.style.WARNING(message))
+        else:
+            output.write(message)
+    return base_url
+
+
+def get_page_urls(output, base_url, max_instances, since=None):
     """Get admin URLs for page models"""
     urls = []
     # Strip trailing slash from base_url to avoid double slashes
@@ -28,11 +67,11 @@ def get_page_urls(output, base_url, max_instances):
 
         # Get instances using our safe query helper
         instances = (
-            get_instance_sample(output, model, max_instances) if has_instances else []
+            get_instance_sample(output, model, max_instances, since=since) if has_instances else []
         )
 
         if instances:
-            # Add edit and frontend URLs for each instance
+            # Add edit and frontend URLs for each instance, with since only the changed ones
             for instance in instances:
                 # Add admin edit URL
                 edit_url = f"{base}/admin/pages/{instance.id}/edit/"
@@ -64,6 +103,10 @@ def get_page_urls(output, base_url, max_instances):
                             model_name, instance.title, "frontend", frontend_url
                         )
                     )
+        elif has_instances:
+            # No instance changed since the cutoff or the sample query failed,
+            # the list URL is still checked
+            urls.append(format_url_tuple(model_name, None, "list", f"{base}/admin/pages/"))
         else:
             # For models with no instances, always show the list URL with a note
             if hasattr(output, "style"):
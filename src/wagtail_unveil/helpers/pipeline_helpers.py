@@ -0,0 +1,113 @@
+import queue
+import threading
+
+from django.db import connections
+
+from .base import UrlRecord
+
+# URLs waiting to be checked, discovery pauses while the queue is full
+DEFAULT_QUEUE_SIZE = 100
+
+# Seconds a blocked thread waits before checking whether the pipeline stopped
+POLL_INTERVAL = 0.1
+
+_DONE = object()
+_ERROR = object()
+
+
+def check_records(records, check_funcs, queue_size=DEFAULT_QUEUE_SIZE, pipelined=True):
+    """
+    Check URLs while they are still being discovered and yield each result as it arrives.
+
+    Discovery runs in its own thread and feeds a bounded queue, so checking
+    starts with the first URL found and at most queue_size URLs wait in memory.
+    Each check function runs in its own thread. With a single check function
+    the results come back in discovery order.
+
+    Without pipelining every URL is discovered before the first is checked.
+    In-process checks need this, as the discovery thread's queries,
+    allocations and garbage collections would otherwise be measured as part
+    of the URL being rendered.
+
+    Args:
+        records: Iterable of UrlRecord (or model_name, url_type, url tuples),
+            usually a generator discovering the URLs
+        check_funcs: One function per checking thread, taking a UrlRecord and returning a CheckResult
+        queue_size: Maximum number of URLs and of results waiting in the queues
+        pipelined: Check URLs while discovery is still running
+
+    Yields:
+        (UrlRecord, CheckResult) pairs
+
+    Raises:
+        Any exception raised while discovering or checking the URLs
+    """
+    if not pipelined:
+        records = list(records)
+
+    pending = queue.Queue(maxsize=queue_size)
+    done = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+
+    def put(target, item):
+        # Gives up once the pipeline stopped, so no thread blocks on a full queue forever
+        while not stop.is_set():
+            try:
+                target.put(item, timeout=POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def get(source):
+        while not stop.is_set():
+            try:
+                return source.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def discover():
+        try:
+            for record in records:
+                if not put(pending, UrlRecord(*record[:3])):
+                    return
+        except Exception as e:
+            put(done, (_ERROR, e))
+        finally:
+            for _ in check_funcs:
+                put(pending, _DONE)
+            connections.close_all()
+
+    def check(check_func):
+        try:
+            while True:
+                record = get(pending)
+                if record is _DONE:
+                    break
+                if not put(done, (record, check_func(record))):
+                    break
+        except Exception as e:
+            put(done, (_ERROR, e))
+        finally:
+            put(done, (_DONE, None))
+            connections.close_all()
+
+    threads = [threading.Thread(target=discover, daemon=True)]
+    threads.extend(threading.Thread(target=check, args=(check_func,), daemon=True) for check_func in check_funcs)
+    for thread in threads:
+        thread.start()
+
+    finished = 0
+    try:
+        while finished < len(check_funcs):
+            record, result = done.get()
+            if record is _DONE:
+                finished += 1
+            elif record is _ERROR:
+                raise result
+            else:
+                yield record, result
+    finally:
+        # Also runs when the caller stops early or is interrupted
+        stop.set()
@@ -0,0 +1,253 @@
+import cProfile
+import heapq
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from itertools import count
+
+from django.utils.text import slugify
+
+from .base import UrlRecord
+from .stats_helpers import format_ms
+
+# Stacks whose time is below this many microseconds are left out of collapsed output
+MIN_STACK_MICROSECONDS = 1
+
+# Deeper call chains are cut off, recursive code could otherwise expand forever
+MAX_STACK_DEPTH = 200
+
+
+def get_function_label(func):
+    """Return a readable label for a pstats (filename, lineno, name) function key."""
+    filename, lineno, name = func
+    if filename == "~":
+        # Built-in functions have no file
+        label = name
+    else:
+        label = f"{name} ({os.path.basename(filename)}:{lineno})"
+    # Semicolons separate the frames of a collapsed stack
+    return label.replace(";", ",")
+
+
+def get_collapsed_stacks(stats):
+    """
+    Convert profile statistics to collapsed stacks for flamegraph tools.
+
+    cProfile only records caller and callee pairs, so full stacks are
+    rebuilt by walking the call graph from its roots and splitting the time
+    of each function between its callers in proportion to their calls. The
+    stacks are an approximation, recursive calls are folded into the first
+    call and tiny stacks are left out.
+
+    Args:
+        stats: A pstats.Stats instance
+
+    Returns:
+        A list of "frame;frame;frame microseconds" lines
+    """
+    callees = {}
+    roots = []
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        if not callers:
+            roots.append(func)
+        for caller, (_, _, _, cumulative) in callers.items():
+            callees.setdefault(caller, []).append((func, cumulative))
+
+    totals = {}
+
+    def walk(func, stack, ratio):
+        stack.append(get_function_label(func))
+        own_time = stats.stats[func][2] * ratio
+        path = ";".join(stack)
+        totals[path] = totals.get(path, 0.0) + own_time
+
+        if len(stack) < MAX_STACK_DEPTH:
+            for callee, edge_cumulative in callees.get(func, []):
+                callee_cumulative = stats.stats[callee][3]
+                if not callee_cumulative:
+                    continue
+                # Share of the callee's time spent below this path
+                share = (edge_cumulative / callee_cumulative) * ratio
+                if callee_cumulative * share * 1e6 < MIN_STACK_MICROSECONDS:
+                    continue
+                if get_function_label(callee) in stack:
+                    # Recursion is already accounted for in the cumulative times
+                    continue
+                walk(callee, stack, share)
+        stack.pop()
+
+    for root in roots:
+        walk(root, [], 1.0)
+
+    return [
+        f"{path} {round(seconds * 1e6)}"
+        for path, seconds in totals.items()
+        if round(seconds * 1e6) >= MIN_STACK_MICROSECONDS
+    ]
+
+
+class ProfileProbe:
+    """
+    Profile each in-process request with cProfile and save the results.
+
+    Each profile is written as a .pstats file and a collapsed stacks .txt
+    file named after the model and URL type of the URL. When top is set
+    only the profiles of the slowest requests are kept, files of faster
+    requests are removed as slower ones come in.
+    """
+
+    title = "PROFILES"
+
+    def __init__(self, directory, top=0):
+        self.directory = directory
+        self.top = top
+        self.profiles = []
+        self.used_names = set()
+        self.counter = count()
+        os.makedirs(directory, exist_ok=True)
+
+    def get_file_name(self, record):
+        """Return a unique file name, without extension, for the profile of a URL."""
+        base_name = f"{slugify(record.model) or 'url'}--{record.url_type}"
+        name = base_name
+        suffix = 2
+        while name in self.used_names:
+            name = f"{base_name}--{suffix}"
+            suffix += 1
+        self.used_names.add(name)
+        return name
+
+    @contextmanager
+    def measure(self, record):
+        record = UrlRecord(*record)
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            yield {}
+        finally:
+            profiler.disable()
+        elapsed = time.perf_counter() - start
+        self.save(record, profiler, elapsed)
+
+    def save(self, record, profiler, elapsed):
+        """Write the profile of a request, dropping the fastest one beyond top."""
+        if self.top and len(self.profiles) >= self.top and elapsed <= self.profiles[0][0]:
+            return
+
+        path = os.path.join(self.directory, self.get_file_name(record))
+        stats = pstats.Stats(profiler)
+        stats.dump_stats(f"{path}.pstats")
+        with open(f"{path}.txt", "w") as f:
+            for line in get_collapsed_stacks(stats):
+                f.write(f"{line}\n")
+
+        # Profiles are kept in a heap so the fastest one is dropped first
+        heapq.heappush(self.profiles, (elapsed, next(self.counter), record, path))
+        if self.top and len(self.profiles) > self.top:
+            _, _, _, dropped_path = heapq.heappop(self.profiles)
+            os.remove(f"{dropped_path}.pstats")
+            os.remove(f"{dropped_path}.txt")
+            self.used_names.discard(os.path.basename(dropped_path))
+
+    def add(self, record, metrics):
+        """Profiles are saved as they are measured, nothing is stored per URL."""
+
+    def get_report_lines(self):
+        """Return the saved profiles as lines of text, slowest first."""
+        if not self.profiles:
+            return ["No profiles saved"]
+
+        lines = [f"Profiles saved to {self.directory} (.pstats and collapsed stacks .txt)"]
+        for elapsed, _, record, path in sorted(self.profiles, reverse=True):
+            lines.append(
+                f"{format_ms(elapsed):>10}  {os.path.basename(path)}  {record.url}"
+            )
+        return lines
+
+
+class SamplingProbe:
+    """
+    Sample the stack of the checking thread while each URL is rendered.
+
+    A background thread looks at the stack every interval seconds, which
+    costs far less than tracing every call, so timings stay realistic. The
+    samples are attributed to the URL being rendered and aggregated into
+    hot function tables per URL type.
+    """
+
+    title = "SAMPLED HOT FUNCTIONS"
+
+    def __init__(self, interval=0.005, limit=15):
+        self.interval = interval
+        self.limit = limit
+        # Samples where the function was running, and where it was on the stack
+        self.self_samples = defaultdict(Counter)
+        self.total_samples = defaultdict(Counter)
+        self.type_samples = Counter()
+        self.url_samples = Counter()
+
+    def sample(self, thread_id, record, stop):
+        """Record the stack of a thread every interval until stop is set."""
+        while not stop.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                continue
+            labels = []
+            while frame is not None:
+                code = frame.f_code
+                labels.append(
+                    get_function_label((code.co_filename, code.co_firstlineno, code.co_name))
+                )
+                frame = frame.f_back
+            self.self_samples[record.url_type][labels[0]] += 1
+            # Recursive functions only count once per sample
+            self.total_samples[record.url_type].update(set(labels))
+            self.type_samples[record.url_type] += 1
+            self.url_samples[record] += 1
+
+    @contextmanager
+    def measure(self, record):
+        record = UrlRecord(*record)
+        stop = threading.Event()
+        sampler = threading.Thread(
+            target=self.sample,
+            args=(threading.get_ident(), record, stop),
+            name="unveil-sampler",
+            daemon=True,
+        )
+        sampler.start()
+        try:
+            yield {}
+        finally:
+            stop.set()
+            sampler.join()
+
+    def add(self, record, metrics):
+        """Samples are aggregated as they are taken, nothing is stored per URL."""
+
+    def get_report_lines(self):
+        """Return the hot functions of each URL type and the most sampled URLs."""
+        if not self.type_samples:
+            return ["No samples taken"]
+
+        lines = [f"Sampled every {format_ms(self.interval)}"]
+        for url_type, samples in self.type_samples.most_common():
+            lines.append("")
+            lines.append(f"{url_type} ({samples} samples)")
+            lines.append(f"{'self%':>7} {'total%':>7}  Function")
+            for label, own in self.self_samples[url_type].most_common(self.limit):
+                total = self.total_samples[url_type][label]
+                lines.append(
+                    f"{own / samples * 100:>6.1f}% {total / samples * 100:>6.1f}%  {label}"
+                )
+
+        lines.append("")
+        lines.append("Most sampled URLs")
+        for record, samples in self.url_samples.most_common(self.limit):
+            lines.append(f"{samples:>7}  {record.url} ({record.url_type}, {record.model_name})")
+        return lines
@@ -0,0 +1,146 @@
+import json
+from datetime import datetime, timezone
+
+from .base import UrlRecord
+from .check_helpers import CheckResult
+
+# Version of the results file format, bumped on incompatible changes
+RESULTS_VERSION = 1
+
+
+def get_result_row(record, result=None):
+    """Return a JSON serializable row of a URL and, if it was checked, its CheckResult."""
+    record = UrlRecord(*record[:3])
+    row = {**record._asdict(), "url_id": record.url_id}
+    if result is None:
+        return row
+    return {**row, **result._asdict()}
+
+
+def get_check_result(row):
+    """Return the UrlRecord and CheckResult of a results file row."""
+    record = UrlRecord(row["model_name"], row["url_type"], row["url"])
+    return record, CheckResult(**{field: row.get(field) for field in CheckResult._fields})
+
+
+class ResultsWriter:
+    """
+    Write check results to a JSON file that unveil_merge can combine.
+
+    Rows are written as they are added, so a long check run never holds
+    its results in memory. The file is only valid JSON once closed.
+    """
+
+    def __init__(self, path, base_url, shard=None):
+        """
+        Args:
+            path: The file to write
+            base_url: The base URL the URLs were checked against
+            shard: Optional (shard, shard_count) tuple the results belong to
+        """
+        self.count = 0
+        self.file = open(path, "w")  # noqa: SIM115 - closed by close()
+        header = {
+            "version": RESULTS_VERSION,
+            "base_url": base_url,
+            "shard": f"{shard[0]}/{shard[1]}" if shard else None,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        # The header is left open so the results list can follow it
+        self.file.write(json.dumps(header, indent=2)[:-2] + ',\n  "results": [')
+
+    def add(self, record, result=None):
+        """Write the row of a URL and, if it was checked, its CheckResult."""
+        separator = "," if self.count else ""
+        self.file.write(f"{separator}\n    {json.dumps(get_result_row(record, result))}")
+        self.count += 1
+
+    def close(self):
+        """Close the results list and the file, closing again has no effect."""
+        if self.file.closed:
+            return
+        self.file.write("\n  ]\n}\n" if self.count else "]\n}\n")
+        self.file.close()
+
+
+def write_results(path, base_url, results, shard=None):
+    """
+    Write check results to a JSON file that unveil_merge can combine.
+
+    Args:
+        path: The file to write
+        base_url: The base URL the URLs were checked against
+        results: Iterable of (record, CheckResult) pairs
+        shard: Optional (shard, shard_count) tuple the results belong to
+    """
+    writer = ResultsWriter(path, base_url, shard=shard)
+    try:
+        for record, result in results:
+            writer.add(record, result)
+    finally:
+        writer.close()
+
+
+def read_results(path):
+    """
+    Read a results file written by write_results.
+
+    Raises:
+        ValueError: If the file can't be read or isn't a results file
+    """
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Could not read results file {path}: {e}")
+    if not isinstance(data, dict) or not isinstance(data.get("results"), list):
+        raise ValueError(f"{path} is not a results file")
+    if data.get("version") != RESULTS_VERSION:
+        raise ValueError(f"{path} has unsupported results version {data.get('version')}")
+    return data
+
+
+def merge_results(result_files):
+    """
+    Combine the results of several files, such as the shards of one check run.
+
+    Args:
+        result_files: List of results file dictionaries from read_results
+
+    Returns:
+        A (rows, duplicate_count, missing_shards) tuple. URLs found in more
+        than one file are only kept from the first one, missing_shards lists the "i/N"
+        shards that weren't given when the files are shards.
+
+    Raises:
+        ValueError: If the files are shards of different shard counts
+    """
+    rows = []
+    seen = set()
+    duplicate_count = 0
+    for data in result_files:
+        # The inventory can list a URL more than once, only URLs already
+        # seen in an earlier file are duplicates
+        urls = set()
+        for row in data["results"]:
+            if row["url"] in seen:
+                duplicate_count += 1
+                continue
+            urls.add(row["url"])
+            rows.append(row)
+        seen |= urls
+
+    shards = [data["shard"] for data in result_files if data.get("shard")]
+    missing_shards = []
+    if shards:
+        shard_counts = {int(shard.split("/")[1]) for shard in shards}
+        if len(shard_counts) > 1:
+            raise ValueError(
+                f"The results are shards of different runs: {', '.join(sorted(set(shards)))}"
+            )
+        shard_count = shard_counts.pop()
+        given = {int(shard.split("/")[0]) for shard in shards}
+        missing_shards = [
+            f"{shard}/{shard_count}" for shard in range(1, shard_count + 1) if shard not in given
+        ]
+    return rows, duplicate_count, missing_shards
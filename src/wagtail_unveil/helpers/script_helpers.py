@@ -0,0 +1,256 @@
+import json
+from urllib.parse import urlsplit
+
+from .base import UrlRecord
+
+# Default file names of the generated load test scripts
+SCRIPT_FILE_NAMES = {
+    "locust": "locustfile.py",
+    "k6": "unveil_k6.js",
+    "wrk": "unveil_wrk.lua",
+}
+
+LOCUST_SCRIPT = '''
+
+class UnveilUser(HttpUser):
+    """Log into the Wagtail admin, then request random URLs of the inventory."""
+
+    wait_time = between(0.5, 1.5)
+
+    def on_start(self):
+        login_url = "/admin/login/"
+        response = self.client.get(login_url, name="login")
+        match = re.search(r'name="csrfmiddlewaretoken" value="([^"]+)"', response.text)
+        self.client.post(
+            login_url,
+            data={
+                "csrfmiddlewaretoken": match.group(1) if match else "",
+                "username": USERNAME,
+                "password": PASSWORD,
+                "next": "/admin/",
+            },
+            headers={"Referer": self.host.rstrip("/") + login_url},
+            name="login",
+        )
+
+    @task
+    def request_url(self):
+        model_name, url_type, path = random.choice(URLS)
+        self.client.get(path, name=f"{url_type}: {model_name}")
+'''
+
+K6_SCRIPT = '''
+export const options = {
+  vus: 10,
+  duration: "1m",
+};
+
+// k6 empties the cookie jar before every iteration, so the session cookies
+// of each virtual user are kept here and set again
+let sessionCookies = null;
+
+function login() {
+  const loginUrl = `${BASE_URL}/admin/login/`;
+  const page = http.get(loginUrl, { tags: { name: "login" } });
+  const token = page.html().find("input[name=csrfmiddlewaretoken]").attr("value");
+  const response = http.post(
+    loginUrl,
+    { csrfmiddlewaretoken: token, username: USERNAME, password: PASSWORD, next: "/admin/" },
+    { headers: { Referer: loginUrl }, tags: { name: "login" } },
+  );
+  check(response, { "logged in": (r) => !r.url.includes("/admin/login/") });
+  return http.cookieJar().cookiesForURL(BASE_URL);
+}
+
+export default function () {
+  if (sessionCookies === null) {
+    sessionCookies = login();
+  }
+  const jar = http.cookieJar();
+  for (const [name, values] of Object.entries(sessionCookies)) {
+    jar.set(BASE_URL, name, values[0]);
+  }
+
+  const [modelName, urlType, path] = URLS[Math.floor(Math.random() * URLS.length)];
+  const response = http.get(`${BASE_URL}${path}`, {
+    tags: { name: `${urlType}: ${modelName}`, url_type: urlType },
+  });
+  check(response, { "status is 200": (r) => r.status === 200 });
+}
+'''
+
+WRK_SCRIPT = '''
+-- wrk can't make requests of its own from Lua, and connections sharing a
+-- thread would race through a login made with measured requests. So setup()
+-- logs in once with curl before the load starts and hands every thread the
+-- session cookie, every URL of the inventory is requested with it.
+
+local function shell_quote(value)
+  return "'" .. value:gsub("'", "'\\\\''") .. "'"
+end
+
+local function login()
+  local login_url = wrk.scheme .. "://" .. wrk.host .. ":" .. wrk.port .. "/admin/login/"
+  local jar = os.tmpname()
+  local page_pipe = io.popen("curl -s -c " .. shell_quote(jar) .. " " .. shell_quote(login_url))
+  local page = page_pipe:read("*a")
+  page_pipe:close()
+  local csrf_token = page:match('name="csrfmiddlewaretoken" value="([^"]+)"') or ""
+
+  -- The password is passed on stdin so it doesn't show up in the process list
+  local post = io.popen(
+    "curl -s -o /dev/null -b " .. shell_quote(jar) .. " -c " .. shell_quote(jar)
+      .. " -H " .. shell_quote("Referer: " .. login_url)
+      .. " --data-urlencode " .. shell_quote("csrfmiddlewaretoken=" .. csrf_token)
+      .. " --data-urlencode " .. shell_quote("username=" .. username)
+      .. " --data-urlencode password@- --data next=/admin/ "
+      .. shell_quote(login_url),
+    "w"
+  )
+  post:write(password)
+  post:close()
+
+  -- Netscape cookie jar lines end with the cookie name and value
+  local cookies = {}
+  local logged_in = false
+  for line in io.lines(jar) do
+    local name, value = line:match("([^\\t]+)\\t([^\\t]*)$")
+    if name and not line:match("^# ") then
+      cookies[#cookies + 1] = name .. "=" .. value
+      logged_in = logged_in or name == "sessionid"
+    end
+  end
+  os.remove(jar)
+  if not logged_in then
+    error("Failed to log in to " .. login_url .. " as " .. username)
+  end
+  return table.concat(cookies, "; ")
+end
+
+local session_cookie = nil
+
+setup = function(thread)
+  session_cookie = session_cookie or login()
+  thread:set("cookie", session_cookie)
+end
+
+request = function()
+  return wrk.format("GET", paths[math.random(#paths)], { ["Cookie"] = cookie })
+end
+'''
+
+
+def get_url_path(url):
+    """Return the path and query string of a URL, the scripts take the host when they run."""
+    parts = urlsplit(url)
+    return f"{parts.path or '/'}?{parts.query}" if parts.query else parts.path or "/"
+
+
+def get_script_records(urls):
+    """Return the (model_name, url_type, path) rows of the URLs, without duplicate paths."""
+    rows = []
+    seen = set()
+    for url_data in urls:
+        record = UrlRecord(*url_data[:3])
+        path = get_url_path(record.url)
+        if path not in seen:
+            seen.add(path)
+            rows.append((record.model_name, record.url_type, path))
+    return rows
+
+
+def lua_string(value):
+    """Quote a string as a Lua string literal."""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+
+
+def get_locust_script(urls, base_url, username=None):
+    """
+    Return a Locust file requesting the URLs as a logged in admin user.
+
+    Args:
+        urls: List of (model_name, url_type, url) tuples
+        base_url: The base URL the URLs were generated for, used in the run instructions
+        username: Default admin username, the UNVEIL_USERNAME environment variable overrides it
+
+    Returns:
+        The script as a string
+    """
+    rows = "".join(f"    {json.dumps(list(row))},\n" for row in get_script_records(urls))
+    return (
+        "# Load test generated by wagtail-unveil\n"
+        f"# Run with: UNVEIL_PASSWORD=... locust -f locustfile.py --host {base_url.rstrip('/')}\n"
+        "import os\n"
+        "import random\n"
+        "import re\n"
+        "\n"
+        "from locust import HttpUser, between, task\n"
+        "\n"
+        f"USERNAME = os.environ.get(\"UNVEIL_USERNAME\", {json.dumps(username or '')})\n"
+        "PASSWORD = os.environ.get(\"UNVEIL_PASSWORD\", \"\")\n"
+        "\n"
+        "# (model name, URL type, path)\n"
+        f"URLS = [\n{rows}]\n"
+        + LOCUST_SCRIPT
+    )
+
+
+def get_k6_script(urls, base_url, username=None):
+    """
+    Return a k6 script requesting the URLs as a logged in admin user.
+
+    Args:
+        urls: List of (model_name, url_type, url) tuples
+        base_url: Default base URL, the BASE_URL environment variable overrides it
+        username: Default admin username, the UNVEIL_USERNAME environment variable overrides it
+
+    Returns:
+        The script as a string
+    """
+    rows = "".join(f"  {json.dumps(list(row))},\n" for row in get_script_records(urls))
+    return (
+        "// Load test generated by wagtail-unveil\n"
+        "// Run with: k6 run -e UNVEIL_PASSWORD=... unveil_k6.js\n"
+        'import http from "k6/http";\n'
+        'import { check } from "k6";\n'
+        "\n"
+        f"const BASE_URL = __ENV.BASE_URL || {json.dumps(base_url.rstrip('/'))};\n"
+        f"const USERNAME = __ENV.UNVEIL_USERNAME || {json.dumps(username or '')};\n"
+        'const PASSWORD = __ENV.UNVEIL_PASSWORD || "";\n'
+        "\n"
+        "// [model name, URL type, path]\n"
+        f"const URLS = [\n{rows}];\n"
+        + K6_SCRIPT
+    )
+
+
+def get_wrk_script(urls, base_url, username=None):
+    """
+    Return a wrk Lua script requesting the URLs as a logged in admin user.
+
+    Args:
+        urls: List of (model_name, url_type, url) tuples
+        base_url: The base URL the URLs were generated for, used in the run instructions
+        username: Default admin username, the UNVEIL_USERNAME environment variable overrides it
+
+    Returns:
+        The script as a string
+    """
+    rows = "".join(f"  {lua_string(path)},\n" for _, _, path in get_script_records(urls))
+    return (
+        "-- Load test generated by wagtail-unveil\n"
+        f"-- Run with: UNVEIL_PASSWORD=... wrk -t4 -c16 -d60s -s unveil_wrk.lua {base_url.rstrip('/')}\n"
+        "-- Logging in needs curl\n"
+        f"local username = os.getenv(\"UNVEIL_USERNAME\") or {lua_string(username or '')}\n"
+        "local password = os.getenv(\"UNVEIL_PASSWORD\") or \"\"\n"
+        "\n"
+        f"local paths = {{\n{rows}}}\n"
+        + WRK_SCRIPT
+    )
+
+
+SCRIPT_GENERATORS = {
+    "locust": get_locust_script,
+    "k6": get_k6_script,
+    "wrk": get_wrk_script,
+}
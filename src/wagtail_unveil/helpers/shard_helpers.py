@@ -0,0 +1,53 @@
+from .base import UrlRecord, get_url_id
+
+
+def parse_shard(value):
+    """
+    Parse a shard given as "i/N", the i-th of N shards counting from 1.
+
+    Args:
+        value: A string such as "2/4"
+
+    Returns:
+        A (shard, shard_count) tuple of integers
+
+    Raises:
+        ValueError: If the string is not a shard between 1/N and N/N
+    """
+    shard, separator, shard_count = value.partition("/")
+    try:
+        shard, shard_count = int(shard), int(shard_count)
+    except ValueError:
+        raise ValueError(f"Invalid shard '{value}', expected i/N such as 1/4")
+    if not separator or shard_count < 1 or not 1 <= shard <= shard_count:
+        raise ValueError(f"Invalid shard '{value}', i must be between 1 and N")
+    return shard, shard_count
+
+
+def get_shard_number(url, shard_count):
+    """
+    Return the shard, from 1 to shard_count, a URL belongs to.
+
+    The shard comes from the stable ID of the URL, so it is the same on
+    every machine and doesn't change with the base URL.
+    """
+    return int(get_url_id(url), 16) % shard_count + 1
+
+
+def filter_shard(urls, shard, shard_count):
+    """
+    Return the URLs of one shard, keeping their order.
+
+    Args:
+        urls: List of (model_name, url_type, url) tuples
+        shard: The shard to keep, from 1 to shard_count
+        shard_count: The total number of shards
+
+    Returns:
+        The URLs belonging to the shard
+    """
+    return [
+        url_data
+        for url_data in urls
+        if get_shard_number(UrlRecord(*url_data[:3]).url, shard_count) == shard
+    ]
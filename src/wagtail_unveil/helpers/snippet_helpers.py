@@ -13,7 +13,7 @@ from .base import (
 )
 
 
-def get_snippet_urls(output, base_url, max_instances):
+def get_snippet_urls(output, base_url, max_instances, since=None):
     """Get admin URLs for snippet models, including both list and edit URLs"""
     urls = []
     for model in get_snippet_models():
@@ -32,7 +32,7 @@ def get_snippet_urls(output, base_url, max_instances):
             urls.append(format_url_tuple(model_name, None, "list", list_url))
 
             # Add edit URLs for actual instances
-            instances = get_instance_sample(output, model, max_instances)
+            instances = get_instance_sample(output, model, max_instances, since=since)
             for instance in instances:
                 instance_name = truncate_instance_name(str(instance))
                 edit_url = f"{base_url}/admin/snippets/{content_type.app_label}/{content_type.model}/{instance.id}/"
@@ -85,7 +85,7 @@ def get_modelviewset_models():
 
 
 def get_modelviewset_urls(
-    output, base_url, max_instances
+    output, base_url, max_instances, since=None
 ):
     """Get admin URLs for models registered with ModelViewSet"""
     urls = []
@@ -119,7 +119,7 @@ def get_modelviewset_urls(
                 urls.append(format_url_tuple(model_name, None, "list", list_url))
 
                 # Add edit URLs for actual instances with correct plural form
-                instances = get_instance_sample(output, model, max_instances)
+                instances = get_instance_sample(output, model, max_instances, since=since)
                 for instance in instances:
                     instance_name = truncate_instance_name(str(instance))
 
@@ -159,7 +159,7 @@ def get_modelviewset_urls(
             urls.append(format_url_tuple(model_name, None, "list", list_url))
 
             # Add edit URLs for actual instances
-            instances = get_instance_sample(output, model, max_instances)
+            instances = get_instance_sample(output, model, max_instances, since=since)
             for instance in instances:
                 instance_name = truncate_instance_name(str(instance))
 
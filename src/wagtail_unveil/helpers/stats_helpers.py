@@ -0,0 +1,177 @@
+import heapq
+import math
+from collections import defaultdict
+
+from .base import get_model_label
+
+
+def percentile(sorted_values, percent):
+    """
+    Return a percentile of already sorted values using the nearest-rank method.
+
+    Args:
+        sorted_values: A sorted list of numbers
+        percent: The percentile to return, between 0 and 100
+
+    Returns:
+        The value at the percentile, or None if there are no values
+    """
+    if not sorted_values:
+        return None
+    rank = math.ceil(percent / 100 * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+
+def format_ms(seconds):
+    """Format a duration in seconds as milliseconds for report output."""
+    if seconds is None:
+        return "-"
+    return f"{seconds * 1000:.1f}ms"
+
+
+def format_size(size):
+    """Format a response size in bytes for report output."""
+    if size is None:
+        return "-"
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f}MB"
+    if size >= 1024:
+        return f"{size / 1024:.1f}KB"
+    return f"{size}B"
+
+
+class LatencySummary:
+    """
+    Collect check response times and report percentiles per URL type and
+    per model along with the slowest URLs.
+    """
+
+    percentiles = (50, 90, 99)
+
+    def __init__(self, slowest_count=20):
+        self.slowest_count = slowest_count
+        self.by_type = defaultdict(list)
+        self.by_model = defaultdict(list)
+        # Min-heap of the slowest URLs seen so far
+        self.slowest = []
+        self.counter = 0
+
+    def add(self, model_name, url_type, url, result):
+        """Record the timings of a CheckResult, results without timings are ignored."""
+        if result.total is None:
+            return
+        self.by_type[url_type].append(result.total)
+        self.by_model[get_model_label(model_name)].append(result.total)
+
+        # The counter keeps heap entries with equal times comparable
+        self.counter += 1
+        entry = (result.total, self.counter, model_name, url_type, url, result)
+        if len(self.slowest) < self.slowest_count:
+            heapq.heappush(self.slowest, entry)
+        elif entry > self.slowest[0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    def get_group_stats(self, groups):
+        """Return (name, count, p50, p90, p99, max) rows for grouped timings."""
+        rows = []
+        for name, values in sorted(groups.items()):
+            values = sorted(values)
+            rows.append(
+                (name, len(values))
+                + tuple(percentile(values, p) for p in self.percentiles)
+                + (values[-1],)
+            )
+        return rows
+
+    def get_report_lines(self):
+        """Return the latency report as lines of text."""
+        if not self.by_type:
+            return ["No response times recorded"]
+
+        lines = []
+        header = f"{'':<40} {'count':>6} {'p50':>10} {'p90':>10} {'p99':>10} {'max':>10}"
+        for title, groups in (
+            ("By URL type", self.by_type),
+            ("By model", self.by_model),
+        ):
+            lines.append(title)
+            lines.append(header)
+            for name, count, *times in self.get_group_stats(groups):
+                lines.append(
+                    f"{name[:40]:<40} {count:>6} "
+                    + " ".join(f"{format_ms(value):>10}" for value in times)
+                )
+            lines.append("")
+
+        lines.append(f"Slowest {len(self.slowest)} URLs")
+        lines.append(
+            f"{'total':>10} {'ttfb':>10} {'connect':>10} {'dns':>10} {'size':>10}  URL"
+        )
+        for _, _, model_name, url_type, url, result in sorted(self.slowest, reverse=True):
+            lines.append(
+                f"{format_ms(result.total):>10} {format_ms(result.ttfb):>10} "
+                f"{format_ms(result.connect):>10} {format_ms(result.dns):>10} "
+                f"{format_size(result.size):>10}  {url} ({url_type}, {model_name})"
+            )
+        return lines
+
+
+class ColdWarmSummary:
+    """
+    Compare the first, cold, response time of each URL with the warm
+    response time of the request right after it.
+    """
+
+    title = "COLD VS WARM"
+
+    def __init__(self, limit=20):
+        self.limit = limit
+        self.rows = []
+
+    def add(self, record, metrics):
+        """Add the cold and warm times of a checked URL, URLs without them are ignored."""
+        if not metrics or metrics.get("cold_time") is None or metrics.get("warm_time") is None:
+            return
+        model_name, url_type, url = record
+        self.rows.append((model_name, url_type, url, metrics["cold_time"], metrics["warm_time"]))
+
+    @staticmethod
+    def get_ratio(cold, warm):
+        return cold / warm if warm else None
+
+    def get_report_lines(self):
+        """Return median cold and warm times per URL type and the URLs gaining most when warm."""
+        if not self.rows:
+            return ["No cold and warm times recorded"]
+
+        by_type = defaultdict(list)
+        for _, url_type, _, cold, warm in self.rows:
+            by_type[url_type].append((cold, warm))
+
+        lines = [f"{'':<20} {'count':>6} {'cold p50':>10} {'warm p50':>10} {'ratio':>7}"]
+        for url_type, times in sorted(by_type.items()):
+            cold = percentile(sorted(cold for cold, _ in times), 50)
+            warm = percentile(sorted(warm for _, warm in times), 50)
+            lines.append(
+                f"{url_type[:20]:<20} {len(times):>6} {format_ms(cold):>10} "
+                f"{format_ms(warm):>10} {self.format_ratio(cold, warm):>7}"
+            )
+
+        lines.append("")
+        lines.append("Cold to warm ratio by URL, a ratio close to 1 means caching does not help")
+        lines.append(f"{'cold':>10} {'warm':>10} {'ratio':>7}  URL")
+        rows = sorted(
+            self.rows, key=lambda row: self.get_ratio(row[3], row[4]) or 0, reverse=True
+        )
+        for model_name, url_type, url, cold, warm in rows[: self.limit]:
+            lines.append(
+                f"{format_ms(cold):>10} {format_ms(warm):>10} "
+                f"{self.format_ratio(cold, warm):>7}  {url} ({url_type}, {model_name})"
+            )
+        if len(rows) > self.limit:
+            lines.append(f"... and {len(rows) - self.limit} more URLs")
+        return lines
+
+    def format_ratio(self, cold, warm):
+        ratio = self.get_ratio(cold, warm)
+        return "-" if ratio is None else f"{ratio:.1f}x"
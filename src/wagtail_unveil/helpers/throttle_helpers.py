@@ -0,0 +1,240 @@
+import math
+import threading
+import time
+from urllib.parse import urlsplit
+
+# Response time in seconds above which a response counts as a latency spike
+DEFAULT_LATENCY_TARGET = 0.5
+
+# Factor the concurrency limit of a host is multiplied by on errors and latency spikes
+DECREASE_FACTOR = 0.5
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a check runs past the deadline of the run."""
+
+
+def is_overload(result, latency_target):
+    """
+    Whether a check result is a sign the server is overloaded.
+
+    Server errors, 429 Too Many Requests responses, requests that got no
+    response, such as on a timeout, and responses slower than the latency
+    target count as overload.
+    """
+    if result.status_code is None:
+        return result.status != "OK"
+    if result.status_code == 429 or result.status_code >= 500:
+        return True
+    return result.total is not None and result.total > latency_target
+
+
+class AdaptiveLimiter:
+    """
+    Limit the number of URLs checked at once per host with AIMD.
+
+    Each host starts with a limit of one request at a time. The limit grows
+    by one for every limit's worth of responses under the latency target
+    (additive increase), and is halved on server errors, 429 responses,
+    failed requests and latency spikes (multiplicative decrease), never
+    going above the ceiling. Responses to requests started before the last
+    decrease don't decrease the limit again, so one overloaded moment only
+    halves it once.
+    """
+
+    title = "ADAPTIVE CONCURRENCY"
+
+    def __init__(self, ceiling, latency_target=DEFAULT_LATENCY_TARGET, initial=1):
+        """
+        Args:
+            ceiling: The most requests a host ever gets at once
+            latency_target: Response time in seconds under which the limit grows
+            initial: The limit of a host before its first response
+        """
+        self.ceiling = ceiling
+        self.latency_target = latency_target
+        self.initial = min(initial, ceiling)
+        self.condition = threading.Condition()
+        self.limits = {}
+        self.active = {}
+        self.last_decrease = {}
+        self.peaks = {}
+        self.decreases = {}
+
+    def acquire(self, url):
+        """
+        Wait until the URL's host is under its limit and count the request as active.
+
+        Returns:
+            A (host, start time) token to pass to release
+        """
+        host = urlsplit(url).netloc
+        with self.condition:
+            self.limits.setdefault(host, self.initial)
+            self.active.setdefault(host, 0)
+            while self.active[host] >= int(self.limits[host]):
+                self.condition.wait()
+            self.active[host] += 1
+            return host, time.monotonic()
+
+    def release(self, token, result=None):
+        """
+        Count a request as finished and adapt its host's limit to the result.
+
+        Args:
+            token: The token returned by acquire
+            result: The CheckResult, None if the check raised an exception
+        """
+        host, started = token
+        with self.condition:
+            self.active[host] -= 1
+            limit = self.limits[host]
+            if result is None or result.total is None:
+                # Nothing was timed, such as for cached results
+                pass
+            elif is_overload(result, self.latency_target):
+                if limit > 1 and started >= self.last_decrease.get(host, 0):
+                    self.limits[host] = max(1, int(limit * DECREASE_FACTOR))
+                    self.last_decrease[host] = time.monotonic()
+                    self.decreases[host] = self.decreases.get(host, 0) + 1
+            else:
+                self.limits[host] = min(self.ceiling, limit + 1 / int(limit))
+            self.peaks[host] = max(self.peaks.get(host, 0), int(self.limits[host]))
+            self.condition.notify_all()
+
+    def wrap(self, check_func):
+        """Return a check function taking a UrlRecord that is limited by this limiter."""
+
+        def limited_check(record):
+            token = self.acquire(record.url)
+            result = None
+            try:
+                result = check_func(record)
+                return result
+            finally:
+                self.release(token, result)
+
+        return limited_check
+
+    def get_report_lines(self):
+        """Return the final and highest limit of each host and how often it was cut."""
+        if not self.limits:
+            return ["No URLs checked with adaptive concurrency"]
+        lines = [
+            f"Ceiling: {self.ceiling} requests at once, latency target: {self.latency_target * 1000:.0f}ms",
+            f"{'Host':<40} {'final':>6} {'peak':>6} {'cuts':>6}",
+        ]
+        for host in sorted(self.limits):
+            lines.append(
+                f"{host[:40]:<40} {int(self.limits[host]):>6} {self.peaks.get(host, 0):>6} "
+                f"{self.decreases.get(host, 0):>6}"
+            )
+        return lines
+
+
+class TokenBucket:
+    """
+    Limit how many URLs are checked per second across every checking thread.
+
+    The bucket holds up to burst tokens and refills at rate tokens per
+    second. Each check takes a token, waiting for one when the bucket is
+    empty, so after an idle moment up to burst URLs are checked at once
+    while the average never goes above the rate.
+    """
+
+    def __init__(self, rate, burst=None):
+        """
+        Args:
+            rate: Checks per second
+            burst: The most checks started at once, defaults to one second's worth
+        """
+        self.rate = rate
+        self.burst = burst or max(1, math.ceil(rate))
+        self.tokens = self.burst
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def get_wait(self):
+        """Take a token if there is one and return 0, otherwise the seconds until the next one."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        """Wait until a token is available and take it."""
+        wait = self.get_wait()
+        while wait:
+            time.sleep(wait)
+            wait = self.get_wait()
+
+    def wrap(self, check_func):
+        """Return a check function taking a UrlRecord that waits for a token before each check."""
+
+        def rate_limited_check(record):
+            self.acquire()
+            return check_func(record)
+
+        return rate_limited_check
+
+
+class Deadline:
+    """
+    The time by which a check run has to stop.
+
+    URLs aren't checked once the deadline passed, and the timeout of a
+    request is cut so it ends by the deadline, so the run stops on time
+    even when the server hangs.
+    """
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.ends_at = time.monotonic() + seconds
+
+    def remaining(self):
+        """Seconds left until the deadline, 0 once it passed."""
+        return max(0, self.ends_at - time.monotonic())
+
+    @property
+    def expired(self):
+        return self.remaining() <= 0
+
+    def check(self):
+        """
+        Raises:
+            DeadlineExceeded: If the deadline passed
+        """
+        if self.expired:
+            raise DeadlineExceeded(f"Deadline of {self.seconds:g}s reached")
+
+    def get_timeout(self, timeout):
+        """
+        Return the timeout of a request starting now, cut to end by the deadline.
+
+        Raises:
+            DeadlineExceeded: If the deadline passed
+        """
+        self.check()
+        return min(timeout, self.remaining())
+
+    def wrap(self, check_func):
+        """
+        Return a check function taking a UrlRecord that stops at the deadline.
+
+        It raises DeadlineExceeded instead of checking URLs once the deadline
+        passed, and instead of returning a failure of a URL that got no
+        response before the deadline, as the URL didn't fail on its own.
+        """
+
+        def check_before_deadline(record):
+            self.check()
+            result = check_func(record)
+            if result.status_code is None and result.status != "OK":
+                self.check()
+            return result
+
+        return check_before_deadline
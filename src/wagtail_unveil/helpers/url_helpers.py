@@ -0,0 +1,30 @@
+from .media_helpers import get_document_admin_urls, get_image_admin_urls
+from .modeladmin_helpers import get_modeladmin_urls
+from .page_helpers import get_page_urls, get_site_urls
+from .settings_helpers import get_settings_admin_urls
+from .snippet_helpers import get_modelviewset_urls, get_snippet_urls
+
+
+def collect_urls(output, base_url, max_instances, since=None):
+    """
+    Collect every admin and frontend URL in the same order as list_admin_urls.
+
+    Args:
+        output: The stdout writer from the command
+        base_url: The base URL to use for generated URLs
+        max_instances: Maximum number of instances per model (0 for all)
+        since: Optional datetime, only include instances that changed since then
+
+    Returns:
+        A list of (model_name, url_type, url) tuples
+    """
+    urls = []
+    urls.extend(get_site_urls(output, base_url))
+    urls.extend(get_page_urls(output, base_url, max_instances, since=since))
+    urls.extend(get_snippet_urls(output, base_url, max_instances, since=since))
+    urls.extend(get_modeladmin_urls(output, base_url, max_instances, since=since))
+    urls.extend(get_modelviewset_urls(output, base_url, max_instances, since=since))
+    urls.extend(get_image_admin_urls(output, base_url, max_instances, since=since))
+    urls.extend(get_document_admin_urls(output, base_url, max_instances, since=since))
+    urls.extend(get_settings_admin_urls(output, base_url))
+    return urls
@@ -0,0 +1,223 @@
+import csv
+import json
+import tempfile
+from contextlib import ExitStack
+from xml.sax.saxutils import escape, quoteattr
+
+from .base import UrlRecord
+from .result_helpers import ResultsWriter, get_result_row
+
+# Sections of the backend URLs in output order, URLs of any other type are listed under OTHER
+BACKEND_SECTIONS = ["admin", "list", "edit", "delete"]
+
+# CheckResult fields written as CSV columns, metrics are nested so only JSON formats keep them
+CSV_RESULT_FIELDS = ["status", "status_code", "dns", "connect", "ttfb", "total", "size"]
+
+# Buffer size of the writers' files, rows are flushed in blocks rather than one by one
+BUFFER_SIZE = 64 * 1024
+
+
+class TextWriter:
+    """
+    Write URLs grouped into the frontend and backend sections of the text output.
+
+    URLs arrive in discovery or check order, so each section is spooled to a
+    temporary file as they come in and only read back when the output is
+    written, instead of keeping every URL in memory.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.sections = {}
+
+    def add(self, record, result=None):
+        """
+        Add a URL to its section.
+
+        Args:
+            record: The UrlRecord (or model_name, url_type, url tuple) to add
+            result: The CheckResult of the URL, None when the URLs aren't checked
+        """
+        record = UrlRecord(*record[:3])
+        status = result.status if result is not None else None
+        if record.url_type == "frontend":
+            section = "frontend"
+        else:
+            section = record.url_type if record.url_type in BACKEND_SECTIONS else "other"
+        self.count += 1
+        if section not in self.sections:
+            self.sections[section] = tempfile.TemporaryFile("w+", encoding="utf-8")  # noqa: SIM115 - removed by close()
+        self.sections[section].write(json.dumps([record.model_name, record.url, status]) + "\n")
+
+    def write(self, write_line, style=None):
+        """
+        Write every section.
+
+        Args:
+            write_line: Function writing one line, without its line ending
+            style: The command style to colour headings and statuses with, None for plain text
+        """
+        success = style.SUCCESS if style else str
+        error = style.ERROR if style else str
+        # On the console a blank line separates the URLs from the discovery messages
+        write_line(("\n" if style else "") + "=" * 50)
+        write_line(success("FRONTEND URLS"))
+        write_line("=" * 50)
+        self._write_section("frontend", write_line, success, error)
+
+        write_line("\n" + "=" * 50)
+        write_line(success("BACKEND URLS"))
+        write_line("=" * 50)
+        for section in [*BACKEND_SECTIONS, "other"]:
+            if section in self.sections:
+                write_line("\n" + "-" * 25 + f" {section.upper()} " + "-" * 25)
+                self._write_section(section, write_line, success, error)
+
+    def _write_section(self, section, write_line, success, error):
+        spool = self.sections.get(section)
+        if spool is None:
+            return
+        spool.seek(0)
+        for line in spool:
+            model_name, url, status = json.loads(line)
+            if status is None:
+                write_line(f"{model_name}: {url}")
+            else:
+                status_str = success(f"[{status}]") if status == "OK" else error(f"[{status}]")
+                write_line(f"{model_name}: {url} {status_str}")
+
+    def close(self):
+        """Remove the spooled sections."""
+        for spool in self.sections.values():
+            spool.close()
+        self.sections = {}
+
+
+class NdjsonWriter:
+    """Write one JSON object per URL and line, the format log and CI tools ingest row by row."""
+
+    def __init__(self, path, base_url, shard=None):
+        self.count = 0
+        self.file = open(path, "w", buffering=BUFFER_SIZE)  # noqa: SIM115 - closed by close()
+
+    def add(self, record, result=None):
+        """Write the row of a URL and, if it was checked, its CheckResult."""
+        self.file.write(json.dumps(get_result_row(record, result)) + "\n")
+        self.count += 1
+
+    def close(self):
+        self.file.close()
+
+
+class CsvWriter:
+    """Write one CSV row per URL, with the check result columns when the URLs are checked."""
+
+    def __init__(self, path, base_url, shard=None):
+        self.count = 0
+        self.file = open(path, "w", newline="", buffering=BUFFER_SIZE)  # noqa: SIM115 - closed by close()
+        self.writer = csv.DictWriter(
+            self.file, fieldnames=[*UrlRecord._fields, "url_id", *CSV_RESULT_FIELDS], extrasaction="ignore"
+        )
+        self.writer.writeheader()
+
+    def add(self, record, result=None):
+        """Write the row of a URL and, if it was checked, its CheckResult."""
+        self.writer.writerow(get_result_row(record, result))
+        self.count += 1
+
+    def close(self):
+        self.file.close()
+
+
+class JUnitWriter:
+    """
+    Write a JUnit XML report with one testcase per URL and one testsuite per URL type.
+
+    Testcases fail when the URL wasn't OK and are skipped when the URLs
+    aren't checked. A testsuite starts with its test and failure counts, so
+    testcases are spooled to a temporary file per URL type until the report
+    is closed.
+    """
+
+    def __init__(self, path, base_url, shard=None):
+        self.count = 0
+        self.path = path
+        self.name = f"wagtail-unveil {base_url}" if base_url else "wagtail-unveil"
+        if shard:
+            self.name += f" shard {shard[0]}/{shard[1]}"
+        # URL type: [spool, tests, failures, skipped, time]
+        self.suites = {}
+        self.closed = False
+
+    def add(self, record, result=None):
+        """Spool the testcase of a URL."""
+        record = UrlRecord(*record[:3])
+        if record.url_type not in self.suites:
+            spool = tempfile.TemporaryFile("w+", encoding="utf-8")  # noqa: SIM115 - removed by close()
+            self.suites[record.url_type] = [spool, 0, 0, 0, 0.0]
+        suite = self.suites[record.url_type]
+        spool = suite[0]
+        suite[1] += 1
+        self.count += 1
+
+        time = result.total if result is not None and result.total is not None else 0
+        suite[4] += time
+        spool.write(
+            f"    <testcase name={quoteattr(record.url)} classname={quoteattr(record.model_name)} "
+            f'time="{time:.6f}"'
+        )
+        if result is None:
+            suite[3] += 1
+            spool.write("><skipped/></testcase>\n")
+        elif result.status != "OK":
+            suite[2] += 1
+            spool.write(
+                f"><failure message={quoteattr(result.status)} type=\"status\">"
+                f"{escape(result.status)}</failure></testcase>\n"
+            )
+        else:
+            spool.write("/>\n")
+
+    def close(self):
+        """Write the report and remove the spooled testcases, closing again has no effect."""
+        if self.closed:
+            return
+        self.closed = True
+        totals = [sum(suite[index] for suite in self.suites.values()) for index in range(1, 5)]
+        with ExitStack() as stack:
+            for suite in self.suites.values():
+                stack.enter_context(suite[0])
+            f = stack.enter_context(open(self.path, "w", buffering=BUFFER_SIZE))
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+            f.write(
+                f"<testsuites name={quoteattr(self.name)} tests=\"{totals[0]}\" failures=\"{totals[1]}\" "
+                f'skipped="{totals[2]}" time="{totals[3]:.6f}">\n'
+            )
+            for url_type, (spool, tests, failures, skipped, time) in self.suites.items():
+                f.write(
+                    f"  <testsuite name={quoteattr(url_type)} tests=\"{tests}\" failures=\"{failures}\" "
+                    f'errors="0" skipped="{skipped}" time="{time:.6f}">\n'
+                )
+                spool.seek(0)
+                for line in spool:
+                    f.write(line)
+                f.write("  </testsuite>\n")
+            f.write("</testsuites>\n")
+        self.suites = {}
+
+
+# Writers of the structured output formats, each taking (path, base_url, shard)
+WRITERS = {
+    "json": ResultsWriter,
+    "ndjson": NdjsonWriter,
+    "csv": CsvWriter,
+    "junit": JUnitWriter,
+}
+
+# Default file names of the structured output formats
+WRITER_FILE_NAMES = {
+    "json": "admin_urls.json",
+    "ndjson": "admin_urls.ndjson",
+    "csv": "admin_urls.csv",
+    "junit": "admin_urls.xml",
+}
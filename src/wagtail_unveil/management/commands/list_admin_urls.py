@@ -1,32 +1,85 @@
-from django.core.management.base import BaseCommand
-from wagtail.models import Site
+from contextlib import ExitStack
+from functools import partial
+
+from django.core.management.base import BaseCommand, CommandError
 from wagtail.snippets.models import get_snippet_models
 from django.conf import settings
 import requests
 from requests.exceptions import RequestException
 import getpass
-import re
-from urllib.parse import urljoin
 
+from wagtail_unveil.helpers.cache_helpers import (
+    DEFAULT_CACHE_FILE,
+    DEFAULT_CACHE_TTL,
+    CacheSummary,
+    CheckCache,
+    check_url_cached,
+)
+from wagtail_unveil.helpers.change_helpers import parse_since
+from wagtail_unveil.helpers.check_helpers import (
+    DEFAULT_TIMEOUT,
+    CheckResult,
+    check_cold_warm,
+    check_url_with_session,
+    create_admin_session,
+    is_local_url,
+)
+from wagtail_unveil.helpers.har_helpers import HarRecorder
+from wagtail_unveil.helpers.inprocess_helpers import (
+    MiddlewareProbe,
+    QueryProbe,
+    SqlFingerprintProbe,
+    check_url_in_process,
+    create_inprocess_client,
+)
+from wagtail_unveil.helpers.job_helpers import (
+    claim_job,
+    create_check_job,
+    get_resumable_job,
+    populate_job,
+    run_check_job,
+)
 from wagtail_unveil.helpers.media_helpers import (
     get_document_admin_urls,
     get_image_admin_urls,
 )
+from wagtail_unveil.helpers.memory_helpers import (
+    GcProbe,
+    MemoryGrowthSummary,
+    measure_memory_growth,
+)
 from wagtail_unveil.helpers.modeladmin_helpers import (
     get_modeladmin_models,
     get_modeladmin_urls,
 )
+from wagtail_unveil.helpers.base import UrlRecord
 from wagtail_unveil.helpers.page_helpers import (
+    get_default_base_url,
     get_page_models,
     get_page_urls,
     get_site_urls,
 )
+from wagtail_unveil.helpers.profile_helpers import ProfileProbe, SamplingProbe
+from wagtail_unveil.helpers.pipeline_helpers import check_records
+from wagtail_unveil.helpers.result_helpers import ResultsWriter
+from wagtail_unveil.helpers.script_helpers import SCRIPT_FILE_NAMES, SCRIPT_GENERATORS
 from wagtail_unveil.helpers.settings_helpers import get_settings_admin_urls
+from wagtail_unveil.helpers.shard_helpers import get_shard_number, parse_shard
+from wagtail_unveil.helpers.stats_helpers import ColdWarmSummary, LatencySummary
+from wagtail_unveil.helpers.throttle_helpers import (
+    DEFAULT_LATENCY_TARGET,
+    AdaptiveLimiter,
+    Deadline,
+    DeadlineExceeded,
+    TokenBucket,
+)
 from wagtail_unveil.helpers.snippet_helpers import (
     get_modelviewset_models,
     get_modelviewset_urls,
     get_snippet_urls,
 )
+from wagtail_unveil.helpers.writer_helpers import WRITER_FILE_NAMES, WRITERS, TextWriter
+from wagtail_unveil.models import CheckJob
 
 
 class Command(BaseCommand):
@@ -42,25 +95,118 @@ class Command(BaseCommand):
             "--output",
             type=str,
             choices=["console", "file"],
-            default="console",
-            help="Output to console or file (default: console)",
+            help=(
+                "Output the text format to console or file (default: console), "
+                "the other formats are always written to a file"
+            ),
         )
         parser.add_argument(
             "--file",
             type=str,
-            default="admin_urls.txt",
-            help="File to output to (default: admin_urls.txt)",
+            help=(
+                "File to output to (default: admin_urls.txt, admin_urls.json, .ndjson, .csv or .xml for "
+                "the structured formats, or locustfile.py, unveil_k6.js and unveil_wrk.lua for the load test formats)"
+            ),
+        )
+        parser.add_argument(
+            "--format",
+            choices=["text", *WRITERS, *SCRIPT_GENERATORS],
+            default="text",
+            help=(
+                "Write the URLs as a list (text), as json, ndjson, csv or junit XML rows with their check "
+                "results for CI tools, or as a ready to run locust, k6 or wrk load test script that logs "
+                "into the admin and requests them (default: text)"
+            ),
         )
         parser.add_argument(
             "--max-instances",
             type=int,
             help="Maximum instances to show per model (default: 1, use 0 for unlimited)",
         )
+        parser.add_argument(
+            "--since",
+            type=str,
+            metavar="last-run|TIMESTAMP",
+            help=(
+                "Only include instances changed since TIMESTAMP (an ISO date or date and time) or since the "
+                "latest complete --job check of the base URL started, along with the list and admin URLs. "
+                "--max-instances then defaults to 0"
+            ),
+        )
+        parser.add_argument(
+            "--shard",
+            type=str,
+            metavar="i/N",
+            help=(
+                "Only use the i-th of N disjoint slices of the URLs, picked by a stable hash of "
+                "each URL, to spread a check across N machines"
+            ),
+        )
         parser.add_argument(
             "--check",
             action="store_true",
             help="Check URL accessibility with the provided credentials",
         )
+        parser.add_argument(
+            "--results",
+            type=str,
+            metavar="FILE",
+            help="With --check, write the results to a JSON FILE that unveil_merge can combine",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=1,
+            metavar="N",
+            help=(
+                "Check URLs over N sessions at once, each with its own login. URLs are checked "
+                "while they are still being discovered (default: 1)"
+            ),
+        )
+        parser.add_argument(
+            "--adaptive",
+            action="store_true",
+            help=(
+                "Adapt the number of URLs checked at once per host, from 1 up to --concurrency: grow it while "
+                "responses are faster than --latency-target and halve it on server errors, 429 responses "
+                "and slow responses"
+            ),
+        )
+        parser.add_argument(
+            "--latency-target",
+            type=float,
+            default=DEFAULT_LATENCY_TARGET * 1000,
+            metavar="MS",
+            help=(
+                "With --adaptive, the response time in milliseconds above which concurrency is cut "
+                f"(default: {DEFAULT_LATENCY_TARGET * 1000:g})"
+            ),
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            metavar="N",
+            help="Check at most N URLs per second on average, across every session",
+        )
+        parser.add_argument(
+            "--burst",
+            type=int,
+            metavar="N",
+            help="With --rate, the most URLs checked at once after an idle moment (default: one second's worth)",
+        )
+        parser.add_argument(
+            "--deadline",
+            type=float,
+            metavar="SECONDS",
+            help="Stop checking after SECONDS and report the URLs checked so far",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=DEFAULT_TIMEOUT,
+            metavar="SECONDS",
+            help=f"Seconds each URL may take, including its response body (default: {DEFAULT_TIMEOUT})",
+        )
         parser.add_argument(
             "--username",
             type=str,
@@ -71,43 +217,269 @@ class Command(BaseCommand):
             type=str,
             help="Password for authentication (can also be set with WAGTAIL_UNVEIL_CHECK_PASSWORD setting)",
         )
+        parser.add_argument(
+            "--cold-warm",
+            action="store_true",
+            help=(
+                "Check each URL twice in a row and report the cold first-hit and warm response "
+                "times and their ratio"
+            ),
+        )
+        parser.add_argument(
+            "--clear-cache",
+            type=str,
+            nargs="?",
+            const="",
+            metavar="ALIASES",
+            help=(
+                "With --cold-warm, clear the comma separated shared cache ALIASES before the first request. "
+                "--in-process checks also clear the local memory caches and compiled templates of this "
+                "process, HTTP checks need ALIASES as the server's own caches can't be reached"
+            ),
+        )
+        parser.add_argument(
+            "--cache",
+            type=str,
+            nargs="?",
+            const=DEFAULT_CACHE_FILE,
+            metavar="FILE",
+            help=(
+                "Keep the result of each URL in a local SQLite FILE, skip URLs checked OK within "
+                "--cache-ttl and revalidate the others with conditional requests "
+                f"(default FILE: {DEFAULT_CACHE_FILE})"
+            ),
+        )
+        parser.add_argument(
+            "--cache-ttl",
+            type=int,
+            default=DEFAULT_CACHE_TTL,
+            metavar="SECONDS",
+            help=f"With --cache, reuse results checked OK within SECONDS (default: {DEFAULT_CACHE_TTL})",
+        )
+        parser.add_argument(
+            "--har",
+            type=str,
+            metavar="FILE",
+            help=(
+                "Write every request of the check, with its headers, sizes and timing phases, "
+                "to a HAR 1.2 FILE"
+            ),
+        )
+        parser.add_argument(
+            "--job",
+            type=int,
+            nargs="?",
+            const=0,
+            metavar="JOB_ID",
+            help=(
+                "Store check progress in the database so an interrupted check can be resumed. "
+                "Resumes JOB_ID if given, otherwise the latest unfinished job for the base URL or a new job"
+            ),
+        )
+        parser.add_argument(
+            "--in-process",
+            action="store_true",
+            help=(
+                "Check URLs with the Django test client in this process instead of over HTTP, "
+                "logged in as --username, and report the SQL queries run by each URL"
+            ),
+        )
+        parser.add_argument(
+            "--sql-sort",
+            choices=sorted(SqlFingerprintProbe.SORT_KEYS),
+            default="time",
+            help=(
+                "Sort the SQL fingerprint report of --in-process checks by total time, "
+                "number of calls or number of URLs (default: time)"
+            ),
+        )
+        parser.add_argument(
+            "--profile",
+            nargs="?",
+            const="unveil_profiles",
+            metavar="DIRECTORY",
+            help=(
+                "Profile each --in-process request with cProfile and save .pstats and collapsed stack "
+                "files, named after the model and URL type, to DIRECTORY (default: unveil_profiles)"
+            ),
+        )
+        parser.add_argument(
+            "--profile-top",
+            type=int,
+            default=0,
+            metavar="N",
+            help="Only keep the profiles of the N slowest requests (default: 0, keep all)",
+        )
+        parser.add_argument(
+            "--sample",
+            action="store_true",
+            help=(
+                "Sample the stack while each --in-process request is rendered and report the "
+                "hot functions per URL type, with much less overhead than --profile"
+            ),
+        )
+        parser.add_argument(
+            "--sample-interval",
+            type=float,
+            default=5,
+            metavar="MS",
+            help="Milliseconds between two samples (default: 5)",
+        )
+        parser.add_argument(
+            "--memory",
+            type=int,
+            nargs="?",
+            const=5,
+            metavar="REPEATS",
+            help=(
+                "After an --in-process check, render each URL REPEATS more times (default: 5) and "
+                "flag URLs whose retained memory keeps growing, with their top allocation sites"
+            ),
+        )
 
     def handle(self, *args, **options):
         # Get base URL from options or use default site
         base_url = options.get("base_url")
         if base_url is None:
+            base_url = get_default_base_url(self.stdout)
+
+        since = None
+        if options.get("since"):
             try:
-                default_site = Site.objects.filter(is_default_site=True).first()
-                if default_site:
-                    # Build URL from site settings
-                    if default_site.port == 80 or default_site.port == 443:
-                        port_string = ""
-                    else:
-                        port_string = f":{default_site.port}"
-
-                    protocol = "https" if default_site.port == 443 else "http"
-                    base_url = f"{protocol}://{default_site.hostname}{port_string}"
-                    self.stdout.write(
-                        f"Using auto-detected URL from default site: {base_url}"
-                    )
-                else:
-                    # Fallback to localhost if no default site exists
-                    base_url = "http://localhost:8000"
-                    self.stdout.write(
-                        f"No default site found, using fallback URL: {base_url}"
-                    )
-            except (AttributeError, Site.DoesNotExist, ImportError) as e:
-                # Fallback if there's an error
-                base_url = "http://localhost:8000"
-                self.stdout.write(
-                    self.style.WARNING(
-                        f"Error detecting site URL: {str(e)}. Using fallback URL: {base_url}"
-                    )
-                )
+                since = parse_since(options["since"], base_url)
+            except ValueError as e:
+                raise CommandError(str(e))
 
-        output_type = options["output"]
-        output_file = options["file"]
+        shard = None
+        if options.get("shard"):
+            try:
+                shard = parse_shard(options["shard"])
+            except ValueError as e:
+                raise CommandError(str(e))
+
+        output_format = options.get("format") or "text"
+        if options.get("output") == "console" and output_format != "text":
+            raise CommandError(
+                f"--output console is not supported with --format {output_format}, it is written to --file"
+            )
+        output_type = options.get("output") or "console"
+        output_file = (
+            options.get("file")
+            or SCRIPT_FILE_NAMES.get(output_format)
+            or WRITER_FILE_NAMES.get(output_format, "admin_urls.txt")
+        )
         check_urls = options.get("check", False)
+        if check_urls and output_format in SCRIPT_GENERATORS:
+            self.stdout.write(self.style.WARNING(f"--check has no effect with --format {output_format}"))
+            check_urls = False
+        job_option = options.get("job")
+        if job_option is not None and not check_urls:
+            self.stdout.write(self.style.WARNING("--job has no effect without --check"))
+        in_process = options.get("in_process", False)
+        if in_process and not check_urls:
+            self.stdout.write(self.style.WARNING("--in-process has no effect without --check"))
+        profile_dir = options.get("profile")
+        if profile_dir and not (check_urls and in_process):
+            self.stdout.write(self.style.WARNING("--profile has no effect without --check --in-process"))
+        sample = options.get("sample", False)
+        if sample and not (check_urls and in_process):
+            self.stdout.write(self.style.WARNING("--sample has no effect without --check --in-process"))
+        cold_warm = options.get("cold_warm", False)
+        clear_cache = options.get("clear_cache") is not None
+        cache_aliases = [alias.strip() for alias in (options.get("clear_cache") or "").split(",") if alias.strip()]
+        if clear_cache and not cold_warm:
+            self.stdout.write(self.style.WARNING("--clear-cache has no effect without --cold-warm"))
+            clear_cache = False
+        for alias in cache_aliases:
+            if alias not in settings.CACHES:
+                raise CommandError(f"--clear-cache: there is no cache named '{alias}'")
+        if clear_cache and check_urls and not in_process and not cache_aliases:
+            raise CommandError(
+                "--clear-cache needs the aliases of the caches shared with the server for HTTP checks, "
+                "the local memory caches and templates of this process aren't the server's"
+            )
+        if clear_cache and check_urls and not in_process and not is_local_url(base_url):
+            raise CommandError(
+                f"--clear-cache can't be used to check {base_url}, over HTTP it only clears the shared "
+                "caches named for a server on this machine"
+            )
+        results_path = options.get("results")
+        if results_path and not check_urls:
+            self.stdout.write(self.style.WARNING("--results has no effect without --check"))
+        har_path = options.get("har")
+        if har_path and not check_urls:
+            self.stdout.write(self.style.WARNING("--har has no effect without --check"))
+        elif har_path and in_process:
+            self.stdout.write(self.style.WARNING("--har only records HTTP checks, it has no effect with --in-process"))
+        cache_path = options.get("cache")
+        if cache_path and not check_urls:
+            self.stdout.write(self.style.WARNING("--cache has no effect without --check"))
+            cache_path = None
+        elif cache_path and in_process:
+            self.stdout.write(self.style.WARNING("--cache only applies to HTTP checks, it has no effect with --in-process"))
+            cache_path = None
+        elif cache_path and cold_warm:
+            self.stdout.write(
+                self.style.WARNING("--cache has no effect with --cold-warm, every URL is requested twice")
+            )
+            cache_path = None
+        cache_ttl = options.get("cache_ttl")
+        if cache_ttl is not None and cache_ttl < 0:
+            raise CommandError("--cache-ttl must not be negative")
+        concurrency = options.get("concurrency") or 1
+        if concurrency < 1:
+            raise CommandError("--concurrency must be at least 1")
+        if concurrency > 1 and not check_urls:
+            self.stdout.write(self.style.WARNING("--concurrency has no effect without --check"))
+        elif concurrency > 1 and in_process:
+            self.stdout.write(
+                self.style.WARNING("--concurrency has no effect with --in-process, requests are rendered one at a time")
+            )
+            concurrency = 1
+        elif concurrency > 1 and job_option is not None:
+            self.stdout.write(
+                self.style.WARNING("--concurrency has no effect with --job, run unveil_check_worker processes instead")
+            )
+            concurrency = 1
+        if clear_cache and concurrency > 1:
+            # Another session's clear would land between the cold and warm requests of a URL
+            self.stdout.write(
+                self.style.WARNING("--clear-cache checks one URL at a time, --concurrency is ignored")
+            )
+            concurrency = 1
+        adaptive = options.get("adaptive", False)
+        if adaptive and not check_urls:
+            self.stdout.write(self.style.WARNING("--adaptive has no effect without --check"))
+            adaptive = False
+        elif adaptive and concurrency == 1:
+            self.stdout.write(self.style.WARNING("--adaptive has no effect without a --concurrency ceiling above 1"))
+            adaptive = False
+        latency_target = options.get("latency_target")
+        if latency_target is not None and latency_target <= 0:
+            raise CommandError("--latency-target must be positive")
+        rate = options.get("rate")
+        burst = options.get("burst")
+        if rate is not None and rate <= 0:
+            raise CommandError("--rate must be positive")
+        if burst is not None and burst < 1:
+            raise CommandError("--burst must be at least 1")
+        if rate and not check_urls:
+            self.stdout.write(self.style.WARNING("--rate has no effect without --check"))
+        elif burst and not rate:
+            self.stdout.write(self.style.WARNING("--burst has no effect without --rate"))
+        deadline_seconds = options.get("deadline")
+        if deadline_seconds is not None and deadline_seconds <= 0:
+            raise CommandError("--deadline must be positive")
+        if deadline_seconds and not check_urls:
+            self.stdout.write(self.style.WARNING("--deadline has no effect without --check"))
+        timeout = options.get("timeout") or DEFAULT_TIMEOUT
+        if timeout <= 0:
+            raise CommandError("--timeout must be positive")
+        if timeout != DEFAULT_TIMEOUT and in_process:
+            self.stdout.write(self.style.WARNING("--timeout only applies to HTTP checks, it has no effect with --in-process"))
+        memory_repeats = options.get("memory")
+        if memory_repeats and not (check_urls and in_process):
+            self.stdout.write(self.style.WARNING("--memory has no effect without --check --in-process"))
         
         # Get credentials from command line or settings if check is enabled
         username = None
@@ -119,10 +491,11 @@ class Command(BaseCommand):
             # If credentials are not provided, prompt for them
             if not username:
                 username = input("Admin username: ")
-            if not password:
+            # In-process checks log the user in directly, without a password
+            if not password and not in_process:
                 password = getpass.getpass("Admin password: ")
                 
-            if not username or not password:
+            if not username or not (password or in_process):
                 self.stdout.write(
                     self.style.WARNING(
                         "URL checking disabled: No credentials provided."
@@ -134,16 +507,276 @@ class Command(BaseCommand):
         
         # Get max_instances from command line argument first, then settings, or fall back to 1
         max_instances = options.get("max_instances")
-        if max_instances is None:
+        if max_instances is None and since is not None:
+            # Every changed instance is included, the churn limits the URLs instead
+            max_instances = 0
+        elif max_instances is None:
             max_instances = getattr(settings, 'WAGTAIL_UNVEIL_MAX_INSTANCES', 1)
 
         self.stdout.write(self.style.SUCCESS("Finding all Wagtail models..."))
+        if since is not None:
+            self.stdout.write(f"Only including instances changed since {since.isoformat()}")
 
-        urls = []
+        # URLs are discovered lazily, so checking starts with the first URL found
+        records = self._iter_urls(base_url, max_instances, since)
+        if shard:
+            records = self._iter_shard(records, shard)
 
+        # Load test scripts read the password from the environment when they run
+        if output_format in SCRIPT_GENERATORS:
+            urls = list(records)
+            username = options.get("username") or getattr(settings, "WAGTAIL_UNVEIL_CHECK_USERNAME", None)
+            script = SCRIPT_GENERATORS[output_format](urls, base_url, username=username)
+            with open(output_file, "w") as f:
+                f.write(script)
+            self.stdout.write(
+                self.style.SUCCESS(f"{output_format} load test for {len(urls)} URLs written to {output_file}")
+            )
+            return
+
+        # Every file and database opened from here on is closed when the command
+        # stops, also when it fails part way
+        with ExitStack() as stack:
+            # Structured formats stream each URL to the file, the text format spools
+            # them into its output sections until every URL is known
+            if output_format in WRITERS:
+                writer = WRITERS[output_format](output_file, base_url, shard=shard)
+            else:
+                writer = TextWriter()
+            stack.callback(writer.close)
+            frontend_count = 0
+            success_count = 0
+            failure_count = 0
+
+            # Process URLs with checking if enabled
+            if check_urls:
+                self.stdout.write(self.style.SUCCESS("Checking URL accessibility..."))
+            
+                # Response times are summarised after the check
+                latency = LatencySummary()
+                har_recorders = []
+                cache = None
+                # Started before logging in, the deadline covers the whole check
+                deadline = Deadline(deadline_seconds) if deadline_seconds else None
+
+                if in_process:
+                    # Probes measure each request rendered in this process
+                    client = create_inprocess_client(self.stdout, base_url, username)
+                    authenticated = client is not None
+                    probes = []
+                    if authenticated:
+                        probes = [
+                            QueryProbe(),
+                            MiddlewareProbe(client),
+                            GcProbe(),
+                        ]
+                        if profile_dir:
+                            probes.append(ProfileProbe(profile_dir, top=options.get("profile_top") or 0))
+                        if sample:
+                            interval = options.get("sample_interval") or 5
+                            probes.append(SamplingProbe(interval=interval / 1000))
+
+                    def check_func(record):
+                        return check_url_in_process(client, record, probes)
+
+                    check_funcs = [check_func]
+                else:
+                    probes = []
+                    if cache_path:
+                        # Results of earlier runs, shared by the checking threads
+                        cache = CheckCache(cache_path, ttl=cache_ttl, base_url=base_url, username=username)
+                        stack.callback(cache.close)
+                        probes.append(CacheSummary())
+                    # Each checking thread gets its own session for better performance and cookie handling
+                    check_funcs = []
+                    for _ in range(concurrency):
+                        check_func = self._create_check_func(
+                            base_url,
+                            username,
+                            password,
+                            har_path,
+                            har_recorders,
+                            cache=cache,
+                            timeout=timeout,
+                            deadline=deadline,
+                        )
+                        if check_func is None:
+                            break
+                        check_funcs.append(check_func)
+                    authenticated = len(check_funcs) == concurrency
+
+                # Summaries built from the metrics of each checked URL
+                reports = list(probes)
+                if in_process and authenticated:
+                    # Built from the fingerprints recorded by QueryProbe
+                    reports.insert(1, SqlFingerprintProbe(sort=options.get("sql_sort") or "time"))
+                if rate:
+                    # One bucket shared by every session, each request takes a token
+                    bucket = TokenBucket(rate, burst=burst)
+                    check_funcs = [bucket.wrap(check_func) for check_func in check_funcs]
+                if cold_warm:
+                    reports.append(ColdWarmSummary())
+                    check_funcs = [
+                        partial(
+                        check_cold_warm,
+                        check_once,
+                        clear_cache=clear_cache,
+                        cache_aliases=cache_aliases,
+                        clear_local=in_process,
+                    )
+                        for check_once in check_funcs
+                    ]
+                limiter = None
+                if adaptive:
+                    # Every session's thread waits for its host to be under the adapted limit
+                    limiter = AdaptiveLimiter(concurrency, latency_target=latency_target / 1000)
+                    check_funcs = [limiter.wrap(check_func) for check_func in check_funcs]
+                if deadline is not None:
+                    check_funcs = [deadline.wrap(check_func) for check_func in check_funcs]
+                deadline_reached = False
+
+                if authenticated and job_option is not None:
+                    self.stdout.write(self.style.SUCCESS("Successfully authenticated with Wagtail admin"))
+                    # The job stores its whole URL inventory before the check starts
+                    job = self._get_check_job(job_option, base_url, max_instances, list(records), since)
+                    self.stdout.write(
+                        f"Running check job #{job.pk} ({job.checked_count}/{job.total_count} already checked)"
+                    )
+                    try:
+                        run_check_job(job, check_funcs[0])
+                    except KeyboardInterrupt:
+                        raise CommandError(
+                            f"Check job #{job.pk} interrupted, run again with --job {job.pk} to resume"
+                        )
+                    except DeadlineExceeded:
+                        deadline_reached = True
+
+                    # Output the stored results, they include URLs checked by earlier runs
+                    checked = self._iter_job_results(job)
+                elif authenticated:
+                    self.stdout.write(self.style.SUCCESS("Successfully authenticated with Wagtail admin"))
+                    # Discovery queries would be measured as part of in-process checks
+                    checked = check_records(records, check_funcs, pipelined=not in_process)
+                else:
+                    self.stdout.write(self.style.ERROR("Failed to authenticate with Wagtail admin"))
+                    check_urls = False
+
+            if check_urls:
+                results_writer = None
+                if results_path:
+                    results_writer = ResultsWriter(results_path, base_url, shard=shard)
+                    stack.callback(results_writer.close)
+                # Only kept when every URL is rendered again to check memory growth
+                memory_records = []
+                try:
+                    for record, result in checked:
+                        writer.add(record, result)
+                        frontend_count += record.url_type == "frontend"
+                        latency.add(record.model_name, record.url_type, record.url, result)
+                        for report in reports:
+                            report.add(record, result.metrics)
+                        if results_writer:
+                            results_writer.add(record, result)
+                        if in_process and memory_repeats:
+                            memory_records.append(record)
+
+                        # Count successes and failures
+                        if result.status == "OK":
+                            success_count += 1
+                        else:
+                            failure_count += 1
+                except DeadlineExceeded:
+                    # The URLs checked in time are still written and reported
+                    deadline_reached = True
+                finally:
+                    if results_writer:
+                        results_writer.close()
+            else:
+                for record in records:
+                    writer.add(record)
+                    frontend_count += record.url_type == "frontend"
+        
+            # Extra report sections written after the check summary
+            report_sections = []
+            if check_urls:
+                if deadline_reached:
+                    message = f"Deadline of {deadline_seconds:g}s reached, only the {writer.count} URLs checked in time are included"
+                    if job_option is not None:
+                        message += f", run again with --job {job.pk} to check the rest"
+                    self.stdout.write(self.style.WARNING(message))
+                if results_path:
+                    self.stdout.write(
+                        self.style.SUCCESS(f"{results_writer.count} results written to {results_path}")
+                    )
+                if har_recorders:
+                    har = HarRecorder()
+                    har.merge(har_recorders)
+                    har.write(har_path)
+                    self.stdout.write(
+                        self.style.SUCCESS(f"{len(har.entries)} requests written to HAR file {har_path}")
+                    )
+                report_sections.append(("RESPONSE TIMES", latency.get_report_lines()))
+                if limiter is not None:
+                    report_sections.append((limiter.title, limiter.get_report_lines()))
+                for report in reports:
+                    report_sections.append((report.title, report.get_report_lines()))
+
+                if in_process and memory_repeats:
+                    self.stdout.write(
+                        self.style.SUCCESS(f"Rendering each URL {memory_repeats} more times to check memory growth...")
+                    )
+                    memory = MemoryGrowthSummary(repeats=memory_repeats)
+                    for record in memory_records:
+                        memory.add(measure_memory_growth(client, record, repeats=memory_repeats))
+                    report_sections.append(("MEMORY GROWTH", memory.get_report_lines()))
+
+            # Output the URLs
+            if output_format in WRITERS:
+                writer.close()
+                self.stdout.write(self.style.SUCCESS(f"{output_format} output written to {output_file}"))
+            elif output_type == "console":
+                writer.write(self.stdout.write, self.style)
+                writer.close()
+            else:
+                with open(output_file, "w") as f:
+                    # Note: Terminal colors don't work in files, but consistent format
+                    writer.write(lambda line: f.write(f"{line}\n"))
+                
+                    # Add URL check summary to the end of the file
+                    if check_urls:
+                        f.write("\n" + "=" * 50 + "\n")
+                        f.write("URL CHECK SUMMARY\n")
+                        f.write("=" * 50 + "\n")
+                        f.write(f"Successful URLs: {success_count}\n")
+                        f.write(f"Failed URLs: {failure_count}\n")
+                        success_rate = (success_count / writer.count) * 100 if writer.count else 0
+                        f.write(f"Success rate: {success_rate:.1f}%\n")
+                        self._write_report_sections(report_sections, f)
+
+                writer.close()
+                self.stdout.write(self.style.SUCCESS(f"URLs written to {output_file}"))
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Found {writer.count} total URLs ({frontend_count} frontend, {writer.count - frontend_count} backend)"
+                )
+            )
+        
+            # Display summary of successful and failed URLs if check was performed
+            if check_urls:
+                self.stdout.write("\n" + "=" * 50)
+                self.stdout.write(self.style.SUCCESS("URL CHECK SUMMARY"))
+                self.stdout.write("=" * 50)
+                self.stdout.write(self.style.SUCCESS(f"Successful URLs: {success_count}"))
+                self.stdout.write(self.style.ERROR(f"Failed URLs: {failure_count}"))
+                success_rate = (success_count / writer.count) * 100 if writer.count else 0
+                self.stdout.write(f"Success rate: {success_rate:.1f}%")
+                self._write_report_sections(report_sections)
+
+    def _iter_urls(self, base_url, max_instances, since=None):
+        """Yield every URL as a UrlRecord, one group of models at a time."""
         # Get site default pages
-        site_urls = get_site_urls(self.stdout, base_url)
-        urls.extend(site_urls)
+        yield from self._records(get_site_urls(self.stdout, base_url))
 
         # Get all page models
         page_models = get_page_models()
@@ -152,8 +785,7 @@ class Command(BaseCommand):
             self.stdout.write(f"  - {model.__name__}")
 
         # Get URLs for page models
-        page_urls = get_page_urls(self.stdout, base_url, max_instances)
-        urls.extend(page_urls)
+        yield from self._records(get_page_urls(self.stdout, base_url, max_instances, since=since))
 
         # Get all snippet models
         snippet_models = get_snippet_models()
@@ -162,10 +794,7 @@ class Command(BaseCommand):
             self.stdout.write(f"  - {model.__name__}")
 
         # Get URLs for snippet models
-        snippet_urls = get_snippet_urls(
-            self.stdout, base_url, max_instances
-        )
-        urls.extend(snippet_urls)
+        yield from self._records(get_snippet_urls(self.stdout, base_url, max_instances, since=since))
 
         # Get generic Django models with ModelAdmin
         modeladmin_models = get_modeladmin_models()
@@ -174,12 +803,7 @@ class Command(BaseCommand):
             self.stdout.write(f"  - {model.__name__}")
 
         # Get URLs for modeladmin models
-        modeladmin_urls = get_modeladmin_urls(
-            self.stdout,
-            base_url,
-            max_instances,
-        )
-        urls.extend(modeladmin_urls)
+        yield from self._records(get_modeladmin_urls(self.stdout, base_url, max_instances, since=since))
 
         # Get models registered with ModelViewSet
         modelviewset_models = get_modelviewset_models()
@@ -188,350 +812,144 @@ class Command(BaseCommand):
             self.stdout.write(f"  - {model.__name__}")
 
         # Get URLs for modelviewset models
-        modelviewset_urls = get_modelviewset_urls(
-            self.stdout,
-            base_url,
-            max_instances,
-        )
-        urls.extend(modelviewset_urls)
+        yield from self._records(get_modelviewset_urls(self.stdout, base_url, max_instances, since=since))
 
         # Get image admin URLs
         self.stdout.write("Getting image admin URLs...")
-        image_urls = get_image_admin_urls(self.stdout, base_url, max_instances)
-        urls.extend(image_urls)
+        yield from self._records(get_image_admin_urls(self.stdout, base_url, max_instances, since=since))
 
         # Get document admin URLs
         self.stdout.write("Getting document admin URLs...")
-        document_urls = get_document_admin_urls(self.stdout, base_url, max_instances)
-        urls.extend(document_urls)
+        yield from self._records(get_document_admin_urls(self.stdout, base_url, max_instances, since=since))
 
         # Get settings admin URLs
         self.stdout.write("Getting settings admin URLs...")
-        settings_urls = get_settings_admin_urls(self.stdout, base_url)
-        urls.extend(settings_urls)
+        yield from self._records(get_settings_admin_urls(self.stdout, base_url))
+
+    def _records(self, urls):
+        return (UrlRecord(*url_data[:3]) for url_data in urls)
+
+    def _iter_shard(self, records, shard):
+        """Yield the URLs of one shard and report its size once discovery finishes."""
+        total_count = 0
+        count = 0
+        for record in records:
+            total_count += 1
+            if get_shard_number(record.url, shard[1]) == shard[0]:
+                count += 1
+                yield record
+        self.stdout.write(f"Shard {shard[0]}/{shard[1]}: {count} of {total_count} URLs")
+
+    def _iter_job_results(self, job):
+        """
+        Yield the (UrlRecord, CheckResult) pairs stored by a check job, in inventory order.
+        URLs not checked yet, such as after the deadline, are left out.
+        """
+        for result in job.results.filter(checked_at__isnull=False).order_by("position").iterator():
+            record = UrlRecord(result.model_name, result.url_type, result.url)
+            yield record, CheckResult(
+                status=result.status,
+                total=result.response_time,
+                size=result.response_size,
+                metrics=result.metrics,
+            )
 
-        # Process URLs with checking if enabled
-        if check_urls:
-            self.stdout.write(self.style.SUCCESS("Checking URL accessibility..."))
-            
-            # Establish a session for better performance and cookie handling
-            session = self._create_admin_session(base_url, username, password)
-            if session:
-                self.stdout.write(self.style.SUCCESS("Successfully authenticated with Wagtail admin"))
-                checked_urls = []
-                success_count = 0
-                failure_count = 0
-                
-                for url_data in urls:
-                    model_name, url_type, url = url_data
-                    status = self._check_url_with_session(session, url)
-                    checked_urls.append((model_name, url_type, url, status))
-                    
-                    # Count successes and failures
-                    if status == "OK":
-                        success_count += 1
-                    else:
-                        failure_count += 1
-                
-                # Replace the original URLs with the checked ones
-                urls = checked_urls
-            else:
-                self.stdout.write(self.style.ERROR("Failed to authenticate with Wagtail admin"))
-                check_urls = False
-                success_count = 0
-                failure_count = 0
-        
-        # Group URLs by frontend vs backend
-        frontend_urls = [url for url in urls if url[1] == "frontend"]
-        backend_urls = [url for url in urls if url[1] != "frontend"]
-
-        # Output the URLs
-        if output_type == "console":
-            self.stdout.write("\n" + "=" * 50)
-            self.stdout.write(self.style.SUCCESS("FRONTEND URLS"))
-            self.stdout.write("=" * 50)
-            for url_data in frontend_urls:
-                if check_urls:
-                    model_name, url_type, url, status = url_data
-                    if status == "OK":
-                        status_str = self.style.SUCCESS(f"[{status}]")
-                    else:
-                        status_str = self.style.ERROR(f"[{status}]")
-                    self.stdout.write(f"{model_name}: {url} {status_str}")
-                else:
-                    model_name, url_type, url = url_data
-                    self.stdout.write(f"{model_name}: {url}")
-
-            self.stdout.write("\n" + "=" * 50)
-            self.stdout.write(self.style.SUCCESS("BACKEND URLS"))
-            self.stdout.write("=" * 50)
-
-            # Group backend URLs by type
-            admin_urls = [url for url in backend_urls if url[1] == "admin"]
-            edit_urls = [url for url in backend_urls if url[1] == "edit"]
-            list_urls = [url for url in backend_urls if url[1] == "list"]
-            delete_urls = [url for url in backend_urls if url[1] == "delete"]
-            other_urls = [url for url in backend_urls if url[1] not in ["admin", "edit", "list", "delete"]]
-
-            if admin_urls:
-                self.stdout.write("\n" + "-" * 25 + " ADMIN " + "-" * 25)
-                for url_data in admin_urls:
-                    if check_urls:
-                        model_name, url_type, url, status = url_data
-                        if status == "OK":
-                            status_str = self.style.SUCCESS(f"[{status}]")
-                        else:
-                            status_str = self.style.ERROR(f"[{status}]")
-                        self.stdout.write(f"{model_name}: {url} {status_str}")
-                    else:
-                        model_name, url_type, url = url_data
-                        self.stdout.write(f"{model_name}: {url}")
-
-            if list_urls:
-                self.stdout.write("\n" + "-" * 25 + " LIST " + "-" * 25)
-                for url_data in list_urls:
-                    if check_urls:
-                        model_name, url_type, url, status = url_data
-                        if status == "OK":
-                            status_str = self.style.SUCCESS(f"[{status}]")
-                        else:
-                            status_str = self.style.ERROR(f"[{status}]")
-                        self.stdout.write(f"{model_name}: {url} {status_str}")
-                    else:
-                        model_name, url_type, url = url_data
-                        self.stdout.write(f"{model_name}: {url}")
-
-            if edit_urls:
-                self.stdout.write("\n" + "-" * 25 + " EDIT " + "-" * 25)
-                for url_data in edit_urls:
-                    if check_urls:
-                        model_name, url_type, url, status = url_data
-                        if status == "OK":
-                            status_str = self.style.SUCCESS(f"[{status}]")
-                        else:
-                            status_str = self.style.ERROR(f"[{status}]")
-                        self.stdout.write(f"{model_name}: {url} {status_str}")
-                    else:
-                        model_name, url_type, url = url_data
-                        self.stdout.write(f"{model_name}: {url}")
-
-            if delete_urls:
-                self.stdout.write("\n" + "-" * 25 + " DELETE " + "-" * 25)
-                for url_data in delete_urls:
-                    if check_urls:
-                        model_name, url_type, url, status = url_data
-                        if status == "OK":
-                            status_str = self.style.SUCCESS(f"[{status}]")
-                        else:
-                            status_str = self.style.ERROR(f"[{status}]")
-                        self.stdout.write(f"{model_name}: {url} {status_str}")
-                    else:
-                        model_name, url_type, url = url_data
-                        self.stdout.write(f"{model_name}: {url}")
-
-            if other_urls:
-                self.stdout.write("\n" + "-" * 25 + " OTHER " + "-" * 25)
-                for url_data in other_urls:
-                    if check_urls:
-                        model_name, url_type, url, status = url_data
-                        if status == "OK":
-                            status_str = self.style.SUCCESS(f"[{status}]")
-                        else:
-                            status_str = self.style.ERROR(f"[{status}]")
-                        self.stdout.write(f"{model_name}: {url} {status_str}")
-                    else:
-                        model_name, url_type, url = url_data
-                        self.stdout.write(f"{model_name}: {url}")
-        else:
-            with open(output_file, "w") as f:
-                f.write("=" * 50 + "\n")
-                f.write("FRONTEND URLS\n")
-                f.write("=" * 50 + "\n")
-                for url_data in frontend_urls:
-                    if check_urls:
-                        model_name, url_type, url, status = url_data
-                        status_str = f"[{status}]" if status else ""
-                        # Note: Terminal colors don't work in files, but consistent format
-                        f.write(f"{model_name}: {url} {status_str}\n")
-                    else:
-                        model_name, url_type, url = url_data
-                        f.write(f"{model_name}: {url}\n")
+    def _create_check_func(
+        self,
+        base_url,
+        username,
+        password,
+        har_path,
+        har_recorders,
+        cache=None,
+        timeout=DEFAULT_TIMEOUT,
+        deadline=None,
+    ):
+        """
+        Return an HTTP check function with its own session, or None if the login failed.
+        With --har the session's requests go to a new recorder added to har_recorders,
+        with --cache URLs are checked through the CheckCache. Requests get the timeout,
+        cut to end by the deadline if there is one.
+        """
+        session = create_admin_session(self.stdout, base_url, username, password)
+        if session is None:
+            return None
 
+        def check_func(record):
+            url_timeout = deadline.get_timeout(timeout) if deadline is not None else timeout
+            if cache is not None:
+                return check_url_cached(cache, session, record, timeout=url_timeout)
+            return check_url_with_session(session, record.url, timeout=url_timeout)
+
+        if not har_path:
+            return check_func
+
+        # Every response the session receives is recorded, redirects included
+        har = HarRecorder()
+        session.hooks["response"].append(har.on_response)
+        har_recorders.append(har)
+
+        def check_and_record(record):
+            result = check_func(record)
+            # Fresh cached results made no request to record
+            if (result.metrics or {}).get("cache") != "hit":
+                har.add(record, result)
+            return result
+
+        return check_and_record
+
+    def _write_report_sections(self, sections, f=None):
+        """Write (title, lines) report sections to the output file or the console."""
+        for title, lines in sections:
+            if f is not None:
                 f.write("\n" + "=" * 50 + "\n")
-                f.write("BACKEND URLS\n")
+                f.write(f"{title}\n")
                 f.write("=" * 50 + "\n")
+                for line in lines:
+                    f.write(f"{line}\n")
+            else:
+                self.stdout.write("\n" + "=" * 50)
+                self.stdout.write(self.style.SUCCESS(title))
+                self.stdout.write("=" * 50)
+                for line in lines:
+                    self.stdout.write(line)
 
-                # Group backend URLs by type
-                admin_urls = [url for url in backend_urls if url[1] == "admin"]
-                edit_urls = [url for url in backend_urls if url[1] == "edit"]
-                list_urls = [url for url in backend_urls if url[1] == "list"]
-                delete_urls = [url for url in backend_urls if url[1] == "delete"]
-                other_urls = [url for url in backend_urls if url[1] not in ["admin", "edit", "list", "delete"]]
-
-                if admin_urls:
-                    f.write("\n" + "-" * 25 + " ADMIN " + "-" * 25 + "\n")
-                    for url_data in admin_urls:
-                        if check_urls:
-                            model_name, url_type, url, status = url_data
-                            status_str = f"[{status}]" if status else ""
-                            f.write(f"{model_name}: {url} {status_str}\n")
-                        else:
-                            model_name, url_type, url = url_data
-                            f.write(f"{model_name}: {url}\n")
-
-                if list_urls:
-                    f.write("\n" + "-" * 25 + " LIST " + "-" * 25 + "\n")
-                    for url_data in list_urls:
-                        if check_urls:
-                            model_name, url_type, url, status = url_data
-                            status_str = f"[{status}]" if status else ""
-                            f.write(f"{model_name}: {url} {status_str}\n")
-                        else:
-                            model_name, url_type, url = url_data
-                            f.write(f"{model_name}: {url}\n")
-
-                if edit_urls:
-                    f.write("\n" + "-" * 25 + " EDIT " + "-" * 25 + "\n")
-                    for url_data in edit_urls:
-                        if check_urls:
-                            model_name, url_type, url, status = url_data
-                            status_str = f"[{status}]" if status else ""
-                            f.write(f"{model_name}: {url} {status_str}\n")
-                        else:
-                            model_name, url_type, url = url_data
-                            f.write(f"{model_name}: {url}\n")
-
-                if delete_urls:
-                    f.write("\n" + "-" * 25 + " DELETE " + "-" * 25 + "\n")
-                    for url_data in delete_urls:
-                        if check_urls:
-                            model_name, url_type, url, status = url_data
-                            status_str = f"[{status}]" if status else ""
-                            f.write(f"{model_name}: {url} {status_str}\n")
-                        else:
-                            model_name, url_type, url = url_data
-                            f.write(f"{model_name}: {url}\n")
-
-                if other_urls:
-                    f.write("\n" + "-" * 25 + " OTHER " + "-" * 25 + "\n")
-                    for url_data in other_urls:
-                        if check_urls:
-                            model_name, url_type, url, status = url_data
-                            status_str = f"[{status}]" if status else ""
-                            f.write(f"{model_name}: {url} {status_str}\n")
-                        else:
-                            model_name, url_type, url = url_data
-                            f.write(f"{model_name}: {url}\n")
-                
-                # Add URL check summary to the end of the file
-                if check_urls:
-                    f.write("\n" + "=" * 50 + "\n")
-                    f.write("URL CHECK SUMMARY\n")
-                    f.write("=" * 50 + "\n")
-                    f.write(f"Successful URLs: {success_count}\n")
-                    f.write(f"Failed URLs: {failure_count}\n")
-                    success_rate = (success_count / len(urls)) * 100 if urls else 0
-                    f.write(f"Success rate: {success_rate:.1f}%\n")
-
-            self.stdout.write(self.style.SUCCESS(f"URLs written to {output_file}"))
-
-        self.stdout.write(
-            self.style.SUCCESS(
-                f"Found {len(urls)} total URLs ({len(frontend_urls)} frontend, {len(backend_urls)} backend)"
-            )
-        )
-        
-        # Display summary of successful and failed URLs if check was performed
-        if check_urls:
-            self.stdout.write("\n" + "=" * 50)
-            self.stdout.write(self.style.SUCCESS("URL CHECK SUMMARY"))
-            self.stdout.write("=" * 50)
-            self.stdout.write(self.style.SUCCESS(f"Successful URLs: {success_count}"))
-            self.stdout.write(self.style.ERROR(f"Failed URLs: {failure_count}"))
-            success_rate = (success_count / len(urls)) * 100 if urls else 0
-            self.stdout.write(f"Success rate: {success_rate:.1f}%")
-
-    def _create_admin_session(self, base_url, username, password):
+    def _get_check_job(self, job_id, base_url, max_instances, urls, since=None):
         """
-        Create and return a requests session logged into the Wagtail admin.
-        Returns the session object if successful, None otherwise.
+        Return a claimed check job to run, resuming an unfinished one when possible.
+        A job ID of 0 resumes the latest unfinished job for the base URL and --since
+        cutoff or starts a new one.
         """
-        session = requests.Session()
-        
-        # First get the login page to extract CSRF token
-        login_url = urljoin(base_url, '/admin/login/')
-        try:
-            response = session.get(login_url, timeout=10)
-            response.raise_for_status()
-            
-            # Extract CSRF token from the login page
-            csrf_token = None
-            match = re.search(r'name="csrfmiddlewaretoken" value="([^"]+)"', response.text)
-            if match:
-                csrf_token = match.group(1)
-            else:
-                self.stdout.write(self.style.ERROR("Could not find CSRF token in login page"))
-                return None
-                
-            # Now attempt to log in
-            login_data = {
-                'csrfmiddlewaretoken': csrf_token,
-                'username': username,
-                'password': password,
-                'next': '/admin/'
-            }
-            
-            response = session.post(login_url, data=login_data, headers={
-                'Referer': login_url
-            }, timeout=10)
-            
-            # Check if login was successful by looking for error messages or checking if we're still on login page
-            if '/admin/login/' in response.url or 'Please enter the correct username and password' in response.text:
-                self.stdout.write(self.style.ERROR("Login failed: Invalid credentials"))
-                return None
-            
-            # Verify access to a protected page to confirm authentication
-            verify_url = urljoin(base_url, '/admin/')
-            verify_response = session.get(verify_url, timeout=10)
-            
-            # If we get redirected back to login or get permission denied, authentication failed
-            if '/admin/login/' in verify_response.url or verify_response.status_code == 403:
-                self.stdout.write(self.style.ERROR("Login verification failed: Redirected to login page"))
-                return None
-                
-            return session
-                
-        except RequestException as e:
-            self.stdout.write(self.style.ERROR(f"Error creating admin session: {str(e)}"))
-            return None
-    
-    def _check_url_with_session(self, session, url):
-        """Check if a URL is accessible using the established session."""
-        try:
-            response = session.get(url, timeout=10, allow_redirects=True)
-            
-            # Consider redirects that end with a 200 as success
-            if response.status_code == 200:
-                return "OK"
-            elif response.status_code in (401, 403):
-                return "AUTH FAILED"
-            elif response.status_code in (404, 410):
-                return "NOT FOUND"
-            elif response.status_code >= 500:
-                return f"SERVER ERROR ({response.status_code})"
-            else:
-                return f"ERROR ({response.status_code})"
-        except RequestException as e:
-            # Isolate the most relevant part of the error
-            error_msg = str(e)
-            if len(error_msg) > 50:  # Truncate long error messages
-                error_msg = error_msg[:47] + "..."
-            return f"ERROR ({error_msg})"
+        if job_id:
+            try:
+                job = CheckJob.objects.get(pk=job_id)
+            except CheckJob.DoesNotExist:
+                raise CommandError(f"Check job #{job_id} does not exist")
+            if job.is_finished:
+                raise CommandError(f"Check job #{job_id} has already finished")
+            if since is not None and job.since != since:
+                raise CommandError(
+                    f"Check job #{job_id} wasn't created with --since {since.isoformat()}, "
+                    "resume it without --since"
+                )
+            # Resuming a job explicitly takes it over from any other process
+            claim_job(job, force=True)
+            populate_job(self.stdout, job)
+            return job
+
+        job = get_resumable_job(base_url, since=since)
+        if job and claim_job(job):
+            populate_job(self.stdout, job)
+            return job
+
+        job = create_check_job(base_url, max_instances, urls, since=since)
+        claim_job(job)
+        return job
 
     def _check_url_accessibility(self, url, username, password):
         """
         Legacy method for individual URL checking without session.
-        Consider using _check_url_with_session instead.
+        Consider using check_url_with_session from helpers.check_helpers instead.
         """
         try:
             response = requests.get(url, auth=(username, password), timeout=10)
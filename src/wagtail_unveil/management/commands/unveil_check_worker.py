@@ -0,0 +1,141 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from wagtail_unveil.helpers.check_helpers import (
+    check_url_with_session,
+    create_admin_session,
+)
+from wagtail_unveil.helpers.job_helpers import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_LEASE_SECONDS,
+    claim_job,
+    fail_job,
+    get_next_leasable_job,
+    get_worker_id,
+    has_other_workers,
+    populate_job,
+    run_check_job,
+)
+from wagtail_unveil.models import CheckJob
+
+
+class Command(BaseCommand):
+    help = "Runs queued and interrupted URL check jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--username",
+            type=str,
+            help="Username for authentication (can also be set with WAGTAIL_UNVEIL_CHECK_USERNAME setting)",
+        )
+        parser.add_argument(
+            "--password",
+            type=str,
+            help="Password for authentication (can also be set with WAGTAIL_UNVEIL_CHECK_PASSWORD setting)",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit when there are no more jobs to run instead of polling for new ones",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=5,
+            help="Seconds to wait between polls for new jobs (default: 5)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"URLs checked between two checkpoints (default: {DEFAULT_BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--lease",
+            type=int,
+            default=DEFAULT_LEASE_SECONDS,
+            help=(
+                "Seconds a batch of URLs is held by this worker before other workers may take it "
+                f"over, renewed while the batch is checked (default: {DEFAULT_LEASE_SECONDS})"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        # The worker runs unattended so credentials can't be prompted for
+        username = options.get("username") or getattr(settings, "WAGTAIL_UNVEIL_CHECK_USERNAME", None)
+        password = options.get("password") or getattr(settings, "WAGTAIL_UNVEIL_CHECK_PASSWORD", None)
+        if not username or not password:
+            raise CommandError(
+                "Credentials are required, use --username/--password or the "
+                "WAGTAIL_UNVEIL_CHECK_USERNAME/WAGTAIL_UNVEIL_CHECK_PASSWORD settings"
+            )
+
+        # Sessions are reused for jobs that check the same site
+        sessions = {}
+        worker_id = get_worker_id()
+
+        while True:
+            # Workers on any machine sharing the database work on the same jobs,
+            # each leasing its own batches of URLs
+            job = get_next_leasable_job()
+            if job is None:
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
+                continue
+
+            # Logging in comes first, so a worker that can't leaves the job as it is
+            session = sessions.get(job.base_url)
+            if session is None:
+                session = create_admin_session(self.stdout, job.base_url, username, password)
+                if session is None:
+                    message = f"Failed to authenticate with Wagtail admin at {job.base_url}"
+                    if has_other_workers(job, worker_id):
+                        raise CommandError(f"{message}, check job #{job.pk} is left to the other workers")
+                    # No worker is checking the job, it would wait for one forever
+                    fail_job(job, message)
+                    raise CommandError(f"{message}, check job #{job.pk} failed")
+                sessions[job.base_url] = session
+
+            if not claim_job(job, force=True):
+                # The job finished in the meantime
+                continue
+            self.stdout.write(f"Running check job #{job.pk} for {job.base_url} as {worker_id}")
+
+            try:
+                populate_job(self.stdout, job)
+            except Exception as e:
+                # Without its URLs no worker can make progress on the job
+                fail_job(job, f"{type(e).__name__}: {e}")
+                self.stdout.write(self.style.ERROR(f"Check job #{job.pk} failed, its URLs couldn't be discovered: {e}"))
+                continue
+
+            try:
+                run_check_job(
+                    job,
+                    lambda record, session=session: check_url_with_session(session, record.url),
+                    batch_size=options["batch_size"],
+                    lease_seconds=options["lease"],
+                    worker_id=worker_id,
+                )
+            except Exception as e:
+                # run_check_job released this worker's leases, other workers or
+                # the next loop take its URLs over unless the job kept failing
+                if job.status == CheckJob.STATUS_FAILED:
+                    self.stdout.write(self.style.ERROR(f"Check job #{job.pk} failed after repeated errors: {e}"))
+                else:
+                    self.stdout.write(
+                        self.style.ERROR(f"Error checking job #{job.pk}, its URLs are left to be checked again: {e}")
+                    )
+                continue
+            if job.is_finished:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Check job #{job.pk} complete: {job.success_count} successful, "
+                        f"{job.failure_count} failed"
+                    )
+                )
+            else:
+                self.stdout.write(f"No URLs of check job #{job.pk} left to lease, other workers are checking the rest")
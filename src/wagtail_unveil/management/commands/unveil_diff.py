@@ -0,0 +1,75 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from wagtail_unveil.helpers.diff_helpers import (
+    DEFAULT_MIN_REGRESSION,
+    DEFAULT_REGRESSION_THRESHOLD,
+    RunDiff,
+    load_run,
+)
+
+
+class Command(BaseCommand):
+    help = "Compares two check runs and reports the URLs, statuses and response times that changed"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "run_a",
+            metavar="RUN_A",
+            help="The earlier run, a check job ID or a results file written by list_admin_urls",
+        )
+        parser.add_argument(
+            "run_b",
+            metavar="RUN_B",
+            help="The later run, a check job ID or a results file",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=DEFAULT_REGRESSION_THRESHOLD * 100,
+            metavar="PERCENT",
+            help=(
+                "Report URLs whose response time grew by more than PERCENT "
+                f"(default: {DEFAULT_REGRESSION_THRESHOLD * 100:g})"
+            ),
+        )
+        parser.add_argument(
+            "--min-regression",
+            type=float,
+            default=DEFAULT_MIN_REGRESSION * 1000,
+            metavar="MS",
+            help=(
+                "Ignore response time increases smaller than MS milliseconds "
+                f"(default: {DEFAULT_MIN_REGRESSION * 1000:g})"
+            ),
+        )
+        parser.add_argument(
+            "--fail-on-regression",
+            action="store_true",
+            help="Exit with an error if a URL that was OK failed or got slower",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            label_a, run_a = load_run(options["run_a"])
+            label_b, run_b = load_run(options["run_b"])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        diff = RunDiff(
+            run_a,
+            run_b,
+            threshold=options["threshold"] / 100,
+            min_regression=options["min_regression"] / 1000,
+        )
+
+        self.stdout.write("\n" + "=" * 50)
+        self.stdout.write(self.style.SUCCESS(diff.title))
+        self.stdout.write("=" * 50)
+        self.stdout.write(f"Comparing {label_a} with {label_b}")
+        for line in diff.get_report_lines():
+            self.stdout.write(line)
+
+        if options.get("fail_on_regression") and (diff.new_failures or diff.regressions):
+            raise CommandError(
+                f"{len(diff.new_failures)} URLs failed and {len(diff.regressions)} URLs got slower since {label_a}"
+            )
@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from wagtail_unveil.helpers.change_helpers import parse_since
+from wagtail_unveil.helpers.job_helpers import create_check_job
+from wagtail_unveil.helpers.page_helpers import get_default_base_url
+from wagtail_unveil.helpers.url_helpers import collect_urls
+
+
+class Command(BaseCommand):
+    help = "Queues a check job with its URL inventory for unveil_check_worker processes to run"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--base-url",
+            type=str,
+            help="Base URL of the site (default: auto-detected from default site)",
+        )
+        parser.add_argument(
+            "--max-instances",
+            type=int,
+            help="Maximum instances per model to include (default: 1, use 0 for unlimited)",
+        )
+        parser.add_argument(
+            "--since",
+            type=str,
+            metavar="last-run|TIMESTAMP",
+            help=(
+                "Only include instances changed since TIMESTAMP or since the latest complete check job "
+                "of the base URL started, --max-instances then defaults to 0"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        base_url = options.get("base_url") or get_default_base_url(self.stdout)
+        since = None
+        if options.get("since"):
+            try:
+                since = parse_since(options["since"], base_url)
+            except ValueError as e:
+                raise CommandError(str(e))
+        max_instances = options.get("max_instances")
+        if max_instances is None:
+            max_instances = 0 if since else getattr(settings, "WAGTAIL_UNVEIL_MAX_INSTANCES", 1)
+
+        self.stdout.write(self.style.SUCCESS("Finding all Wagtail URLs..."))
+        urls = collect_urls(self.stdout, base_url, max_instances, since=since)
+
+        # Storing the inventory up front lets every worker lease URLs straight away
+        job = create_check_job(base_url, max_instances, urls, since=since)
+        self.stdout.write(self.style.SUCCESS(f"Queued check job #{job.pk} with {job.total_count} URLs"))
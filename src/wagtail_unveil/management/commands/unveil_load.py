@@ -0,0 +1,199 @@
+import getpass
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from wagtail_unveil.helpers.check_helpers import (
+    check_url_with_session,
+    create_admin_session,
+)
+from wagtail_unveil.helpers.inprocess_helpers import (
+    check_url_in_process,
+    create_inprocess_client,
+)
+from wagtail_unveil.helpers.load_helpers import (
+    DEFAULT_SCALE_LEVELS,
+    ScalingSummary,
+    UrlMix,
+    parse_levels,
+    parse_weights,
+    run_load,
+)
+from wagtail_unveil.helpers.page_helpers import get_default_base_url
+from wagtail_unveil.helpers.url_helpers import collect_urls
+
+
+class Command(BaseCommand):
+    help = "Load tests the site by requesting its discovered admin and frontend URLs concurrently"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--base-url",
+            type=str,
+            help="Base URL of the site (default: auto-detected from default site)",
+        )
+        parser.add_argument(
+            "--username",
+            type=str,
+            help="Username for authentication (can also be set with WAGTAIL_UNVEIL_CHECK_USERNAME setting)",
+        )
+        parser.add_argument(
+            "--password",
+            type=str,
+            help="Password for authentication (can also be set with WAGTAIL_UNVEIL_CHECK_PASSWORD setting)",
+        )
+        parser.add_argument(
+            "--in-process",
+            action="store_true",
+            help="Render the URLs with the Django test client in this process instead of requesting them over HTTP",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=4,
+            help="Number of concurrent clients (default: 4)",
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=30,
+            help="Seconds to run the load test for, per concurrency level with --scale (default: 30)",
+        )
+        parser.add_argument(
+            "--weights",
+            type=str,
+            help=(
+                "Mix of URL types as type=weight pairs, e.g. 'frontend=10,list=3,edit=1'. "
+                "Types without a weight are not requested (default: every URL equally likely)"
+            ),
+        )
+        parser.add_argument(
+            "--max-instances",
+            type=int,
+            help="Maximum instances per model to include (default: 1, use 0 for unlimited)",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            help="Seed for the random choice of URLs, to repeat the same sequence",
+        )
+        parser.add_argument(
+            "--scale",
+            nargs="?",
+            const=",".join(str(level) for level in DEFAULT_SCALE_LEVELS),
+            metavar="LEVELS",
+            help=(
+                "Run the load test at each of these comma separated concurrency levels instead of "
+                "--concurrency and report how throughput and p99 scale (default: 1,2,4,8,16,32)"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if options["concurrency"] < 1:
+            raise CommandError("--concurrency must be at least 1")
+        if options["duration"] <= 0:
+            raise CommandError("--duration must be greater than 0")
+
+        weights = None
+        if options.get("weights"):
+            try:
+                weights = parse_weights(options["weights"])
+            except ValueError as e:
+                raise CommandError(str(e))
+
+        levels = None
+        if options.get("scale"):
+            try:
+                levels = parse_levels(options["scale"])
+            except ValueError as e:
+                raise CommandError(str(e))
+
+        base_url = options.get("base_url") or get_default_base_url(self.stdout)
+        in_process = options.get("in_process", False)
+
+        username = options.get("username") or getattr(settings, "WAGTAIL_UNVEIL_CHECK_USERNAME", None)
+        password = options.get("password") or getattr(settings, "WAGTAIL_UNVEIL_CHECK_PASSWORD", None)
+        if not username:
+            username = input("Admin username: ")
+        # In-process requests log the user in directly, without a password
+        if not password and not in_process:
+            password = getpass.getpass("Admin password: ")
+        if not username or not (password or in_process):
+            raise CommandError("Credentials are required to load test the admin")
+
+        max_instances = options.get("max_instances")
+        if max_instances is None:
+            max_instances = getattr(settings, "WAGTAIL_UNVEIL_MAX_INSTANCES", 1)
+
+        self.stdout.write(self.style.SUCCESS("Finding all Wagtail URLs..."))
+        urls = collect_urls(self.stdout, base_url, max_instances)
+        try:
+            mix = UrlMix(urls, weights)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        # Each client gets its own session or test client, logged in before the test starts
+        check_funcs = []
+        for _ in range(levels[-1] if levels else options["concurrency"]):
+            check_func = self._create_check_func(base_url, username, password, in_process)
+            if check_func is None:
+                raise CommandError("Failed to authenticate with Wagtail admin")
+            check_funcs.append(check_func)
+
+        if levels:
+            self._run_scaling(check_funcs, mix, levels, options)
+            return
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Requesting {len(mix.records)} URLs with {options['concurrency']} concurrent "
+                f"clients for {options['duration']:g}s..."
+            )
+        )
+        try:
+            stats, elapsed = run_load(check_funcs, mix, options["duration"], seed=options.get("seed"))
+        except RuntimeError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write("\n" + "=" * 50)
+        self.stdout.write(self.style.SUCCESS("LOAD TEST"))
+        self.stdout.write("=" * 50)
+        for line in stats.get_report_lines(elapsed, options["concurrency"]):
+            self.stdout.write(line)
+
+    def _run_scaling(self, check_funcs, mix, levels, options):
+        """Run the load test at each concurrency level and report the scaling."""
+        summary = ScalingSummary()
+        for concurrency in levels:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Requesting {len(mix.records)} URLs with {concurrency} concurrent "
+                    f"clients for {options['duration']:g}s..."
+                )
+            )
+            try:
+                stats, elapsed = run_load(
+                    check_funcs[:concurrency], mix, options["duration"], seed=options.get("seed")
+                )
+            except RuntimeError as e:
+                raise CommandError(str(e))
+            summary.add(concurrency, stats, elapsed)
+
+        self.stdout.write("\n" + "=" * 50)
+        self.stdout.write(self.style.SUCCESS("CONCURRENCY SCALING"))
+        self.stdout.write("=" * 50)
+        for line in summary.get_report_lines():
+            self.stdout.write(line)
+
+    def _create_check_func(self, base_url, username, password, in_process):
+        """Return a check function with its own login, or None if the login failed."""
+        if in_process:
+            client = create_inprocess_client(self.stdout, base_url, username)
+            if client is None:
+                return None
+            return lambda record: check_url_in_process(client, record)
+
+        session = create_admin_session(self.stdout, base_url, username, password)
+        if session is None:
+            return None
+        return lambda record: check_url_with_session(session, record.url)
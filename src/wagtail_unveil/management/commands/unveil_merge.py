@@ -0,0 +1,94 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from wagtail_unveil.helpers.result_helpers import (
+    get_check_result,
+    merge_results,
+    read_results,
+    write_results,
+)
+from wagtail_unveil.helpers.stats_helpers import LatencySummary
+
+
+class Command(BaseCommand):
+    help = "Combines the results files of sharded URL checks into one summary"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "files",
+            nargs="+",
+            metavar="FILE",
+            help="Results files written by list_admin_urls --check --results",
+        )
+        parser.add_argument(
+            "--output",
+            type=str,
+            metavar="FILE",
+            help="Write the combined results to FILE",
+        )
+        parser.add_argument(
+            "--fail-on-error",
+            action="store_true",
+            help="Exit with an error if any URL failed its check or a shard is missing",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            result_files = [read_results(path) for path in options["files"]]
+            rows, duplicate_count, missing_shards = merge_results(result_files)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if duplicate_count:
+            self.stdout.write(
+                self.style.WARNING(f"{duplicate_count} URLs were in more than one file, only the first result is used")
+            )
+        if missing_shards:
+            self.stdout.write(self.style.WARNING(f"Missing shards: {', '.join(missing_shards)}"))
+
+        latency = LatencySummary()
+        results = []
+        failures = []
+        not_checked = 0
+        for row in rows:
+            record, result = get_check_result(row)
+            results.append((record, result))
+            if result.status is None:
+                # Left unchecked, such as after a shard's --deadline, the URL didn't fail
+                not_checked += 1
+                continue
+            latency.add(record.model_name, record.url_type, record.url, result)
+            if result.status != "OK":
+                failures.append((record, result))
+        checked = len(results) - not_checked
+
+        if options.get("output"):
+            base_urls = {data.get("base_url") for data in result_files}
+            write_results(options["output"], base_urls.pop() if len(base_urls) == 1 else None, results)
+            self.stdout.write(self.style.SUCCESS(f"{len(results)} results written to {options['output']}"))
+
+        self.stdout.write("\n" + "=" * 50)
+        self.stdout.write(self.style.SUCCESS("URL CHECK SUMMARY"))
+        self.stdout.write("=" * 50)
+        self.stdout.write(f"Combined {len(result_files)} files")
+        self.stdout.write(self.style.SUCCESS(f"Successful URLs: {checked - len(failures)}"))
+        self.stdout.write(self.style.ERROR(f"Failed URLs: {len(failures)}"))
+        if not_checked:
+            self.stdout.write(self.style.WARNING(f"Not checked URLs: {not_checked}"))
+        success_rate = ((checked - len(failures)) / checked) * 100 if checked else 0
+        self.stdout.write(f"Success rate: {success_rate:.1f}%")
+
+        if failures:
+            self.stdout.write("\n" + "=" * 50)
+            self.stdout.write(self.style.ERROR("FAILED URLS"))
+            self.stdout.write("=" * 50)
+            for record, result in failures:
+                self.stdout.write(f"{record.model_name}: {record.url} {self.style.ERROR(f'[{result.status}]')}")
+
+        self.stdout.write("\n" + "=" * 50)
+        self.stdout.write(self.style.SUCCESS("RESPONSE TIMES"))
+        self.stdout.write("=" * 50)
+        for line in latency.get_report_lines():
+            self.stdout.write(line)
+
+        if options.get("fail_on_error") and (failures or missing_shards):
+            raise CommandError(f"{len(failures)} URLs failed, {len(missing_shards)} shards missing")
@@ -0,0 +1,54 @@
+# Generated by Django 6.1.2 on 2026-10-18 22:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CheckJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('base_url', models.CharField(max_length=255)),
+                ('max_instances', models.PositiveIntegerField(default=1)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('interrupted', 'Interrupted'), ('complete', 'Complete'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('total_count', models.PositiveIntegerField(default=0)),
+                ('checked_count', models.PositiveIntegerField(default=0)),
+                ('success_count', models.PositiveIntegerField(default=0)),
+                ('failure_count', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CheckJobResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField()),
+                ('model_name', models.CharField(max_length=255)),
+                ('url_type', models.CharField(max_length=50)),
+                ('url', models.TextField()),
+                ('status', models.CharField(blank=True, max_length=255)),
+                ('checked_at', models.DateTimeField(blank=True, null=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='results', to='wagtail_unveil.checkjob')),
+            ],
+            options={
+                'ordering': ['job', 'position'],
+                'indexes': [models.Index(fields=['job', 'checked_at'], name='wagtail_unv_job_id_21e765_idx')],
+                'constraints': [models.UniqueConstraint(fields=('job', 'position'), name='unique_check_job_position')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtail_unveil', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='checkjobresult',
+            name='response_size',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='checkjobresult',
+            name='response_time',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
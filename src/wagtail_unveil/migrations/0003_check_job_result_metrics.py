@@ -0,0 +1,18 @@
+# Generated by Django 4.2
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtail_unveil', '0002_check_job_result_timings'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='checkjobresult',
+            name='metrics',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtail_unveil', '0003_check_job_result_metrics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='checkjobresult',
+            name='lease_owner',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='checkjobresult',
+            name='lease_expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
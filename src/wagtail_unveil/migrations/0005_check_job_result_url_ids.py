@@ -0,0 +1,49 @@
+# Generated by Django 4.2
+
+import hashlib
+from urllib.parse import urlsplit
+
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+
+
+def get_url_id(url):
+    # A copy of wagtail_unveil.helpers.base.get_url_id as of this migration,
+    # so later changes to the app code don't change the stored IDs
+    parts = urlsplit(url)
+    return hashlib.sha1(f"{parts.path}?{parts.query}".encode()).hexdigest()[:16]
+
+
+def set_url_ids(apps, schema_editor):
+    CheckJobResult = apps.get_model('wagtail_unveil', 'CheckJobResult')
+    results = CheckJobResult.objects.filter(url_id='').only('pk', 'url')
+    batch = []
+    for result in results.iterator(chunk_size=BATCH_SIZE):
+        result.url_id = get_url_id(result.url)
+        batch.append(result)
+        if len(batch) >= BATCH_SIZE:
+            CheckJobResult.objects.bulk_update(batch, ['url_id'])
+            batch = []
+    if batch:
+        CheckJobResult.objects.bulk_update(batch, ['url_id'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtail_unveil', '0004_check_job_result_leases'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='checkjobresult',
+            name='url_id',
+            field=models.CharField(blank=True, max_length=16),
+        ),
+        migrations.AddIndex(
+            model_name='checkjobresult',
+            index=models.Index(fields=['job', 'url_id'], name='wagtail_unv_job_id_7a9c6e_idx'),
+        ),
+        migrations.RunPython(set_url_ids, migrations.RunPython.noop),
+    ]
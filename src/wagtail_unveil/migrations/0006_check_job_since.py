@@ -0,0 +1,18 @@
+# Generated by Django 4.2
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtail_unveil', '0005_check_job_result_url_ids'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='checkjob',
+            name='since',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
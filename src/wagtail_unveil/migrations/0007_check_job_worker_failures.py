@@ -0,0 +1,18 @@
+# Generated by Django 4.2
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtail_unveil', '0006_check_job_since'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='checkjob',
+            name='worker_failures',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
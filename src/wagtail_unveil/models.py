@@ -0,0 +1,98 @@
+from django.db import models
+
+
+class CheckJob(models.Model):
+    """A URL check run whose progress is stored so it can be resumed."""
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_INTERRUPTED = "interrupted"
+    STATUS_COMPLETE = "complete"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_INTERRUPTED, "Interrupted"),
+        (STATUS_COMPLETE, "Complete"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    base_url = models.CharField(max_length=255)
+    max_instances = models.PositiveIntegerField(default=1)
+    # Only instances changed since then were listed, part of what identifies the job
+    since = models.DateTimeField(null=True, blank=True)
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING
+    )
+    total_count = models.PositiveIntegerField(default=0)
+    checked_count = models.PositiveIntegerField(default=0)
+    success_count = models.PositiveIntegerField(default=0)
+    failure_count = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    # Worker errors since the last checkpoint, the job is failed when they keep happening
+    worker_failures = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Updated at every checkpoint so stale runs can be detected and taken over
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+
+    def __str__(self):
+        return f"Check job #{self.pk} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_COMPLETE, self.STATUS_FAILED)
+
+    @property
+    def progress(self):
+        """Percentage of URLs checked so far."""
+        if not self.total_count:
+            return 100.0 if self.is_finished else 0.0
+        return (self.checked_count / self.total_count) * 100
+
+
+class CheckJobResult(models.Model):
+    """A single URL of a check job, with its status once it has been checked."""
+
+    job = models.ForeignKey(
+        CheckJob, on_delete=models.CASCADE, related_name="results"
+    )
+    position = models.PositiveIntegerField()
+    model_name = models.CharField(max_length=255)
+    url_type = models.CharField(max_length=50)
+    url = models.TextField()
+    # Hash of the URL path and query string, matching the URL across runs
+    url_id = models.CharField(max_length=16, blank=True)
+    status = models.CharField(max_length=255, blank=True)
+    # Total response time in seconds and body size in bytes
+    response_time = models.FloatField(null=True, blank=True)
+    response_size = models.PositiveIntegerField(null=True, blank=True)
+    # Extra measurements such as SQL query counts from in-process checks
+    metrics = models.JSONField(null=True, blank=True)
+    checked_at = models.DateTimeField(null=True, blank=True)
+    # The worker checking the URL, other workers can take it over once the lease expires
+    lease_owner = models.CharField(max_length=255, blank=True)
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["job", "position"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["job", "position"], name="unique_check_job_position"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["job", "checked_at"]),
+            models.Index(fields=["job", "url_id"]),
+        ]
+
+    def __str__(self):
+        return f"{self.model_name}: {self.url} [{self.status or 'pending'}]"
+
+    @property
+    def is_success(self):
+        return self.status == "OK"
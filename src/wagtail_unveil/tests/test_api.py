@@ -288,4 +288,39 @@ class UnveilApiViewTests(TestCase):
                           mock_settings_urls, mock_img_urls, mock_doc_urls]:
             mock_func.assert_called_once()
             self.assertEqual(mock_func.call_args[0][1], 'https://example.com')
-            self.assertEqual(mock_func.call_args[0][2], 5)
\ No newline at end of file
+            self.assertEqual(mock_func.call_args[0][2], 5)
+    @patch('wagtail_unveil.api.get_page_urls')
+    @patch('wagtail_unveil.api.get_snippet_urls')
+    @patch('wagtail_unveil.api.get_modelviewset_urls')
+    @patch('wagtail_unveil.api.get_modeladmin_urls')
+    @patch('wagtail_unveil.api.get_settings_admin_urls')
+    @patch('wagtail_unveil.api.get_image_admin_urls')
+    @patch('wagtail_unveil.api.get_document_admin_urls')
+    def test_get_shard(self, mock_doc_urls, mock_img_urls, mock_settings_urls,
+                       mock_admin_urls, mock_viewset_urls, mock_snippet_urls, mock_page_urls):
+        """Test that the shards of the URLs are disjoint and cover every URL."""
+        mock_page_urls.return_value = self.mock_page_urls
+        mock_snippet_urls.return_value = self.mock_snippet_urls
+        mock_viewset_urls.return_value = self.mock_modelviewset_urls
+        mock_admin_urls.return_value = self.mock_modeladmin_urls
+        mock_settings_urls.return_value = self.mock_settings_urls
+        mock_img_urls.return_value = self.mock_image_urls
+        mock_doc_urls.return_value = self.mock_document_urls
+
+        shard_urls = []
+        for shard in ('1/3', '2/3', '3/3'):
+            response = self.view(self.factory.get('/api/unveil/', {'shard': shard}))
+            response_data = json.loads(response.content)
+            self.assertEqual(response_data['meta']['shard'], shard)
+            self.assertEqual(response_data['meta']['total_urls'], len(response_data['urls']))
+            shard_urls.extend(item['url'] for item in response_data['urls'])
+
+        self.assertEqual(len(shard_urls), 14)
+        self.assertEqual(len(set(shard_urls)), 14)
+
+    def test_get_invalid_shard(self):
+        """Test that an invalid shard is rejected."""
+        response = self.view(self.factory.get('/api/unveil/', {'shard': '4/3'}))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('error', json.loads(response.content))
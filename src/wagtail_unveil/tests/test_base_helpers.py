@@ -1,4 +1,6 @@
+from django.contrib.auth.models import Group
 from django.test import TestCase
+from django.utils import timezone
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import DatabaseError, OperationalError
 from io import StringIO
@@ -10,7 +12,10 @@ from wagtail_unveil.helpers.base import (
     get_instance_sample,
     model_has_instances,
     format_url_tuple,
+    get_model_label,
     truncate_instance_name,
+    get_url_id,
+    UrlRecord,
 )
 
 
@@ -179,6 +184,18 @@ class GetInstanceSampleTests(TestCase):
         self.assertEqual(result, ["instance1", "instance2", "instance3"])
 
 
+    @patch('wagtail_unveil.helpers.base.filter_changed')
+    def test_get_instance_sample_with_since(self, mock_filter_changed):
+        """Test get_instance_sample only queries changed instances when since is given."""
+        since = timezone.now()
+        Group.objects.create(name="Reviewers")
+        mock_filter_changed.return_value = Group.objects.none()
+
+        result = get_instance_sample(self.output, Group, max_instances=0, since=since)
+
+        self.assertEqual(list(result), [])
+        self.assertEqual(mock_filter_changed.call_args[0][1], since)
+
 class ModelHasInstancesTests(TestCase):
     def setUp(self):
         self.output = StringIO()
@@ -224,6 +241,24 @@ class FormatUrlTupleTests(TestCase):
         result = format_url_tuple("TestModel", instance_name="Test Instance", url_type="edit", url="/admin/test/1/")
         self.assertEqual(result, ("TestModel (Test Instance)", "edit", "/admin/test/1/"))
 
+    def test_format_url_tuple_fields(self):
+        """Test that the returned record exposes its fields and model label."""
+        result = format_url_tuple("app.model", instance_name="Instance", url_type="edit", url="/admin/test/1/")
+        self.assertEqual(result.model_name, "app.model (Instance)")
+        self.assertEqual(result.url_type, "edit")
+        self.assertEqual(result.url, "/admin/test/1/")
+        self.assertEqual(result.model, "app.model")
+
+
+class GetModelLabelTests(TestCase):
+    def test_get_model_label_with_instance_name(self):
+        """Test that the instance name is removed from the display name."""
+        self.assertEqual(get_model_label("home.homepage (Home (old))"), "home.homepage")
+
+    def test_get_model_label_without_instance_name(self):
+        """Test that display names without an instance name are unchanged."""
+        self.assertEqual(get_model_label("Settings > Sites > localhost"), "Settings > Sites > localhost")
+
 
 class TruncateInstanceNameTests(TestCase):
     def test_truncate_instance_name_short(self):
@@ -250,4 +285,13 @@ class TruncateInstanceNameTests(TestCase):
         exact_name = "This is exactly 25 chars."
         result = truncate_instance_name(exact_name, max_length=25)
         self.assertEqual(result, exact_name)
-        self.assertEqual(len(result), 25)
\ No newline at end of file
+        self.assertEqual(len(result), 25)
+
+class GetUrlIdTests(TestCase):
+    def test_get_url_id_ignores_base_url(self):
+        """Test that the same path and query string get the same ID on any host."""
+        self.assertEqual(
+            get_url_id("http://localhost:8000/admin/pages/3/edit/?tab=content"),
+            UrlRecord("Page", "edit", "https://example.com/admin/pages/3/edit/?tab=content").url_id,
+        )
+        self.assertNotEqual(get_url_id("http://example.com/admin/pages/3/edit/"), get_url_id("http://example.com/admin/pages/4/edit/"))
@@ -0,0 +1,183 @@
+import os
+import sqlite3
+import tempfile
+from unittest.mock import Mock, patch
+from django.test import TestCase
+
+from wagtail_unveil.helpers.base import UrlRecord
+from wagtail_unveil.helpers.cache_helpers import CacheSummary, CheckCache, check_url_cached
+from wagtail_unveil.helpers.check_helpers import CheckResult
+
+
+def make_session(status_code, headers=None, body=b"<html></html>"):
+    """Return a mock session whose requests get one response."""
+    session = Mock()
+    response = Mock(status_code=status_code, headers=headers or {})
+    response.iter_content.return_value = [body] if body else []
+    session.get.return_value = response
+    return session
+
+
+class CheckCacheTests(TestCase):
+    def setUp(self):
+        self.cache = CheckCache(":memory:", ttl=60)
+        self.record = UrlRecord("Page", "edit", "http://example.com/admin/pages/3/edit/")
+
+    def tearDown(self):
+        self.cache.close()
+
+    def test_set_and_get(self):
+        """Test that results are stored by URL ID with their validators."""
+        self.cache.set(self.record, CheckResult(status="OK", status_code=200, total=0.2, size=10), etag='"v1"')
+
+        row = self.cache.get(self.record.url_id)
+
+        self.assertEqual((row["url"], row["status"], row["size"], row["etag"]), (self.record.url, "OK", 10, '"v1"'))
+        self.assertIsNone(self.cache.get(UrlRecord("Page", "list", "http://example.com/admin/pages/").url_id))
+
+    def test_is_fresh(self):
+        """Test that only OK results younger than the TTL are fresh."""
+        self.cache.set(self.record, CheckResult(status="OK", status_code=200))
+        row = self.cache.get(self.record.url_id)
+
+        self.assertTrue(self.cache.is_fresh(row, now=row["checked_at"] + 30))
+        self.assertFalse(self.cache.is_fresh(row, now=row["checked_at"] + 90))
+
+        self.cache.set(self.record, CheckResult(status="SERVER ERROR", status_code=500))
+        self.assertFalse(self.cache.is_fresh(self.cache.get(self.record.url_id)))
+
+
+    def test_scoped_by_base_url_and_user(self):
+        """Test that results are only reused for the same base URL host and user."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache.sqlite3")
+            staging = CheckCache(path, base_url="https://staging.example.com", username="admin")
+            staging.set(self.record, CheckResult(status="OK", status_code=200))
+            staging.close()
+
+            for base_url, username in [
+                ("https://www.example.com", "admin"),
+                ("https://staging.example.com", "editor"),
+            ]:
+                other = CheckCache(path, base_url=base_url, username=username)
+                self.assertIsNone(other.get(self.record.url_id))
+                other.close()
+
+            staging = CheckCache(path, base_url="https://staging.example.com", username="admin")
+            self.assertIsNotNone(staging.get(self.record.url_id))
+            staging.close()
+
+    def test_unscoped_cache_file_replaced(self):
+        """Test that cache files keyed by URL ID alone are started over."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache.sqlite3")
+            connection = sqlite3.connect(path)
+            connection.execute("CREATE TABLE check_results (url_id TEXT PRIMARY KEY, url TEXT)")
+            connection.execute("INSERT INTO check_results VALUES ('abc', 'http://example.com/')")
+            connection.commit()
+            connection.close()
+
+            cache = CheckCache(path, base_url="http://example.com")
+            self.assertIsNone(cache.get("abc"))
+            cache.close()
+
+
+class CheckUrlCachedTests(TestCase):
+    def setUp(self):
+        self.cache = CheckCache(":memory:", ttl=60)
+        self.record = UrlRecord("Page", "edit", "http://example.com/admin/pages/3/edit/")
+
+    def tearDown(self):
+        self.cache.close()
+
+    def test_miss_stores_result(self):
+        """Test that uncached URLs are requested and stored with their validators."""
+        session = make_session(200, headers={"ETag": '"v1"', "Last-Modified": "Sat, 01 Jun 2024 10:00:00 GMT"})
+
+        result = check_url_cached(self.cache, session, self.record)
+
+        self.assertEqual(result.status, "OK")
+        self.assertEqual(result.metrics, {"cache": "miss"})
+        self.assertEqual(session.get.call_args[1]["headers"], {})
+        row = self.cache.get(self.record.url_id)
+        self.assertEqual((row["etag"], row["last_modified"]), ('"v1"', "Sat, 01 Jun 2024 10:00:00 GMT"))
+
+    def test_fresh_hit_skips_request(self):
+        """Test that fresh OK results are returned without a request or timings."""
+        self.cache.set(self.record, CheckResult(status="OK", status_code=200, total=0.2, size=10))
+        session = make_session(200)
+
+        result = check_url_cached(self.cache, session, self.record)
+
+        session.get.assert_not_called()
+        self.assertEqual((result.status, result.size, result.total), ("OK", 10, None))
+        self.assertEqual(result.metrics["cache"], "hit")
+
+    def test_stale_result_revalidated(self):
+        """Test that stale OK results are revalidated, keeping the cached size on a 304."""
+        self.cache.set(self.record, CheckResult(status="OK", status_code=200, size=10), etag='"v1"')
+        session = make_session(304, body=None)
+
+        with patch("wagtail_unveil.helpers.cache_helpers.time.time", return_value=10**10):
+            result = check_url_cached(self.cache, session, self.record)
+
+        self.assertEqual(session.get.call_args[1]["headers"], {"If-None-Match": '"v1"'})
+        self.assertEqual(result.status, "OK")
+        self.assertEqual(result.metrics, {"cache": "revalidated", "cached_size": 10})
+        row = self.cache.get(self.record.url_id)
+        self.assertEqual((row["size"], row["etag"], row["checked_at"]), (10, '"v1"', 10**10))
+
+    def test_same_path_other_base_url_is_miss(self):
+        """Test that a URL cached for one base URL is requested again for another."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache.sqlite3")
+            staging = CheckCache(path, base_url="https://staging.example.com", username="admin")
+            staging.set(
+                UrlRecord("Page", "edit", "https://staging.example.com/admin/pages/3/edit/"),
+                CheckResult(status="OK", status_code=200, size=10),
+                etag='"v1"',
+            )
+            staging.close()
+            production = CheckCache(path, base_url="https://www.example.com", username="admin")
+            session = make_session(200)
+
+            result = check_url_cached(
+                production, session, UrlRecord("Page", "edit", "https://www.example.com/admin/pages/3/edit/")
+            )
+            production.close()
+
+        session.get.assert_called_once()
+        self.assertEqual(session.get.call_args[1]["headers"], {})
+        self.assertEqual(result.metrics, {"cache": "miss"})
+
+    def test_failure_checked_again(self):
+        """Test that failed URLs are requested without validators, even within the TTL."""
+        self.cache.set(self.record, CheckResult(status="SERVER ERROR", status_code=500), etag='"v1"')
+        session = make_session(200)
+
+        result = check_url_cached(self.cache, session, self.record)
+
+        self.assertEqual(session.get.call_args[1]["headers"], {})
+        self.assertEqual(result.metrics, {"cache": "miss"})
+        self.assertEqual(self.cache.get(self.record.url_id)["status"], "OK")
+
+
+class CacheSummaryTests(TestCase):
+    def test_report_counts_outcomes(self):
+        """Test that the report counts each cache outcome and the size not downloaded."""
+        summary = CacheSummary()
+        record = UrlRecord("Page", "edit", "http://example.com/admin/pages/3/edit/")
+        summary.add(record, {"cache": "hit", "cached_size": 1024})
+        summary.add(record, {"cache": "revalidated", "cached_size": 1024})
+        summary.add(record, {"cache": "miss"})
+        summary.add(record, None)
+
+        lines = summary.get_report_lines()
+
+        self.assertIn("Fresh in the cache, not requested", lines[0])
+        self.assertIn("33.3%", lines[0])
+        self.assertIn("2.0KB", lines[3])
+
+    def test_report_without_results(self):
+        """Test the report when no URL was checked through the cache."""
+        self.assertEqual(CacheSummary().get_report_lines(), ["No URLs checked with the cache"])
@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+from django.contrib.auth.models import Group
+from django.test import TestCase
+from django.utils import timezone
+from wagtail.models import ModelLogEntry, Page, PageLogEntry
+
+from wagtail_unveil.helpers.change_helpers import filter_changed, parse_since
+from wagtail_unveil.models import CheckJob
+
+
+class ParseSinceTests(TestCase):
+    def test_parse_timestamps(self):
+        """Test that dates and times are parsed as aware datetimes."""
+        since = parse_since("2024-05-01T02:30:00+00:00", "http://example.com")
+        self.assertEqual(since, datetime(2024, 5, 1, 2, 30, tzinfo=timezone.UTC))
+
+        since = parse_since("2024-05-01", "http://example.com")
+        self.assertTrue(timezone.is_aware(since))
+        self.assertEqual((since.year, since.month, since.day, since.hour), (2024, 5, 1, 0))
+
+        with self.assertRaises(ValueError):
+            parse_since("yesterday", "http://example.com")
+
+    def test_parse_last_run(self):
+        """Test that last-run is the start of the latest complete job of the base URL."""
+        with self.assertRaises(ValueError):
+            parse_since("last-run", "http://example.com")
+
+        started_at = timezone.now() - timedelta(hours=6)
+        CheckJob.objects.create(base_url="http://example.com", status=CheckJob.STATUS_COMPLETE, started_at=started_at)
+        CheckJob.objects.create(base_url="http://example.com", status=CheckJob.STATUS_FAILED)
+        CheckJob.objects.create(base_url="http://other.example.com", status=CheckJob.STATUS_COMPLETE)
+
+        self.assertEqual(parse_since("last-run", "http://example.com"), started_at)
+
+
+class FilterChangedTests(TestCase):
+    def setUp(self):
+        self.since = timezone.now() - timedelta(hours=1)
+
+    def test_pages_with_new_revisions_or_log_entries(self):
+        """Test that pages count as changed by their revision time or their audit log."""
+        root = Page.objects.get(depth=1)
+        home = Page.objects.get(depth=2)
+        Page.objects.update(latest_revision_created_at=self.since - timedelta(days=1))
+        self.assertFalse(filter_changed(Page.objects.all(), self.since).exists())
+
+        Page.objects.filter(pk=home.pk).update(latest_revision_created_at=timezone.now())
+        PageLogEntry.objects.log_action(root, "wagtail.move")
+
+        self.assertEqual(set(filter_changed(Page.objects.all(), self.since)), {root, home})
+
+    def test_models_without_revisions(self):
+        """Test that other models count as changed when their audit log has a recent entry."""
+        changed = Group.objects.create(name="Changed")
+        Group.objects.create(name="Unchanged")
+        ModelLogEntry.objects.log_action(changed, "wagtail.edit")
+
+        self.assertEqual(list(filter_changed(Group.objects.all(), self.since)), [changed])
@@ -0,0 +1,298 @@
+import socket
+from django.core.cache import cache
+from django.core.cache.backends.dummy import DummyCache
+from django.test import TestCase, override_settings
+from io import StringIO
+from unittest.mock import Mock, patch
+
+from requests.exceptions import ConnectionError
+from urllib3.exceptions import NameResolutionError
+
+from wagtail_unveil.helpers.base import UrlRecord
+from wagtail_unveil.helpers.check_helpers import (
+    CheckResult,
+    TimedHTTPConnection,
+    TimingAdapter,
+    check_cold_warm,
+    check_url_with_session,
+    clear_django_caches,
+    create_admin_session,
+    create_session,
+    get_connection_timings,
+    get_status_label,
+    is_local_url,
+)
+
+
+class GetStatusLabelTests(TestCase):
+    def test_ok(self):
+        """Test that a 200 response is reported as OK."""
+        self.assertEqual(get_status_label(200), "OK")
+
+    def test_auth_failed(self):
+        """Test that 401 and 403 responses are reported as auth failures."""
+        self.assertEqual(get_status_label(401), "AUTH FAILED")
+        self.assertEqual(get_status_label(403), "AUTH FAILED")
+
+    def test_not_found(self):
+        """Test that 404 and 410 responses are reported as not found."""
+        self.assertEqual(get_status_label(404), "NOT FOUND")
+        self.assertEqual(get_status_label(410), "NOT FOUND")
+
+    def test_server_error(self):
+        """Test that 5xx responses are reported as server errors."""
+        self.assertEqual(get_status_label(502), "SERVER ERROR (502)")
+
+    def test_other_error(self):
+        """Test that other status codes are reported as generic errors."""
+        self.assertEqual(get_status_label(400), "ERROR (400)")
+
+
+class CheckUrlWithSessionTests(TestCase):
+    def test_check_url_ok(self):
+        """Test that the status label, timings and size of the response are returned."""
+        session = Mock()
+        response = Mock(status_code=200)
+        response.iter_content.return_value = [b"x" * 1000, b"x" * 500]
+        session.get.return_value = response
+
+        result = check_url_with_session(session, "http://example.com/admin/")
+
+        self.assertEqual(result.status, "OK")
+        self.assertEqual(result.status_code, 200)
+        self.assertEqual(result.size, 1500)
+        self.assertGreaterEqual(result.total, result.ttfb)
+        # No new connection was made by the mocked session
+        self.assertIsNone(result.dns)
+        self.assertIsNone(result.connect)
+        session.get.assert_called_once_with(
+            "http://example.com/admin/", timeout=10, allow_redirects=True, stream=True, headers=None
+        )
+        response.close.assert_called_once()
+
+    def test_check_url_conditional(self):
+        """Test that a 304 to a conditional request is OK and the validators are returned."""
+        session = Mock()
+        response = Mock(status_code=304, headers={"ETag": '"abc"'})
+        response.iter_content.return_value = []
+        session.get.return_value = response
+
+        result = check_url_with_session(session, "http://example.com/", headers={"If-None-Match": '"abc"'})
+
+        self.assertEqual(result.status, "OK")
+        self.assertEqual(result.metrics, {"etag": '"abc"', "last_modified": None})
+        self.assertEqual(session.get.call_args[1]["headers"], {"If-None-Match": '"abc"'})
+
+    def test_check_url_body_timeout(self):
+        """Test that a response body still arriving after the timeout counts as timed out."""
+        session = Mock()
+        response = Mock(status_code=200)
+        response.iter_content.return_value = [b"a" * 10, b"b" * 10]
+        session.get.return_value = response
+
+        with patch("wagtail_unveil.helpers.check_helpers.time.perf_counter", side_effect=[0, 1, 6, 6]):
+            result = check_url_with_session(session, "http://example.com/slow/", timeout=5)
+
+        self.assertEqual(result.status, "ERROR (Timed out after 5s)")
+        self.assertIsNone(result.status_code)
+        self.assertEqual((result.size, result.total), (10, 6))
+        response.close.assert_called_once()
+
+    def test_check_url_not_found(self):
+        """Test that failing status codes are labelled."""
+        session = Mock()
+        response = Mock(status_code=404)
+        response.iter_content.return_value = []
+        session.get.return_value = response
+
+        result = check_url_with_session(session, "http://example.com/missing/")
+
+        self.assertEqual(result.status, "NOT FOUND")
+        self.assertEqual(result.size, 0)
+
+    def test_check_url_request_exception(self):
+        """Test that request errors are reported with a truncated message."""
+        session = Mock()
+        session.get.side_effect = ConnectionError("x" * 100)
+
+        result = check_url_with_session(session, "http://example.com/admin/")
+
+        self.assertEqual(result.status, f"ERROR ({'x' * 47}...)")
+        self.assertIsNone(result.status_code)
+        self.assertIsNotNone(result.total)
+
+
+class CreateAdminSessionTests(TestCase):
+    def setUp(self):
+        self.output = StringIO()
+
+    @patch("wagtail_unveil.helpers.check_helpers.requests.Session")
+    def test_create_admin_session_success(self, mock_session_class):
+        """Test that a session is returned when the login succeeds."""
+        session = mock_session_class.return_value
+        login_page = Mock(text='<input name="csrfmiddlewaretoken" value="token123">')
+        login_response = Mock(url="http://example.com/admin/", text="Dashboard")
+        verify_response = Mock(url="http://example.com/admin/", status_code=200)
+        session.get.side_effect = [login_page, verify_response]
+        session.post.return_value = login_response
+
+        result = create_admin_session(
+            self.output, "http://example.com", "admin", "secret"
+        )
+
+        self.assertIs(result, session)
+        login_data = session.post.call_args.kwargs["data"]
+        self.assertEqual(login_data["csrfmiddlewaretoken"], "token123")
+        self.assertEqual(login_data["username"], "admin")
+
+    @patch("wagtail_unveil.helpers.check_helpers.requests.Session")
+    def test_create_admin_session_missing_csrf_token(self, mock_session_class):
+        """Test that None is returned when the login page has no CSRF token."""
+        session = mock_session_class.return_value
+        session.get.return_value = Mock(text="<html></html>")
+
+        result = create_admin_session(
+            self.output, "http://example.com", "admin", "secret"
+        )
+
+        self.assertIsNone(result)
+        self.assertIn("Could not find CSRF token", self.output.getvalue())
+
+    @patch("wagtail_unveil.helpers.check_helpers.requests.Session")
+    def test_create_admin_session_invalid_credentials(self, mock_session_class):
+        """Test that None is returned when the login is rejected."""
+        session = mock_session_class.return_value
+        session.get.return_value = Mock(
+            text='<input name="csrfmiddlewaretoken" value="token123">'
+        )
+        session.post.return_value = Mock(
+            url="http://example.com/admin/login/", text=""
+        )
+
+        result = create_admin_session(
+            self.output, "http://example.com", "admin", "wrong"
+        )
+
+        self.assertIsNone(result)
+        self.assertIn("Invalid credentials", self.output.getvalue())
+
+
+class CreateSessionTests(TestCase):
+    def test_create_session_mounts_timing_adapter(self):
+        """Test that sessions record connection timings for HTTP and HTTPS URLs."""
+        session = create_session()
+
+        self.assertIsInstance(session.get_adapter("http://example.com/"), TimingAdapter)
+        self.assertIsInstance(session.get_adapter("https://example.com/"), TimingAdapter)
+
+
+class TimedConnectionTests(TestCase):
+    def setUp(self):
+        self.server = socket.socket()
+        self.server.bind(("127.0.0.1", 0))
+        self.server.listen()
+        self.port = self.server.getsockname()[1]
+
+    def tearDown(self):
+        self.server.close()
+
+    def test_host_resolved_once(self):
+        """Test that the host is looked up once and connected to by its resolved address."""
+        connection = TimedHTTPConnection("localhost", self.port)
+        count = get_connection_timings()[0]
+
+        with patch("socket.getaddrinfo", wraps=socket.getaddrinfo) as getaddrinfo:
+            connection.connect()
+        connection.close()
+
+        hosts = [call.args[0] for call in getaddrinfo.call_args_list]
+        self.assertEqual(hosts.count("localhost"), 1)
+        self.assertEqual(hosts[-1], "127.0.0.1")
+        new_count, dns, connect = get_connection_timings()
+        self.assertEqual(new_count, count + 1)
+        self.assertGreaterEqual(dns, 0)
+        self.assertGreaterEqual(connect, 0)
+
+    def test_unknown_host(self):
+        """Test that failed lookups raise the error urllib3 raises."""
+        connection = TimedHTTPConnection("unknown.invalid", self.port)
+
+        with patch("socket.getaddrinfo", side_effect=socket.gaierror("Name or service not known")):
+            with self.assertRaises(NameResolutionError):
+                connection.connect()
+
+
+class CheckColdWarmTests(TestCase):
+    def setUp(self):
+        self.record = UrlRecord("Page", "list", "http://example.com/")
+        self.check_func = Mock(
+            side_effect=[
+                CheckResult("OK", total=0.3, metrics={"queries": 5}),
+                CheckResult("OK", total=0.1, metrics={"queries": 2}),
+            ]
+        )
+
+    @patch("wagtail_unveil.helpers.check_helpers.clear_django_caches")
+    def test_check_cold_warm(self, mock_clear):
+        """Test that the first result is returned with both response times."""
+        result = check_cold_warm(self.check_func, self.record)
+
+        self.assertEqual(self.check_func.call_count, 2)
+        self.assertEqual(result.total, 0.3)
+        self.assertEqual(
+            result.metrics, {"queries": 5, "cold_time": 0.3, "warm_time": 0.1}
+        )
+        mock_clear.assert_not_called()
+
+    @patch("wagtail_unveil.helpers.check_helpers.clear_django_caches")
+    def test_check_cold_warm_clear_cache(self, mock_clear):
+        """Test that caches are cleared before the first request when asked."""
+        check_cold_warm(self.check_func, self.record, clear_cache=True, cache_aliases=["shared"])
+
+        mock_clear.assert_called_once_with(["shared"], local=True)
+
+        mock_clear.reset_mock()
+        self.check_func.side_effect = [CheckResult("OK", total=0.3), CheckResult("OK", total=0.1)]
+        check_cold_warm(self.check_func, self.record, clear_cache=True, cache_aliases=["shared"], clear_local=False)
+        mock_clear.assert_called_once_with(["shared"], local=False)
+
+    def test_clear_django_caches(self):
+        """Test that the local memory caches are cleared."""
+        cache.set("unveil-test", "value")
+
+        clear_django_caches()
+
+        self.assertIsNone(cache.get("unveil-test"))
+
+    def test_clear_django_caches_not_local(self):
+        """Test that the caches of this process are left alone for HTTP checks."""
+        cache.set("unveil-test", "value")
+
+        with patch("wagtail_unveil.helpers.check_helpers.reset_loaders") as mock_reset:
+            clear_django_caches(local=False)
+
+        self.assertEqual(cache.get("unveil-test"), "value")
+        mock_reset.assert_not_called()
+
+    @override_settings(
+        CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+            "shared": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+        }
+    )
+    def test_clear_django_caches_skips_shared(self):
+        """Test that shared caches are only cleared when their alias is named."""
+        with patch.object(DummyCache, "clear") as mock_clear:
+            clear_django_caches()
+            mock_clear.assert_not_called()
+
+            clear_django_caches(["shared"])
+            mock_clear.assert_called_once()
+
+    def test_is_local_url(self):
+        """Test that only URLs served from this machine are local."""
+        self.assertTrue(is_local_url("http://localhost:8000"))
+        self.assertTrue(is_local_url("http://127.0.0.1/admin/"))
+        self.assertTrue(is_local_url("http://[::1]:8000"))
+        self.assertTrue(is_local_url("http://unveil.localhost"))
+        self.assertFalse(is_local_url("https://www.example.com"))
@@ -0,0 +1,98 @@
+import os
+import tempfile
+from django.test import TestCase
+
+from wagtail_unveil.helpers.base import UrlRecord
+from wagtail_unveil.helpers.check_helpers import CheckResult
+from wagtail_unveil.helpers.diff_helpers import RunDiff, load_run
+from wagtail_unveil.helpers.job_helpers import create_check_job
+from wagtail_unveil.helpers.result_helpers import write_results
+
+
+def make_run(*rows):
+    """Return a load_run style mapping of (model_name, url_type, url, CheckResult) rows."""
+    run = {}
+    for model_name, url_type, url, result in rows:
+        record = UrlRecord(model_name, url_type, url)
+        run[record.url_id] = (record, result)
+    return run
+
+
+class LoadRunTests(TestCase):
+    def setUp(self):
+        self.record = UrlRecord("Page", "edit", "http://example.com/admin/pages/3/edit/")
+
+    def test_load_check_job(self):
+        """Test that a job's results are keyed by URL ID, unchecked URLs without a status."""
+        job = create_check_job("http://example.com", 1, [self.record, ("Image", "list", "http://example.com/admin/images/")])
+        job.results.filter(position=0).update(status="OK", response_time=0.2)
+
+        label, run = load_run(str(job.pk))
+
+        self.assertEqual(label, f"check job #{job.pk}")
+        record, result = run[self.record.url_id]
+        self.assertEqual(record, self.record)
+        self.assertEqual((result.status, result.total), ("OK", 0.2))
+        self.assertIsNone(run[UrlRecord("Image", "list", "http://example.com/admin/images/").url_id][1].status)
+
+    def test_load_results_file(self):
+        """Test that URLs from results files match those of jobs, whatever the base URL."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.json")
+            write_results(
+                path,
+                "http://localhost:8000",
+                [(("Page", "edit", "http://localhost:8000/admin/pages/3/edit/"), CheckResult("OK", 200))],
+            )
+            label, run = load_run(path)
+
+        self.assertEqual(label, path)
+        self.assertIn(self.record.url_id, run)
+
+    def test_missing_run(self):
+        """Test that unknown jobs and unreadable files raise a ValueError."""
+        with self.assertRaises(ValueError):
+            load_run("999")
+        with self.assertRaises(ValueError):
+            load_run("missing.json")
+
+
+class RunDiffTests(TestCase):
+    def test_changes(self):
+        """Test that added, removed, status changes and regressions are reported."""
+        old = make_run(
+            ("Page", "edit", "http://example.com/admin/pages/3/edit/", CheckResult("OK", 200, total=0.2)),
+            ("Page", "list", "http://example.com/admin/pages/", CheckResult("OK", 200, total=0.1)),
+            ("Image", "list", "http://example.com/admin/images/", CheckResult("OK", 200, total=0.1)),
+            ("Page", "delete", "http://example.com/admin/pages/4/delete/", CheckResult("OK", 200)),
+        )
+        new = make_run(
+            ("Page", "edit", "http://example.com/admin/pages/3/edit/", CheckResult("ERROR (500)", 500, total=0.2)),
+            ("Page", "list", "http://example.com/admin/pages/", CheckResult("OK", 200, total=0.4)),
+            # Slower, but by less than the minimum regression
+            ("Image", "list", "http://example.com/admin/images/", CheckResult("OK", 200, total=0.14)),
+            ("Page", "delete", "http://example.com/admin/pages/5/delete/", CheckResult("OK", 200)),
+        )
+
+        diff = RunDiff(old, new)
+
+        self.assertEqual([record.url for record in diff.added], ["http://example.com/admin/pages/5/delete/"])
+        self.assertEqual([record.url for record in diff.removed], ["http://example.com/admin/pages/4/delete/"])
+        self.assertEqual(
+            [(record.url_type, old_status, new_status) for record, old_status, new_status in diff.status_changes],
+            [("edit", "OK", "ERROR (500)")],
+        )
+        self.assertEqual(len(diff.new_failures), 1)
+        self.assertEqual([(record.url_type, times) for record, *times in diff.regressions], [("list", [0.1, 0.4])])
+        lines = diff.get_report_lines()
+        self.assertEqual(lines[0], "3 URLs in both runs, 1 added, 1 removed, 1 status changes, 1 slower")
+        self.assertIn("OK -> ERROR (500)  http://example.com/admin/pages/3/edit/ (edit, Page)", lines)
+
+    def test_no_changes(self):
+        """Test that identical runs only report the summary line."""
+        run = make_run(("Page", "list", "http://example.com/admin/pages/", CheckResult("OK", 200, total=0.1)))
+
+        diff = RunDiff(run, run)
+
+        self.assertFalse(diff.has_changes)
+        self.assertEqual(len(diff.get_report_lines()), 1)
@@ -0,0 +1,116 @@
+import json
+import os
+import tempfile
+from datetime import timedelta
+from django.test import TestCase
+from requests import PreparedRequest, Response
+from unittest.mock import patch
+
+from wagtail_unveil.helpers.check_helpers import CheckResult
+from wagtail_unveil.helpers.har_helpers import HarRecorder, get_har_headers
+
+
+def make_response(url, status_code=200, headers=None, elapsed=0.05):
+    """Return a requests response as the session would pass it to the hook."""
+    request = PreparedRequest()
+    request.prepare(method="GET", url=url, headers={"Cookie": "sessionid=secret"})
+    response = Response()
+    response.request = request
+    response.url = url
+    response.status_code = status_code
+    response.reason = "OK" if status_code == 200 else "Found"
+    response.headers.update(headers or {})
+    response.elapsed = timedelta(seconds=elapsed)
+    return response
+
+
+class GetHarHeadersTests(TestCase):
+    def test_credentials_are_redacted(self):
+        """Test that cookies and authorization headers are not written out."""
+        headers = get_har_headers(
+            {"Cookie": "sessionid=secret", "Set-Cookie": "csrftoken=x", "Accept": "*/*"}
+        )
+
+        self.assertEqual(
+            headers,
+            [
+                {"name": "Cookie", "value": "[redacted]"},
+                {"name": "Set-Cookie", "value": "[redacted]"},
+                {"name": "Accept", "value": "*/*"},
+            ],
+        )
+
+
+@patch("wagtail_unveil.helpers.har_helpers.get_connection_timings")
+class HarRecorderTests(TestCase):
+    def test_redirect_entries(self, mock_timings):
+        """Test that redirects and the final response are recorded with their timings."""
+        recorder = HarRecorder()
+        mock_timings.return_value = (1, 0.002, 0.003)
+        recorder.on_response(
+            make_response(
+                "http://example.com/admin/pages/3/",
+                302,
+                {"Location": "/admin/pages/3/edit/", "Content-Length": "0"},
+            )
+        )
+        # The second response reused the connection
+        recorder.on_response(
+            make_response(
+                "http://example.com/admin/pages/3/edit/?tab=content",
+                headers={"Content-Type": "text/html"},
+                elapsed=0.1,
+            )
+        )
+
+        recorder.add(
+            ("Page", "list", "http://example.com/admin/pages/3/"),
+            CheckResult("OK", 200, ttfb=0.16, total=0.2, size=1234),
+        )
+
+        redirect, final = recorder.entries
+        self.assertEqual(redirect["response"]["status"], 302)
+        self.assertEqual(redirect["response"]["redirectURL"], "/admin/pages/3/edit/")
+        self.assertEqual(redirect["timings"]["dns"], 2.0)
+        self.assertEqual(redirect["timings"]["connect"], 3.0)
+        self.assertEqual(redirect["timings"]["wait"], 45.0)
+        self.assertEqual(redirect["request"]["headers"], [{"name": "Cookie", "value": "[redacted]"}])
+        self.assertEqual(final["timings"]["dns"], -1)
+        self.assertEqual(final["timings"]["wait"], 100.0)
+        self.assertEqual(final["timings"]["receive"], 40.0)
+        self.assertEqual(final["time"], 140.0)
+        self.assertEqual(final["response"]["content"], {"size": 1234, "mimeType": "text/html"})
+        self.assertEqual(final["request"]["queryString"], [{"name": "tab", "value": "content"}])
+        self.assertEqual(final["comment"], "Page (list): OK")
+        self.assertEqual(recorder.pending, [])
+
+    def test_failed_request(self, mock_timings):
+        """Test that requests without a response are recorded with status 0."""
+        recorder = HarRecorder()
+
+        recorder.add(
+            ("Page", "edit", "http://example.com/admin/pages/3/edit/"),
+            CheckResult("ERROR (Read timed out.)", total=10),
+        )
+
+        [entry] = recorder.entries
+        self.assertEqual(entry["response"]["status"], 0)
+        self.assertEqual(entry["response"]["statusText"], "ERROR (Read timed out.)")
+        self.assertEqual(entry["time"], 10000)
+
+    def test_write(self, mock_timings):
+        """Test that the log is written as HAR 1.2 JSON."""
+        mock_timings.return_value = (0, None, None)
+        recorder = HarRecorder()
+        recorder.on_response(make_response("http://example.com/"))
+        recorder.add(("Page", "frontend", "http://example.com/"), CheckResult("OK", 200))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "check.har")
+            recorder.write(path)
+            with open(path) as f:
+                har = json.load(f)
+
+        self.assertEqual(har["log"]["version"], "1.2")
+        self.assertEqual(har["log"]["creator"]["name"], "wagtail-unveil")
+        self.assertEqual(len(har["log"]["entries"]), 1)
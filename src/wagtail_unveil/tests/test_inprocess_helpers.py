@@ -0,0 +1,301 @@
+import time
+from django.contrib.auth import get_user_model
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.http import HttpResponse
+from django.test import Client, TestCase, override_settings
+from django.urls import path
+from io import StringIO
+from unittest.mock import Mock
+
+from wagtail_unveil.helpers.base import UrlRecord
+from wagtail_unveil.helpers.inprocess_helpers import (
+    MiddlewareProbe,
+    QueryProbe,
+    QueryRecorder,
+    SqlFingerprintProbe,
+    check_url_in_process,
+    create_inprocess_client,
+    normalize_sql,
+)
+
+def slow_view(request):
+    time.sleep(0.02)
+    return HttpResponse("ok")
+
+
+urlpatterns = [path("slow/", slow_view)]
+
+
+class SlowMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        time.sleep(0.01)
+        return self.get_response(request)
+
+
+class UnusedMiddleware:
+    def __init__(self, get_response):
+        raise MiddlewareNotUsed
+
+
+class PassThroughMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+
+# Admin pages are rendered without collecting static files first
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+
+class CreateInprocessClientTests(TestCase):
+    def setUp(self):
+        self.output = StringIO()
+
+    def test_create_inprocess_client(self):
+        """Test that the client is logged in as the user."""
+        user = get_user_model().objects.create_superuser(
+            username="admin", email="admin@example.com", password="password"
+        )
+
+        client = create_inprocess_client(self.output, "http://example.com", "admin")
+
+        self.assertEqual(int(client.session["_auth_user_id"]), user.pk)
+
+    def test_create_inprocess_client_unknown_user(self):
+        """Test that None is returned when the user does not exist."""
+        client = create_inprocess_client(self.output, "http://example.com", "nobody")
+
+        self.assertIsNone(client)
+        self.assertIn("User nobody does not exist", self.output.getvalue())
+
+
+@override_settings(STORAGES=STORAGES, ALLOWED_HOSTS=["testserver"])
+class CheckUrlInProcessTests(TestCase):
+    def setUp(self):
+        get_user_model().objects.create_superuser(
+            username="admin", email="admin@example.com", password="password"
+        )
+        self.client = create_inprocess_client(StringIO(), "http://testserver", "admin")
+
+    def test_check_url_in_process(self):
+        """Test that the page is rendered and the probe metrics are returned."""
+        record = UrlRecord("Admin dashboard", "admin", "http://testserver/admin/")
+
+        result = check_url_in_process(self.client, record, [QueryProbe()])
+
+        self.assertEqual(result.status, "OK")
+        self.assertEqual(result.status_code, 200)
+        self.assertGreater(result.size, 0)
+        self.assertGreater(result.metrics["queries"], 0)
+        self.assertGreaterEqual(result.metrics["sql_time"], 0)
+        self.assertIn("duplicate_queries", result.metrics)
+
+    def test_check_url_in_process_not_found(self):
+        """Test that failing status codes are labelled."""
+        record = UrlRecord("Page", "edit", "http://testserver/admin/pages/999999/edit/")
+
+        result = check_url_in_process(self.client, record)
+
+        self.assertEqual(result.status, "NOT FOUND")
+        self.assertEqual(result.metrics, {})
+
+    def test_check_url_in_process_exception(self):
+        """Test that errors raised by the client are reported with a truncated message."""
+        client = Mock()
+        client.get.side_effect = ValueError("x" * 100)
+
+        result = check_url_in_process(client, ("Page", "list", "http://testserver/admin/"))
+
+        self.assertEqual(result.status, f"ERROR ({'x' * 47}...)")
+        self.assertIsNone(result.status_code)
+
+
+class QueryRecorderTests(TestCase):
+    def test_duplicate_count(self):
+        """Test that repeated SQL is counted as duplicates whatever the parameters."""
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            for user_id in range(3):
+                list(get_user_model().objects.filter(pk=user_id))
+            get_user_model().objects.count()
+
+        self.assertEqual(recorder.count, 4)
+        self.assertEqual(recorder.duplicate_count, 2)
+        self.assertGreaterEqual(recorder.total_time, 0)
+
+
+class QueryProbeTests(TestCase):
+    def test_measure(self):
+        """Test that the queries run inside measure() are counted."""
+        probe = QueryProbe()
+        with probe.measure(UrlRecord("Page", "list", "http://example.com/")) as metrics:
+            list(get_user_model().objects.all())
+            list(get_user_model().objects.all())
+
+        self.assertEqual(metrics["queries"], 2)
+        self.assertEqual(metrics["duplicate_queries"], 1)
+
+    def test_measure_fingerprints(self):
+        """Test that the fingerprints come from the same recorded queries, each query wrapped once."""
+        probe = QueryProbe()
+        with probe.measure(UrlRecord("Page", "list", "http://example.com/")) as metrics:
+            self.assertEqual(len(connection.execute_wrappers), 1)
+            for user_id in range(3):
+                list(get_user_model().objects.filter(pk=user_id))
+
+        [(calls, total_time)] = metrics["sql_fingerprints"].values()
+        self.assertEqual(calls, 3)
+        self.assertGreaterEqual(total_time, 0)
+
+    def test_fingerprints_capped(self):
+        """Test that only the most costly fingerprints of a URL are stored."""
+        recorder = QueryRecorder()
+        recorder.queries = [("SELECT a", 0.1), ("SELECT b", 0.3), ("SELECT c", 0.2), ("SELECT a", 0.05)]
+
+        self.assertEqual(list(recorder.get_fingerprints(limit=2)), ["SELECT b", "SELECT c"])
+        self.assertEqual(len(recorder.get_fingerprints()), 3)
+
+    def test_report_lines(self):
+        """Test that URLs are reported with the most queries first."""
+        probe = QueryProbe()
+        probe.add(
+            ("Page", "list", "http://example.com/a/"),
+            {"queries": 3, "sql_time": 0.003, "duplicate_queries": 0},
+        )
+        probe.add(
+            ("Page", "edit", "http://example.com/b/"),
+            {"queries": 40, "sql_time": 0.02, "duplicate_queries": 30},
+        )
+        probe.add(("Page", "list", "http://example.com/c/"), None)
+
+        lines = probe.get_report_lines()
+
+        self.assertIn("http://example.com/b/", lines[1])
+        self.assertIn("30", lines[1])
+        self.assertIn("http://example.com/a/", lines[2])
+        self.assertEqual(lines[-1], "Total: 43 queries across 2 URLs, 23.0ms SQL time")
+
+    def test_report_lines_capped(self):
+        """Test that only the URLs with the most queries are listed, the totals cover every URL."""
+        probe = QueryProbe(top_count=2)
+        for queries in (5, 1, 9, 3):
+            probe.add(
+                ("Page", "list", f"http://example.com/{queries}/"),
+                {"queries": queries, "sql_time": 0.001, "duplicate_queries": 0},
+            )
+
+        lines = probe.get_report_lines()
+
+        self.assertEqual(len(lines), 5)
+        self.assertIn("http://example.com/9/", lines[1])
+        self.assertIn("http://example.com/5/", lines[2])
+        self.assertEqual(lines[-1], "Total: 18 queries across 4 URLs, 4.0ms SQL time")
+
+    def test_no_queries(self):
+        """Test the report when no metrics were added."""
+        self.assertEqual(QueryProbe().get_report_lines(), ["No queries recorded"])
+
+
+class NormalizeSqlTests(TestCase):
+    def test_literals_are_stripped(self):
+        """Test that strings, numbers and parameters are replaced."""
+        sql = "SELECT \"t1\".\"id\" FROM t1 WHERE id = %s AND name = 'O''Brien' LIMIT 21"
+
+        self.assertEqual(
+            normalize_sql(sql), 'SELECT "t1"."id" FROM t1 WHERE id = ? AND name = ? LIMIT ?'
+        )
+
+    def test_value_lists_are_collapsed(self):
+        """Test that IN clauses and bulk insert rows of any length share a fingerprint."""
+        self.assertEqual(
+            normalize_sql("SELECT * FROM t WHERE id IN (%s, %s,\n %s)"),
+            normalize_sql("SELECT * FROM t WHERE id IN (%s)"),
+        )
+        self.assertEqual(
+            normalize_sql("INSERT INTO t (a, b) VALUES (%s, %s), (%s, %s)"),
+            "INSERT INTO t (a, b) VALUES (...)",
+        )
+
+
+class SqlFingerprintProbeTests(TestCase):
+    def test_report_lines(self):
+        """Test that fingerprints are aggregated across URLs and sorted."""
+        probe = SqlFingerprintProbe(sort="calls", max_urls=1)
+        probe.add(
+            ("Page", "list", "http://example.com/a/"),
+            {"sql_fingerprints": {"SELECT a": [1, 0.5], "SELECT b": [2, 0.001]}},
+        )
+        probe.add(
+            ("Page", "edit", "http://example.com/b/"),
+            {"sql_fingerprints": {"SELECT b": [3, 0.002]}},
+        )
+        probe.add(("Page", "list", "http://example.com/c/"), {"queries": 0})
+
+        lines = probe.get_report_lines()
+
+        self.assertEqual(lines[0], "2 distinct statements, sorted by calls")
+        self.assertIn("SELECT b", lines[3])
+        self.assertTrue(lines[3].lstrip().startswith("5 "))
+        self.assertEqual(lines[4].strip(), "http://example.com/a/")
+        self.assertEqual(lines[5].strip(), "... and 1 more")
+        self.assertIn("SELECT a", lines[6])
+
+        probe.sort = "time"
+        self.assertIn("SELECT a", probe.get_report_lines()[3])
+
+
+@override_settings(
+    ROOT_URLCONF=__name__,
+    ALLOWED_HOSTS=["testserver"],
+    MIDDLEWARE=[
+        f"{__name__}.PassThroughMiddleware",
+        f"{__name__}.SlowMiddleware",
+        f"{__name__}.UnusedMiddleware",
+    ],
+)
+class MiddlewareProbeTests(TestCase):
+    def test_layers(self):
+        """Test that the middleware in use are timed from the outermost to the view."""
+        probe = MiddlewareProbe(Client())
+
+        self.assertEqual(
+            probe.layers,
+            [f"{__name__}.PassThroughMiddleware", f"{__name__}.SlowMiddleware", "view"],
+        )
+
+    def test_measure(self):
+        """Test that the time of each middleware excludes the layers below it."""
+        client = Client()
+        probe = MiddlewareProbe(client)
+        record = UrlRecord("Page", "list", "http://testserver/slow/")
+
+        result = check_url_in_process(client, record, [probe])
+
+        layer_times = result.metrics["middleware"]
+        self.assertGreaterEqual(layer_times[f"{__name__}.SlowMiddleware"], 0.01)
+        self.assertLess(layer_times[f"{__name__}.SlowMiddleware"], 0.02)
+        self.assertGreaterEqual(layer_times["view"], 0.02)
+        self.assertLess(layer_times[f"{__name__}.PassThroughMiddleware"], 0.01)
+
+    def test_report_lines(self):
+        """Test that layer times are aggregated across URLs."""
+        probe = MiddlewareProbe(Client())
+        slow = f"{__name__}.SlowMiddleware"
+        probe.add(("Page", "list", "http://testserver/a/"), {"middleware": {slow: 0.01, "view": 0.03}})
+        probe.add(("Page", "edit", "http://testserver/b/"), {"middleware": {slow: 0.03, "view": 0.01}})
+        probe.add(("Page", "edit", "http://testserver/c/"), {"queries": 1})
+
+        lines = probe.get_report_lines()
+
+        self.assertEqual(lines[1], f"   20.0ms    30.0ms    30.0ms  50.0%  {slow}")
+        self.assertEqual(lines[2], "   20.0ms    30.0ms    30.0ms  50.0%  view")
+        self.assertEqual(lines[5], "   30.0ms  http://testserver/b/ (edit, Page)")
@@ -0,0 +1,323 @@
+from datetime import timedelta
+from django.test import TestCase
+from django.utils import timezone
+from io import StringIO
+from unittest.mock import patch
+
+from wagtail_unveil.helpers.check_helpers import CheckResult
+from wagtail_unveil.helpers.job_helpers import (
+    checkpoint_job,
+    claim_job,
+    claim_next_job,
+    create_check_job,
+    fail_job,
+    get_job_summary,
+    get_next_leasable_job,
+    get_resumable_job,
+    lease_batch,
+    populate_job,
+    record_worker_failure,
+    run_check_job,
+)
+from wagtail_unveil.helpers.throttle_helpers import DeadlineExceeded
+from wagtail_unveil.models import CheckJob, CheckJobResult
+
+
+class CheckJobTestMixin:
+    def setUp(self):
+        self.output = StringIO()
+        self.urls = [
+            ("Admin dashboard", "admin", "http://example.com/admin/"),
+            ("Page", "edit", "http://example.com/admin/pages/2/edit/"),
+            ("Page", "frontend", "http://example.com/"),
+            ("Image", "list", "http://example.com/admin/images/"),
+        ]
+
+
+class CreateCheckJobTests(CheckJobTestMixin, TestCase):
+    def test_create_check_job_stores_inventory(self):
+        """Test that the URL inventory is stored as pending result rows."""
+        job = create_check_job("http://example.com", 1, self.urls)
+
+        self.assertEqual(job.status, CheckJob.STATUS_PENDING)
+        self.assertEqual(job.total_count, 4)
+        results = list(job.results.order_by("position"))
+        self.assertEqual(
+            [(r.model_name, r.url_type, r.url) for r in results], self.urls
+        )
+        self.assertTrue(all(r.checked_at is None for r in results))
+
+    @patch("wagtail_unveil.helpers.job_helpers.collect_urls")
+    def test_populate_job(self, mock_collect_urls):
+        """Test that a job queued without URLs discovers them once."""
+        mock_collect_urls.return_value = self.urls
+        job = create_check_job("http://example.com", 2)
+
+        populate_job(self.output, job)
+        populate_job(self.output, job)
+
+        mock_collect_urls.assert_called_once_with(self.output, "http://example.com", 2)
+        self.assertEqual(job.results.count(), 4)
+
+
+class RunCheckJobTests(CheckJobTestMixin, TestCase):
+    def test_run_check_job(self):
+        """Test that every URL is checked and the counters are updated."""
+        job = create_check_job("http://example.com", 1, self.urls)
+        claim_job(job)
+
+        def check_func(record):
+            return CheckResult(
+                "NOT FOUND" if "images" in record.url else "OK",
+                total=0.25,
+                size=100,
+                metrics={"queries": 3},
+            )
+
+        run_check_job(job, check_func, batch_size=3)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, CheckJob.STATUS_COMPLETE)
+        self.assertEqual(job.checked_count, 4)
+        self.assertEqual(job.success_count, 3)
+        self.assertEqual(job.failure_count, 1)
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(job.progress, 100.0)
+        result = job.results.get(position=0)
+        self.assertEqual(result.response_time, 0.25)
+        self.assertEqual(result.response_size, 100)
+        self.assertEqual(result.metrics, {"queries": 3})
+
+    def test_interrupted_job_resumes(self):
+        """Test that an interrupted job only checks the URLs that were not checked."""
+        job = create_check_job("http://example.com", 1, self.urls)
+        claim_job(job)
+        checked = []
+
+        def interrupting_check(record):
+            if len(checked) == 2:
+                raise KeyboardInterrupt
+            checked.append(record.url)
+            return CheckResult("OK")
+
+        with self.assertRaises(KeyboardInterrupt):
+            run_check_job(job, interrupting_check, batch_size=2)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, CheckJob.STATUS_INTERRUPTED)
+        self.assertEqual(job.checked_count, 2)
+
+        resumed = []
+        self.assertTrue(claim_job(job))
+        run_check_job(job, lambda record: resumed.append(record) or CheckResult("OK"))
+
+        self.assertEqual(resumed, self.urls[2:])
+        job.refresh_from_db()
+        self.assertEqual(job.checked_count, 4)
+        self.assertEqual(job.status, CheckJob.STATUS_COMPLETE)
+
+
+    def test_deadline_saves_checked_urls(self):
+        """Test that URLs checked before the deadline are saved, mid-batch too."""
+        job = create_check_job("http://example.com", 1, self.urls)
+        claim_job(job)
+        checked = []
+
+        def check_until_deadline(record):
+            if len(checked) == 3:
+                raise DeadlineExceeded("Deadline of 60s reached")
+            checked.append(record.url)
+            return CheckResult("OK")
+
+        with self.assertRaises(DeadlineExceeded):
+            run_check_job(job, check_until_deadline, batch_size=2)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, CheckJob.STATUS_INTERRUPTED)
+        self.assertEqual(job.checked_count, 3)
+        self.assertFalse(job.results.exclude(lease_owner="").exists())
+
+    def test_error_leaves_urls_to_other_workers(self):
+        """Test that an unexpected error releases the worker's leases without failing the job."""
+        job = create_check_job("http://example.com", 1, self.urls)
+        claim_job(job)
+
+        def failing_check(record):
+            raise RuntimeError("Database went away")
+
+        with self.assertRaises(RuntimeError):
+            run_check_job(job, failing_check, batch_size=2)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, CheckJob.STATUS_INTERRUPTED)
+        self.assertEqual(job.worker_failures, 1)
+        self.assertEqual(job.error, "")
+        self.assertFalse(job.results.exclude(lease_owner="").exists())
+
+    def test_error_keeps_job_running_for_other_workers(self):
+        """Test that a job another worker holds leases on stays running after an error."""
+        job = create_check_job("http://example.com", 1, self.urls)
+        claim_job(job)
+        lease_batch(job, "other", batch_size=2)
+
+        record_worker_failure(job, "worker", "RuntimeError: Database went away")
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, CheckJob.STATUS_RUNNING)
+        self.assertEqual(job.results.filter(lease_owner="other").count(), 2)
+
+    def test_repeated_errors_fail_job(self):
+        """Test that a job is failed after worker errors in a row, and a checkpoint resets them."""
+        job = create_check_job("http://example.com", 1, self.urls)
+        claim_job(job)
+
+        self.assertFalse(record_worker_failure(job, "worker", "RuntimeError: boom", max_failures=2))
+        checked = lease_batch(job, "worker", batch_size=1)
+        checked[0].status = "OK"
+        checked[0].checked_at = timezone.now()
+        checkpoint_job(job, checked, "worker")
+        self.assertEqual(job.worker_failures, 0)
+        self.assertFalse(record_worker_failure(job, "worker", "RuntimeError: boom", max_failures=2))
+        self.assertTrue(record_worker_failure(job, "worker", "RuntimeError: boom", max_failures=2))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, CheckJob.STATUS_FAILED)
+        self.assertEqual(job.error, "RuntimeError: boom (2 worker errors in a row)")
+
+class ClaimJobTests(CheckJobTestMixin, TestCase):
+    def test_running_job_cannot_be_claimed(self):
+        """Test that a job with a recent checkpoint is not claimed twice."""
+        job = create_check_job("http://example.com", 1, self.urls)
+
+        self.assertTrue(claim_job(job))
+        self.assertFalse(claim_job(job))
+        self.assertTrue(claim_job(job, force=True))
+
+    def test_stale_job_can_be_claimed(self):
+        """Test that a running job without recent checkpoints can be taken over."""
+        job = create_check_job("http://example.com", 1, self.urls)
+        claim_job(job)
+        CheckJob.objects.filter(pk=job.pk).update(
+            heartbeat_at=timezone.now() - timedelta(seconds=600)
+        )
+
+        self.assertTrue(claim_job(job, stale_after=300))
+
+    def test_finished_job_cannot_be_claimed(self):
+        """Test that finished jobs are never claimed."""
+        job = create_check_job("http://example.com", 1, self.urls)
+        fail_job(job, "Failed to authenticate")
+
+        self.assertFalse(claim_job(job, force=True))
+
+    def test_claim_next_job(self):
+        """Test that the oldest claimable job is claimed first."""
+        first = create_check_job("http://example.com", 1, self.urls)
+        create_check_job("http://example.com", 1, self.urls)
+
+        self.assertEqual(claim_next_job(), first)
+        first.refresh_from_db()
+        self.assertEqual(first.status, CheckJob.STATUS_RUNNING)
+
+    def test_get_resumable_job(self):
+        """Test that the latest unfinished job for the base URL is returned."""
+        finished = create_check_job("http://example.com", 1, self.urls)
+        fail_job(finished, "error")
+        self.assertIsNone(get_resumable_job("http://example.com"))
+
+        unfinished = create_check_job("http://example.com", 1, self.urls)
+        self.assertEqual(get_resumable_job("http://example.com"), unfinished)
+        self.assertIsNone(get_resumable_job("http://other.example.com"))
+
+    def test_get_resumable_job_since(self):
+        """Test that jobs are only resumed by runs with the same --since cutoff."""
+        since = timezone.now() - timedelta(days=1)
+        full = create_check_job("http://example.com", 1, self.urls)
+
+        self.assertIsNone(get_resumable_job("http://example.com", since=since))
+        changed = create_check_job("http://example.com", 0, self.urls, since=since)
+        self.assertEqual(get_resumable_job("http://example.com", since=since), changed)
+        self.assertEqual(get_resumable_job("http://example.com"), full)
+
+
+class LeaseTests(CheckJobTestMixin, TestCase):
+    def test_workers_lease_disjoint_batches(self):
+        """Test that a URL leased by one worker is not leased by another."""
+        job = create_check_job("http://example.com", 1, self.urls)
+
+        first = lease_batch(job, "worker-1", batch_size=3)
+        second = lease_batch(job, "worker-2", batch_size=3)
+
+        self.assertEqual([result.position for result in first], [0, 1, 2])
+        self.assertEqual([result.position for result in second], [3])
+        self.assertEqual(lease_batch(job, "worker-3"), [])
+
+    def test_expired_lease_is_taken_over(self):
+        """Test that a worker's expired batch is checked by another worker only once."""
+        job = create_check_job("http://example.com", 1, self.urls)
+        stalled = lease_batch(job, "worker-1", batch_size=2)
+        job.results.filter(lease_owner="worker-1").update(
+            lease_expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        run_check_job(job, lambda record: CheckResult("OK"), worker_id="worker-2")
+
+        # The stalled worker finishing late doesn't count its URLs again
+        for result in stalled:
+            result.status = "OK"
+            result.checked_at = timezone.now()
+        checkpoint_job(job, stalled, "worker-1")
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, CheckJob.STATUS_COMPLETE)
+        self.assertEqual(job.checked_count, 4)
+        self.assertFalse(CheckJobResult.objects.exclude(lease_owner="").exists())
+
+    def test_interrupt_with_other_workers(self):
+        """Test that a job other workers are checking stays running when one is interrupted."""
+        job = create_check_job("http://example.com", 1, self.urls)
+        claim_job(job)
+        lease_batch(job, "worker-1", batch_size=1)
+
+        def interrupting_check(record):
+            raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            run_check_job(job, interrupting_check, worker_id="worker-2")
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, CheckJob.STATUS_RUNNING)
+        self.assertEqual(job.results.filter(lease_owner="worker-2").count(), 0)
+
+    def test_get_next_leasable_job(self):
+        """Test that fully leased jobs are skipped and fully checked jobs are completed."""
+        checked = create_check_job("http://example.com", 1, self.urls[:1])
+        checked.results.update(status="OK", checked_at=timezone.now())
+        leased = create_check_job("http://example.com", 1, self.urls)
+        lease_batch(leased, "worker-1")
+        waiting = create_check_job("http://example.com", 1, self.urls)
+
+        self.assertEqual(get_next_leasable_job(), waiting)
+        checked.refresh_from_db()
+        self.assertEqual(checked.status, CheckJob.STATUS_COMPLETE)
+
+
+class GetJobSummaryTests(CheckJobTestMixin, TestCase):
+    def test_get_job_summary(self):
+        """Test that the summary includes the counters and failed URLs."""
+        job = create_check_job("http://example.com", 1, self.urls)
+        claim_job(job)
+        run_check_job(
+            job,
+            lambda record: CheckResult("NOT FOUND" if "pages" in record.url else "OK"),
+        )
+
+        summary = get_job_summary(job)
+
+        self.assertEqual(summary["id"], job.pk)
+        self.assertEqual(summary["status"], CheckJob.STATUS_COMPLETE)
+        self.assertEqual(summary["checked"], 4)
+        self.assertEqual(
+            summary["failures"],
+            [{"url": "http://example.com/admin/pages/2/edit/", "status": "NOT FOUND"}],
+        )
@@ -0,0 +1,30 @@
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from io import StringIO
+
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "shared": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+}
+
+
+@override_settings(CACHES=CACHES)
+class ClearCacheOptionTests(TestCase):
+    def call(self, *args):
+        call_command("list_admin_urls", "--check", "--cold-warm", *args, stdout=StringIO())
+
+    def test_http_check_needs_shared_aliases(self):
+        """Test that HTTP checks refuse a bare --clear-cache, it can't reach the server's own caches."""
+        with self.assertRaisesMessage(CommandError, "needs the aliases of the caches shared with the server"):
+            self.call("--clear-cache", "--base-url", "http://localhost:8000")
+
+    def test_http_check_of_remote_server_refused(self):
+        """Test that shared caches aren't cleared for a server that isn't on this machine."""
+        with self.assertRaisesMessage(CommandError, "can't be used to check https://www.example.com"):
+            self.call("--clear-cache", "shared", "--base-url", "https://www.example.com")
+
+    def test_unknown_alias_refused(self):
+        """Test that cache aliases must be configured."""
+        with self.assertRaisesMessage(CommandError, "there is no cache named 'missing'"):
+            self.call("--clear-cache", "missing", "--base-url", "http://localhost:8000")
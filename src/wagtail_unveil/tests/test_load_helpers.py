@@ -0,0 +1,185 @@
+import random
+from django.test import TestCase
+from unittest.mock import Mock
+
+from wagtail_unveil.helpers.check_helpers import CheckResult
+from wagtail_unveil.helpers.load_helpers import (
+    LoadStats,
+    ScalingSummary,
+    UrlMix,
+    parse_levels,
+    parse_weights,
+    run_load,
+)
+
+
+class ParseWeightsTests(TestCase):
+    def test_parse_weights(self):
+        """Test that type=weight pairs are parsed."""
+        self.assertEqual(
+            parse_weights("frontend=10, list=2.5,edit=0"),
+            {"frontend": 10.0, "list": 2.5, "edit": 0.0},
+        )
+
+    def test_invalid_weights(self):
+        """Test that malformed mixes are rejected."""
+        for value in ("frontend", "=3", "list=many", "list=-1"):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    parse_weights(value)
+
+
+class UrlMixTests(TestCase):
+    def setUp(self):
+        self.urls = [
+            ("Page", "frontend", "http://example.com/"),
+            ("Page", "edit", "http://example.com/admin/pages/3/edit/"),
+            ("Image", "list", "http://example.com/admin/images/"),
+            ("Document", "list", "http://example.com/admin/documents/", "OK"),
+        ]
+
+    def test_choose_weighted(self):
+        """Test that only URL types with a weight are picked."""
+        mix = UrlMix(self.urls, {"list": 1, "edit": 0})
+        rng = random.Random(1)
+
+        url_types = {mix.choose(rng).url_type for _ in range(50)}
+
+        self.assertEqual(url_types, {"list"})
+
+    def test_choose_is_repeatable(self):
+        """Test that the same seed picks the same URLs."""
+        mix = UrlMix(self.urls)
+
+        first = [mix.choose(random.Random(5)) for _ in range(10)]
+        second = [mix.choose(random.Random(5)) for _ in range(10)]
+
+        self.assertEqual(first, second)
+
+    def test_no_matching_urls(self):
+        """Test that a mix without any URL to request is rejected."""
+        with self.assertRaises(ValueError):
+            UrlMix(self.urls, {"delete": 1})
+        with self.assertRaises(ValueError):
+            UrlMix([])
+
+
+class LoadStatsTests(TestCase):
+    def test_merge_and_report(self):
+        """Test that worker stats are merged and reported per URL type."""
+        first = LoadStats()
+        first.add("list", CheckResult("OK", total=0.02))
+        first.add("list", CheckResult("OK", total=0.2))
+        second = LoadStats()
+        second.add("edit", CheckResult("SERVER ERROR (500)", total=0.003))
+        second.add("edit", CheckResult("ERROR (timeout)"))
+
+        stats = LoadStats()
+        stats.merge(first)
+        stats.merge(second)
+        lines = stats.get_report_lines(elapsed=2.0, concurrency=2)
+
+        self.assertEqual(stats.total_requests, 4)
+        self.assertEqual(stats.total_errors, 2)
+        self.assertEqual(lines[0], "4 requests in 2.0s with 2 concurrent clients")
+        self.assertEqual(lines[1], "Throughput: 2.0 requests/s")
+        self.assertEqual(lines[2], "Errors: 2 (50.0%)")
+        self.assertTrue(lines[6].startswith(f"{'edit':<20}         2      1.0  100.0%"))
+        self.assertTrue(lines[7].startswith(f"{'list':<20}         2      1.0    0.0%"))
+        self.assertIn("       1  SERVER ERROR (500)", lines)
+
+    def test_histogram(self):
+        """Test that response times are counted in their bucket."""
+        stats = LoadStats()
+        for total in (0.001, 0.004, 0.3, 20):
+            stats.add("list", CheckResult("OK", total=total))
+
+        histogram = dict(stats.get_histogram())
+
+        self.assertEqual(histogram[0.005], 2)
+        self.assertEqual(histogram[0.5], 1)
+        self.assertEqual(histogram[None], 1)
+        self.assertEqual(sum(histogram.values()), 4)
+
+    def test_no_requests(self):
+        """Test the report when no requests were made."""
+        self.assertEqual(LoadStats().get_report_lines(1.0, 1), ["No requests made"])
+
+
+class RunLoadTests(TestCase):
+    def test_run_load(self):
+        """Test that every worker requests URLs until the duration is over."""
+        mix = UrlMix([("Page", "frontend", "http://example.com/")])
+        check_funcs = [Mock(return_value=CheckResult("OK", total=0.001)) for _ in range(3)]
+
+        stats, elapsed = run_load(check_funcs, mix, duration=0.05, seed=1)
+
+        self.assertGreaterEqual(elapsed, 0.05)
+        for check_func in check_funcs:
+            self.assertTrue(check_func.called)
+        self.assertEqual(
+            stats.total_requests, sum(check_func.call_count for check_func in check_funcs)
+        )
+        self.assertEqual(stats.total_errors, 0)
+
+    def test_failing_worker_stops_run(self):
+        """Test that a failing worker stops the others and the failure is raised."""
+        mix = UrlMix([("Page", "frontend", "http://example.com/")])
+        check_funcs = [Mock(return_value=CheckResult("OK", total=0.001)) for _ in range(3)]
+        check_funcs[1].side_effect = ConnectionResetError("reset by peer")
+
+        with self.assertRaisesMessage(RuntimeError, "Load test worker 1 failed"):
+            run_load(check_funcs, mix, duration=5, seed=1)
+
+
+class ParseLevelsTests(TestCase):
+    def test_parse_levels(self):
+        """Test that levels are sorted and deduplicated."""
+        self.assertEqual(parse_levels("4, 1,2,4"), [1, 2, 4])
+
+    def test_invalid_levels(self):
+        """Test that levels must be positive numbers."""
+        for value in ("1,two", "0", "1,-2"):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    parse_levels(value)
+
+
+class ScalingSummaryTests(TestCase):
+    def get_stats(self, requests, latency, url_type="list"):
+        stats = LoadStats()
+        for _ in range(requests):
+            stats.add(url_type, CheckResult("OK", total=latency))
+        return stats
+
+    def test_efficiency_and_saturation(self):
+        """Test that efficiency is relative to the first level and saturation is found."""
+        summary = ScalingSummary()
+        summary.add(4, self.get_stats(300, 0.04), 1.0)
+        summary.add(1, self.get_stats(100, 0.01), 1.0)
+        summary.add(2, self.get_stats(190, 0.01), 1.0)
+        summary.add(8, self.get_stats(310, 0.1), 1.0)
+
+        self.assertEqual([run[0] for run in summary.runs], [1, 2, 4, 8])
+        self.assertAlmostEqual(summary.get_efficiency(summary.runs[1]), 0.95)
+        self.assertEqual(summary.get_saturation_point(), 4)
+
+        lines = summary.get_report_lines()
+        self.assertEqual(
+            lines[1], "      1       100    100.0    0.0%     10.0ms     10.0ms       100%"
+        )
+        self.assertIn("Saturation point: 4 clients", lines[6])
+        self.assertEqual(lines[-1].split()[-1], "10.0x")
+
+    def test_not_saturated(self):
+        """Test the report when throughput kept growing."""
+        summary = ScalingSummary()
+        summary.add(1, self.get_stats(100, 0.01), 1.0)
+        summary.add(2, self.get_stats(200, 0.01), 1.0)
+
+        self.assertIsNone(summary.get_saturation_point())
+        self.assertIn("Throughput kept growing up to 2 clients", summary.get_report_lines())
+
+    def test_no_runs(self):
+        """Test the report without any runs."""
+        self.assertEqual(ScalingSummary().get_report_lines(), ["No load test runs"])
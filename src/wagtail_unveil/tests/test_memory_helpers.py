@@ -0,0 +1,153 @@
+import gc
+from django.http import HttpResponse
+from django.test import Client, TestCase, override_settings
+from django.urls import path
+
+from wagtail_unveil.helpers.base import UrlRecord
+from wagtail_unveil.helpers.memory_helpers import (
+    GcProbe,
+    MemoryGrowth,
+    MemoryGrowthSummary,
+    format_growth,
+    get_rss,
+    is_growing,
+    measure_memory_growth,
+)
+
+retained = []
+
+
+def leaky_view(request):
+    retained.append(bytearray(64 * 1024))
+    return HttpResponse("ok")
+
+
+def stable_view(request):
+    bytearray(64 * 1024)
+    return HttpResponse("ok")
+
+
+urlpatterns = [path("leaky/", leaky_view), path("stable/", stable_view)]
+
+
+@override_settings(ROOT_URLCONF=__name__, ALLOWED_HOSTS=["testserver"], MIDDLEWARE=[])
+class MeasureMemoryGrowthTests(TestCase):
+    def tearDown(self):
+        retained.clear()
+
+    def test_leaking_url_is_growing(self):
+        """Test that a view retaining memory on every render is flagged."""
+        growth = measure_memory_growth(
+            Client(), ("Page", "list", "http://testserver/leaky/"), repeats=3
+        )
+
+        self.assertEqual(len(growth.traced), 4)
+        self.assertEqual(len(growth.rss), 4)
+        self.assertTrue(is_growing(growth))
+        location, size_diff, count_diff = growth.sites[0]
+        self.assertTrue(location.startswith(__file__))
+        self.assertGreaterEqual(size_diff, 3 * 64 * 1024)
+
+    def test_stable_url_is_not_growing(self):
+        """Test that a view freeing its memory is not flagged."""
+        growth = measure_memory_growth(
+            Client(), ("Page", "list", "http://testserver/stable/"), repeats=3
+        )
+
+        self.assertFalse(is_growing(growth))
+
+
+class IsGrowingTests(TestCase):
+    def get_growth(self, traced):
+        return MemoryGrowth(UrlRecord("Page", "list", "http://example.com/"), traced, [None] * len(traced), [])
+
+    def test_growth_after_every_repeat(self):
+        """Test that growth above the threshold after every repeat is flagged."""
+        self.assertTrue(is_growing(self.get_growth([0, 10000, 20000, 30000]), min_growth=8192))
+
+    def test_growth_that_stops(self):
+        """Test that memory which stops growing is not flagged."""
+        self.assertFalse(is_growing(self.get_growth([0, 30000, 30000, 30000]), min_growth=8192))
+
+    def test_small_growth(self):
+        """Test that growth below the threshold is not flagged."""
+        self.assertFalse(is_growing(self.get_growth([0, 100, 200, 300]), min_growth=8192))
+
+
+class MemoryGrowthSummaryTests(TestCase):
+    def test_report_lines(self):
+        """Test that growing URLs are reported first with their allocation sites."""
+        summary = MemoryGrowthSummary(repeats=2, min_growth=1024)
+        summary.add(
+            MemoryGrowth(
+                UrlRecord("Page", "list", "http://example.com/stable/"),
+                [1000, 500, 700],
+                [4096, 4096, 4096],
+                [],
+            )
+        )
+        summary.add(
+            MemoryGrowth(
+                UrlRecord("Page", "edit", "http://example.com/leaky/"),
+                [1000, 3048, 5096],
+                [4096, 8192, 8192],
+                [("views.py:12", 4096, 2)],
+            )
+        )
+
+        lines = summary.get_report_lines()
+
+        self.assertEqual(lines[1], "1 of 2 URLs kept growing")
+        self.assertEqual(lines[4], "   +4.0KB    +4.0KB  http://example.com/leaky/ (edit, Page)  [GROWING]")
+        self.assertEqual(lines[5].strip(), "+4.0KB (+2 blocks)  views.py:12")
+        self.assertEqual(lines[6], "    -300B       +0B  http://example.com/stable/ (list, Page)")
+
+    def test_format_growth(self):
+        """Test that changes are formatted with their sign."""
+        self.assertEqual(format_growth(2048), "+2.0KB")
+        self.assertEqual(format_growth(-10), "-10B")
+        self.assertEqual(format_growth(None), "-")
+
+    def test_get_rss(self):
+        """Test that the RSS of the process is returned when it can be measured."""
+        rss = get_rss()
+        if rss is not None:
+            self.assertGreater(rss, 0)
+
+
+class GcProbeTests(TestCase):
+    def test_measure(self):
+        """Test that collections made while a URL is rendered are recorded."""
+        probe = GcProbe()
+        callbacks = len(gc.callbacks)
+        with probe.measure(UrlRecord("Page", "list", "http://example.com/")) as metrics:
+            gc.collect(0)
+            gc.collect(2)
+
+        self.assertEqual(metrics["gc_collections"][0], 1)
+        self.assertEqual(metrics["gc_collections"][2], 1)
+        self.assertGreater(metrics["gc_pause"], 0)
+        self.assertGreater(metrics["gc_gen2_pause"], 0)
+        self.assertLessEqual(metrics["gc_gen2_pause"], metrics["gc_pause"])
+        self.assertIn("allocated_blocks", metrics)
+        self.assertEqual(len(gc.callbacks), callbacks)
+
+    def test_report_lines(self):
+        """Test that URLs triggering generation 2 collections are listed."""
+        probe = GcProbe()
+        probe.add(
+            ("Page", "list", "http://example.com/a/"),
+            {"gc_collections": [3, 1, 1], "gc_collected": 10, "gc_pause": 0.05, "gc_gen2_pause": 0.04, "allocated_blocks": 120},
+        )
+        probe.add(
+            ("Page", "edit", "http://example.com/b/"),
+            {"gc_collections": [2, 0, 0], "gc_collected": 0, "gc_pause": 0.001, "gc_gen2_pause": 0.0, "allocated_blocks": -5},
+        )
+        probe.add(("Page", "edit", "http://example.com/c/"), {"queries": 1})
+
+        lines = probe.get_report_lines()
+
+        self.assertEqual(lines[0], "Collections: gen0 5, gen1 1, gen2 1; 51.0ms total pause")
+        self.assertEqual(lines[2], "1 URLs triggered generation 2 collections")
+        self.assertEqual(lines[4], "    1    40.0ms     +120  http://example.com/a/ (list, Page)")
+        self.assertEqual(lines[-1], "    1.0ms           2       -5  http://example.com/b/ (edit, Page)")
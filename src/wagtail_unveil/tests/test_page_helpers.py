@@ -5,6 +5,7 @@ from unittest.mock import Mock, patch
 
 
 from wagtail_unveil.helpers.page_helpers import (
+    get_default_base_url,
     get_page_models,
     get_page_urls,
     get_site_urls,
@@ -142,6 +143,20 @@ class GetPageUrlsTests(TestCase):
         self.assertIn("Note: app1.model1 has no instances", self.output.getvalue())
         self.assertIn("Note: app2.model2 has no instances", self.output.getvalue())
         
+    @patch('wagtail_unveil.helpers.page_helpers.get_page_models')
+    @patch('wagtail_unveil.helpers.page_helpers.model_has_instances')
+    @patch('wagtail_unveil.helpers.page_helpers.get_instance_sample')
+    def test_get_page_urls_without_sampled_instances(self, mock_get_instance_sample, mock_model_has_instances, mock_get_page_models):
+        """Test that the list URL is kept when no instance changed since the cutoff or the sample query failed."""
+        mock_get_page_models.return_value = [self.mock_model1]
+        mock_model_has_instances.return_value = True
+        mock_get_instance_sample.return_value = []
+
+        result = get_page_urls(self.output, self.base_url, self.max_instances)
+
+        self.assertEqual(result, [("app1.model1", "list", "http://testserver/admin/pages/")])
+        self.assertNotIn("has no instances", self.output.getvalue())
+
     @patch('wagtail_unveil.helpers.page_helpers.get_page_models')
     @patch('wagtail_unveil.helpers.page_helpers.model_has_instances')
     @patch('wagtail_unveil.helpers.page_helpers.get_instance_sample')
@@ -290,4 +305,34 @@ class GetSiteUrlsTests(TestCase):
         
         # Check that we have a search URL with the fallback search term 'page'
         result_search_url = "http://testserver/admin/pages/search/?q=page"
-        self.assertTrue(any(url[2] == result_search_url for url in result))
\ No newline at end of file
+        self.assertTrue(any(url[2] == result_search_url for url in result))
+
+class GetDefaultBaseUrlTests(TestCase):
+    def setUp(self):
+        self.output = StringIO()
+
+    @patch('wagtail_unveil.helpers.page_helpers.Site')
+    def test_default_site(self, mock_site):
+        """Test that the base URL is built from the default site."""
+        mock_site.objects.filter.return_value.first.return_value = Mock(
+            hostname="example.com", port=8080
+        )
+
+        self.assertEqual(get_default_base_url(self.output), "http://example.com:8080")
+
+    @patch('wagtail_unveil.helpers.page_helpers.Site')
+    def test_default_site_https(self, mock_site):
+        """Test that sites on port 443 use https without a port."""
+        mock_site.objects.filter.return_value.first.return_value = Mock(
+            hostname="example.com", port=443
+        )
+
+        self.assertEqual(get_default_base_url(self.output), "https://example.com")
+
+    @patch('wagtail_unveil.helpers.page_helpers.Site')
+    def test_no_default_site(self, mock_site):
+        """Test the fallback URL when there is no default site."""
+        mock_site.objects.filter.return_value.first.return_value = None
+
+        self.assertEqual(get_default_base_url(self.output), "http://localhost:8000")
+        self.assertIn("No default site found", self.output.getvalue())
@@ -0,0 +1,102 @@
+import threading
+from django.test import TestCase
+
+from wagtail_unveil.helpers.base import UrlRecord
+from wagtail_unveil.helpers.check_helpers import CheckResult
+from wagtail_unveil.helpers.pipeline_helpers import check_records
+
+
+def make_records(count):
+    return [("Page", "edit", f"http://example.com/admin/pages/{index}/edit/") for index in range(count)]
+
+
+class CheckRecordsTests(TestCase):
+    def test_results_in_discovery_order(self):
+        """Test that a single checking thread yields the results in discovery order."""
+        records = make_records(5)
+
+        results = list(check_records(iter(records), [lambda record: CheckResult("OK", 200)]))
+
+        self.assertEqual([record for record, result in results], [UrlRecord(*url) for url in records])
+        self.assertTrue(all(result.status == "OK" for record, result in results))
+
+    def test_checking_starts_before_discovery_finishes(self):
+        """Test that the first URL is checked while discovery is still running."""
+        discovered = []
+        first_checked = threading.Event()
+
+        def discover():
+            for url in make_records(3):
+                discovered.append(url)
+                yield url
+                # The rest is only discovered once the first URL has been checked
+                first_checked.wait(timeout=5)
+
+        def check(record):
+            first_checked.set()
+            return CheckResult("OK", 200, metrics={"discovered": len(discovered)})
+
+        results = list(check_records(discover(), [check]))
+
+        self.assertEqual(results[0][1].metrics, {"discovered": 1})
+        self.assertEqual(len(results), 3)
+
+    def test_not_pipelined(self):
+        """Test that without pipelining every URL is discovered before the first is checked."""
+        discovered = []
+
+        def discover():
+            for url in make_records(3):
+                discovered.append(url)
+                yield url
+
+        def check(record):
+            return CheckResult("OK", 200, metrics={"discovered": len(discovered)})
+
+        results = list(check_records(discover(), [check], pipelined=False))
+
+        self.assertEqual([result.metrics for record, result in results], [{"discovered": 3}] * 3)
+
+    def test_bounded_queue(self):
+        """Test that discovery waits for the checks once the queue is full."""
+        discovered = []
+
+        def discover():
+            for url in make_records(50):
+                discovered.append(url)
+                yield url
+
+        results = check_records(discover(), [lambda record: CheckResult("OK", 200)], queue_size=2)
+        next(results)
+
+        # One URL was checked, a few more wait in the queues and the rest isn't discovered yet
+        self.assertLess(len(discovered), 10)
+        self.assertEqual(len(list(results)), 49)
+
+    def test_concurrent_checks(self):
+        """Test that every URL is checked once across several threads."""
+        threads = set()
+
+        def check(record):
+            threads.add(threading.get_ident())
+            return CheckResult("OK", 200)
+
+        results = list(check_records(make_records(20), [check, check, check]))
+
+        self.assertEqual(sorted(record.url for record, result in results), sorted(url for _, _, url in make_records(20)))
+        self.assertLessEqual(len(threads), 3)
+
+    def test_errors_are_raised(self):
+        """Test that an error while discovering or checking is raised to the caller."""
+        def discover():
+            yield make_records(1)[0]
+            raise ValueError("Discovery failed")
+
+        with self.assertRaises(ValueError):
+            list(check_records(discover(), [lambda record: CheckResult("OK", 200)]))
+
+        def check(record):
+            raise RuntimeError("Check failed")
+
+        with self.assertRaises(RuntimeError):
+            list(check_records(make_records(3), [check]))
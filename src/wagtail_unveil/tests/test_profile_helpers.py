@@ -0,0 +1,137 @@
+import cProfile
+import os
+import pstats
+import tempfile
+import time
+from django.test import TestCase
+
+from wagtail_unveil.helpers.base import UrlRecord
+from wagtail_unveil.helpers.profile_helpers import (
+    ProfileProbe,
+    SamplingProbe,
+    get_collapsed_stacks,
+    get_function_label,
+)
+
+
+def inner():
+    time.sleep(0.002)
+    return sum(range(1000))
+
+
+def outer():
+    return inner() + inner()
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class GetFunctionLabelTests(TestCase):
+    def test_python_function(self):
+        """Test that Python functions are labelled with their file and line."""
+        self.assertEqual(
+            get_function_label(("/src/app/views.py", 12, "edit")), "edit (views.py:12)"
+        )
+
+    def test_builtin_function(self):
+        """Test that built-in functions are labelled with their name only."""
+        self.assertEqual(
+            get_function_label(("~", 0, "<built-in method time.sleep>")),
+            "<built-in method time.sleep>",
+        )
+
+
+class GetCollapsedStacksTests(TestCase):
+    def test_collapsed_stacks(self):
+        """Test that stacks are rebuilt from the caller and callee pairs."""
+        profiler = cProfile.Profile()
+        profiler.runcall(outer)
+
+        lines = get_collapsed_stacks(pstats.Stats(profiler))
+
+        stacks = dict(line.rsplit(" ", 1) for line in lines)
+        sleep_stack = next(stack for stack in stacks if stack.endswith("time.sleep>"))
+        frames = sleep_stack.split(";")
+        self.assertTrue(frames[-3].startswith("outer (test_profile_helpers.py"))
+        self.assertTrue(frames[-2].startswith("inner (test_profile_helpers.py"))
+        # Both sleeps are merged into the same stack
+        self.assertGreaterEqual(int(stacks[sleep_stack]), 4000)
+
+
+class ProfileProbeTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_profiles_are_saved(self):
+        """Test that a .pstats and collapsed stacks file is written per URL."""
+        probe = ProfileProbe(self.directory.name)
+        record = UrlRecord("home.HomePage (Home)", "edit", "http://example.com/admin/pages/3/edit/")
+
+        for _ in range(2):
+            with probe.measure(record):
+                outer()
+
+        self.assertEqual(
+            sorted(os.listdir(self.directory.name)),
+            [
+                "homehomepage--edit--2.pstats",
+                "homehomepage--edit--2.txt",
+                "homehomepage--edit.pstats",
+                "homehomepage--edit.txt",
+            ],
+        )
+        self.assertEqual(len(probe.get_report_lines()), 3)
+
+    def test_top_keeps_slowest(self):
+        """Test that only the profiles of the slowest requests are kept."""
+        probe = ProfileProbe(self.directory.name, top=1)
+
+        with probe.measure(("Page", "list", "http://example.com/slow/")):
+            time.sleep(0.02)
+        with probe.measure(("Page", "edit", "http://example.com/fast/")):
+            pass
+        with probe.measure(("Page", "delete", "http://example.com/slower/")):
+            time.sleep(0.04)
+
+        self.assertEqual(
+            sorted(os.listdir(self.directory.name)),
+            ["page--delete.pstats", "page--delete.txt"],
+        )
+        self.assertIn("http://example.com/slower/", probe.get_report_lines()[1])
+
+
+class SamplingProbeTests(TestCase):
+    def test_samples_are_attributed_to_url(self):
+        """Test that samples taken while a URL is rendered are counted for its URL type."""
+        probe = SamplingProbe(interval=0.001)
+        record = UrlRecord("Page", "edit", "http://example.com/admin/pages/3/edit/")
+
+        with probe.measure(record):
+            busy(0.1)
+
+        self.assertGreater(probe.type_samples["edit"], 0)
+        self.assertEqual(probe.url_samples[record], probe.type_samples["edit"])
+        hot_function, _ = probe.self_samples["edit"].most_common(1)[0]
+        self.assertTrue(hot_function.startswith("busy (test_profile_helpers.py"))
+
+    def test_report_lines(self):
+        """Test that hot functions are reported per URL type."""
+        probe = SamplingProbe()
+        probe.self_samples["list"].update({"render (base.py:1)": 3, "execute (base.py:2)": 1})
+        probe.total_samples["list"].update({"render (base.py:1)": 4, "execute (base.py:2)": 1})
+        probe.type_samples["list"] = 4
+        probe.url_samples[UrlRecord("Page", "list", "http://example.com/")] = 4
+
+        lines = probe.get_report_lines()
+
+        self.assertEqual(lines[2], "list (4 samples)")
+        self.assertEqual(lines[4], "  75.0%  100.0%  render (base.py:1)")
+        self.assertEqual(lines[-1], "      4  http://example.com/ (list, Page)")
+
+    def test_no_samples(self):
+        """Test the report when no samples were taken."""
+        self.assertEqual(SamplingProbe().get_report_lines(), ["No samples taken"])
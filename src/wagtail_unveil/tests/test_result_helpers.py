@@ -0,0 +1,95 @@
+import json
+import os
+import tempfile
+from django.test import TestCase
+
+from wagtail_unveil.helpers.base import UrlRecord
+from wagtail_unveil.helpers.check_helpers import CheckResult
+from wagtail_unveil.helpers.result_helpers import (
+    ResultsWriter,
+    get_check_result,
+    merge_results,
+    read_results,
+    write_results,
+)
+
+
+class ResultsFileTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "results.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_write_and_read(self):
+        """Test that written results are read back as the same records and results."""
+        record = UrlRecord("Page", "edit", "http://example.com/admin/pages/3/edit/")
+        result = CheckResult("OK", 200, ttfb=0.02, total=0.03, size=512, metrics={"queries": 4})
+
+        write_results(self.path, "http://example.com", [(record, result)], shard=(2, 4))
+        data = read_results(self.path)
+
+        self.assertEqual(data["shard"], "2/4")
+        self.assertEqual(data["base_url"], "http://example.com")
+        self.assertEqual(get_check_result(data["results"][0]), (record, result))
+
+    def test_write_rows_as_they_are_added(self):
+        """Test that the writer streams rows and leaves a valid file, also without results."""
+        writer = ResultsWriter(self.path, "http://example.com")
+        writer.close()
+        self.assertEqual(read_results(self.path)["results"], [])
+
+        writer = ResultsWriter(self.path, "http://example.com")
+        for index in range(3):
+            writer.add(("Page", "edit", f"http://example.com/admin/pages/{index}/edit/"), CheckResult("OK", 200))
+        writer.close()
+        # Closing again, as the command does when it stops, leaves the file as it is
+        writer.close()
+
+        data = read_results(self.path)
+        self.assertEqual(writer.count, 3)
+        self.assertIsNone(data["shard"])
+        self.assertEqual([row["url"][-8:] for row in data["results"]], ["/0/edit/", "/1/edit/", "/2/edit/"])
+
+    def test_read_invalid_file(self):
+        """Test that files that aren't results files are rejected."""
+        with self.assertRaises(ValueError):
+            read_results(self.path)
+        with open(self.path, "w") as f:
+            json.dump({"urls": []}, f)
+        with self.assertRaises(ValueError):
+            read_results(self.path)
+
+
+class MergeResultsTests(TestCase):
+    def get_file(self, shard, urls):
+        return {
+            "version": 1,
+            "shard": shard,
+            "results": [
+                {"model_name": "Page", "url_type": "edit", "url": url, "status": "OK"}
+                for url in urls
+            ],
+        }
+
+    def test_merge_shards(self):
+        """Test that shards are combined and missing shards are listed."""
+        rows, duplicate_count, missing_shards = merge_results(
+            [
+                self.get_file("1/3", ["http://example.com/a/", "http://example.com/a/"]),
+                self.get_file("3/3", ["http://example.com/b/", "http://example.com/a/"]),
+            ]
+        )
+
+        self.assertEqual(
+            [row["url"] for row in rows],
+            ["http://example.com/a/", "http://example.com/a/", "http://example.com/b/"],
+        )
+        self.assertEqual(duplicate_count, 1)
+        self.assertEqual(missing_shards, ["2/3"])
+
+    def test_merge_different_shard_counts(self):
+        """Test that shards of different runs can't be combined."""
+        with self.assertRaises(ValueError):
+            merge_results([self.get_file("1/2", []), self.get_file("2/3", [])])
@@ -0,0 +1,78 @@
+from django.test import TestCase
+
+from wagtail_unveil.helpers.script_helpers import (
+    get_k6_script,
+    get_locust_script,
+    get_script_records,
+    get_url_path,
+    get_wrk_script,
+    lua_string,
+)
+
+
+class ScriptHelpersTests(TestCase):
+    def setUp(self):
+        self.urls = [
+            ("Page", "frontend", "http://localhost:8000/"),
+            ("Page", "edit", "http://localhost:8000/admin/pages/3/edit/", "OK"),
+            ("Page Search", "list", "http://localhost:8000/admin/pages/search/?q=Home"),
+            ("Page (again)", "frontend", "http://localhost:8000/"),
+        ]
+
+    def test_get_url_path(self):
+        """Test that the host is dropped and the query string kept."""
+        self.assertEqual(get_url_path("http://example.com"), "/")
+        self.assertEqual(get_url_path("http://example.com/a/?q=1"), "/a/?q=1")
+
+    def test_get_script_records(self):
+        """Test that each path is only requested once, with its first model name."""
+        self.assertEqual(
+            get_script_records(self.urls),
+            [
+                ("Page", "frontend", "/"),
+                ("Page", "edit", "/admin/pages/3/edit/"),
+                ("Page Search", "list", "/admin/pages/search/?q=Home"),
+            ],
+        )
+
+    def test_locust_script(self):
+        """Test that the Locust file is valid Python listing the URLs."""
+        script = get_locust_script(self.urls, "http://localhost:8000/", username="admin")
+
+        compile(script, "locustfile.py", "exec")
+        self.assertIn('["Page", "edit", "/admin/pages/3/edit/"],', script)
+        self.assertIn('USERNAME = os.environ.get("UNVEIL_USERNAME", "admin")', script)
+        self.assertIn("--host http://localhost:8000\n", script)
+
+    def test_k6_script(self):
+        """Test that the k6 script defaults to the base URL."""
+        script = get_k6_script(self.urls, "http://localhost:8000/")
+
+        self.assertIn('const BASE_URL = __ENV.BASE_URL || "http://localhost:8000";', script)
+        self.assertIn('["Page Search", "list", "/admin/pages/search/?q=Home"],', script)
+        self.assertIn('const USERNAME = __ENV.UNVEIL_USERNAME || "";', script)
+
+    def test_wrk_script(self):
+        """Test that the wrk script lists the paths as Lua strings."""
+        script = get_wrk_script(self.urls, "http://localhost:8000", username="admin")
+
+        self.assertIn('local paths = {\n  "/",\n  "/admin/pages/3/edit/",\n', script)
+        self.assertIn('os.getenv("UNVEIL_USERNAME") or "admin"', script)
+
+    def test_wrk_script_logs_in_before_load(self):
+        """Test that the wrk script logs in once in setup and measures admin URLs only."""
+        script = get_wrk_script(self.urls, "http://localhost:8000", username="admin")
+
+        self.assertIn("setup = function(thread)", script)
+        self.assertIn('thread:set("cookie", session_cookie)', script)
+        self.assertIn('wrk.format("GET", paths[math.random(#paths)], { ["Cookie"] = cookie })', script)
+        self.assertNotIn("response = function", script)
+
+    def test_lua_string(self):
+        """Test that quotes and backslashes are escaped."""
+        self.assertEqual(lua_string('a"b\\c'), '"a\\"b\\\\c"')
+
+    def test_no_urls(self):
+        """Test that the scripts are still valid without any URLs."""
+        compile(get_locust_script([], "http://localhost:8000"), "locustfile.py", "exec")
+        self.assertIn("const URLS = [\n];", get_k6_script([], "http://localhost:8000"))
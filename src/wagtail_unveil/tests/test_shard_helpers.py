@@ -0,0 +1,50 @@
+from django.test import TestCase
+
+from wagtail_unveil.helpers.shard_helpers import (
+    filter_shard,
+    get_shard_number,
+    parse_shard,
+)
+
+
+class ParseShardTests(TestCase):
+    def test_parse_shard(self):
+        """Test that i/N is parsed into numbers."""
+        self.assertEqual(parse_shard("2/4"), (2, 4))
+        self.assertEqual(parse_shard("1/1"), (1, 1))
+
+    def test_invalid_shard(self):
+        """Test that shards outside 1..N or not in i/N form are rejected."""
+        for value in ("2", "0/4", "5/4", "a/4", "1/0", "1/-2"):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    parse_shard(value)
+
+
+class FilterShardTests(TestCase):
+    def setUp(self):
+        self.urls = [
+            ("Page", "edit", f"http://example.com/admin/pages/{page_id}/edit/")
+            for page_id in range(200)
+        ]
+
+    def test_shards_are_disjoint_and_complete(self):
+        """Test that every URL is in exactly one shard and the shards are balanced."""
+        shards = [filter_shard(self.urls, shard, 4) for shard in range(1, 5)]
+
+        self.assertEqual(sorted(url for shard in shards for url in shard), sorted(self.urls))
+        for shard in shards:
+            self.assertGreater(len(shard), 25)
+
+    def test_shard_ignores_base_url(self):
+        """Test that the shard of a URL doesn't depend on the host it was generated for."""
+        self.assertEqual(
+            get_shard_number("http://localhost:8000/admin/pages/3/edit/?tab=a", 7),
+            get_shard_number("https://example.com/admin/pages/3/edit/?tab=a", 7),
+        )
+
+    def test_shard_keeps_order(self):
+        """Test that the URLs of a shard keep their discovery order."""
+        shard = filter_shard(self.urls, 1, 2)
+
+        self.assertEqual(shard, [url for url in self.urls if url in shard])
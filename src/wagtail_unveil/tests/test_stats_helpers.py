@@ -0,0 +1,100 @@
+from django.test import TestCase
+
+from wagtail_unveil.helpers.check_helpers import CheckResult
+from wagtail_unveil.helpers.stats_helpers import (
+    ColdWarmSummary,
+    LatencySummary,
+    format_ms,
+    format_size,
+    percentile,
+)
+
+
+class PercentileTests(TestCase):
+    def test_percentile(self):
+        """Test nearest-rank percentiles of sorted values."""
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 90), 90)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile(values, 100), 100)
+        self.assertEqual(percentile(values, 0), 1)
+
+    def test_percentile_no_values(self):
+        """Test that there is no percentile of an empty list."""
+        self.assertIsNone(percentile([], 50))
+
+
+class FormatTests(TestCase):
+    def test_format_ms(self):
+        """Test that durations in seconds are shown in milliseconds."""
+        self.assertEqual(format_ms(0.1234), "123.4ms")
+        self.assertEqual(format_ms(None), "-")
+
+    def test_format_size(self):
+        """Test that sizes use a readable unit."""
+        self.assertEqual(format_size(512), "512B")
+        self.assertEqual(format_size(2048), "2.0KB")
+        self.assertEqual(format_size(3 * 1024 * 1024), "3.0MB")
+        self.assertEqual(format_size(None), "-")
+
+
+class LatencySummaryTests(TestCase):
+    def setUp(self):
+        self.summary = LatencySummary(slowest_count=2)
+        self.summary.add("home.homepage (Home)", "edit", "http://example.com/admin/pages/3/edit/", CheckResult("OK", 200, total=0.3, ttfb=0.2, size=100))
+        self.summary.add("home.homepage (About)", "edit", "http://example.com/admin/pages/4/edit/", CheckResult("OK", 200, total=0.1, ttfb=0.05, size=100))
+        self.summary.add("home.homepage (Home)", "frontend", "http://example.com/", CheckResult("OK", 200, total=0.2, ttfb=0.1, size=100))
+        self.summary.add("Admin dashboard", "admin", "http://example.com/admin/", CheckResult("ERROR (timeout)"))
+
+    def test_group_stats(self):
+        """Test that timings are grouped per URL type and per model."""
+        by_type = {row[0]: row for row in self.summary.get_group_stats(self.summary.by_type)}
+        self.assertEqual(by_type["edit"], ("edit", 2, 0.1, 0.3, 0.3, 0.3))
+        self.assertEqual(by_type["frontend"], ("frontend", 1, 0.2, 0.2, 0.2, 0.2))
+        # Results without timings are ignored
+        self.assertNotIn("admin", by_type)
+
+        by_model = self.summary.get_group_stats(self.summary.by_model)
+        self.assertEqual(by_model, [("home.homepage", 3, 0.2, 0.3, 0.3, 0.3)])
+
+    def test_slowest_urls(self):
+        """Test that only the slowest URLs are kept, slowest first."""
+        lines = self.summary.get_report_lines()
+        slowest_index = lines.index("Slowest 2 URLs")
+        self.assertIn("http://example.com/admin/pages/3/edit/", lines[slowest_index + 2])
+        self.assertIn("http://example.com/ (frontend", lines[slowest_index + 3])
+        self.assertEqual(len(lines), slowest_index + 4)
+
+    def test_no_timings(self):
+        """Test the report when no response times were recorded."""
+        self.assertEqual(LatencySummary().get_report_lines(), ["No response times recorded"])
+
+
+class ColdWarmSummaryTests(TestCase):
+    def test_report_lines(self):
+        """Test that URLs are reported by cold to warm ratio, highest first."""
+        summary = ColdWarmSummary()
+        summary.add(
+            ("Page", "frontend", "http://example.com/"),
+            {"cold_time": 0.4, "warm_time": 0.1},
+        )
+        summary.add(
+            ("Page", "edit", "http://example.com/admin/pages/3/edit/"),
+            {"cold_time": 0.2, "warm_time": 0.2},
+        )
+        summary.add(("Page", "list", "http://example.com/admin/pages/"), {"queries": 3})
+
+        lines = summary.get_report_lines()
+
+        self.assertEqual(lines[1], f"{'edit':<20}      1    200.0ms    200.0ms    1.0x")
+        self.assertEqual(lines[2], f"{'frontend':<20}      1    400.0ms    100.0ms    4.0x")
+        self.assertEqual(lines[6], "   400.0ms    100.0ms    4.0x  http://example.com/ (frontend, Page)")
+        self.assertIn("(edit, Page)", lines[7])
+        self.assertEqual(len(lines), 8)
+
+    def test_no_times(self):
+        """Test the report when no cold and warm times were recorded."""
+        self.assertEqual(
+            ColdWarmSummary().get_report_lines(), ["No cold and warm times recorded"]
+        )
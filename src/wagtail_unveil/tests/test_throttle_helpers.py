@@ -0,0 +1,202 @@
+import threading
+import time
+from unittest.mock import patch
+from django.test import TestCase
+
+from wagtail_unveil.helpers.base import UrlRecord
+from wagtail_unveil.helpers.check_helpers import CheckResult
+from wagtail_unveil.helpers.throttle_helpers import (
+    AdaptiveLimiter,
+    Deadline,
+    DeadlineExceeded,
+    TokenBucket,
+    is_overload,
+)
+
+FAST = CheckResult(status="OK", status_code=200, total=0.1)
+SLOW = CheckResult(status="OK", status_code=200, total=2.0)
+
+
+class IsOverloadTests(TestCase):
+    def test_overload_results(self):
+        """Test that server errors, 429s, failed requests and slow responses are overload."""
+        self.assertTrue(is_overload(CheckResult(status="SERVER ERROR (503)", status_code=503, total=0.1), 0.5))
+        self.assertTrue(is_overload(CheckResult(status="ERROR (429)", status_code=429, total=0.1), 0.5))
+        self.assertTrue(is_overload(CheckResult(status="ERROR (Read timed out)", total=10), 0.5))
+        self.assertTrue(is_overload(SLOW, 0.5))
+        self.assertFalse(is_overload(FAST, 0.5))
+        self.assertFalse(is_overload(CheckResult(status="NOT FOUND", status_code=404, total=0.1), 0.5))
+
+
+class AdaptiveLimiterTests(TestCase):
+    def setUp(self):
+        self.url = "http://example.com/admin/pages/"
+
+    def release_many(self, limiter, result, count):
+        for _ in range(count):
+            limiter.release(limiter.acquire(self.url), result)
+
+    def test_additive_increase_up_to_ceiling(self):
+        """Test that the limit grows by one per limit's worth of fast responses, up to the ceiling."""
+        limiter = AdaptiveLimiter(4, latency_target=0.5)
+
+        self.release_many(limiter, FAST, 1)
+        self.assertEqual(limiter.limits["example.com"], 2)
+        self.release_many(limiter, FAST, 2)
+        self.assertEqual(limiter.limits["example.com"], 3)
+        self.release_many(limiter, FAST, 20)
+        self.assertEqual(limiter.limits["example.com"], 4)
+
+    def test_multiplicative_decrease(self):
+        """Test that the limit is halved on a slow response, and never drops below one."""
+        limiter = AdaptiveLimiter(8, latency_target=0.5, initial=8)
+
+        self.release_many(limiter, SLOW, 1)
+        self.assertEqual(limiter.limits["example.com"], 4)
+        self.release_many(limiter, SLOW, 5)
+        self.assertEqual(limiter.limits["example.com"], 1)
+        self.assertEqual(limiter.decreases["example.com"], 3)
+
+    def test_in_flight_requests_decrease_once(self):
+        """Test that requests started before a decrease don't decrease the limit again."""
+        limiter = AdaptiveLimiter(8, latency_target=0.5, initial=8)
+        tokens = [limiter.acquire(self.url) for _ in range(4)]
+
+        for token in tokens:
+            limiter.release(token, CheckResult(status="SERVER ERROR (502)", status_code=502, total=0.1))
+
+        self.assertEqual(limiter.limits["example.com"], 4)
+
+    def test_untimed_results_ignored(self):
+        """Test that cached results and exceptions leave the limit as it is."""
+        limiter = AdaptiveLimiter(8, latency_target=0.5, initial=2)
+
+        limiter.release(limiter.acquire(self.url), CheckResult(status="OK", status_code=200))
+        limiter.release(limiter.acquire(self.url), None)
+
+        self.assertEqual(limiter.limits["example.com"], 2)
+        self.assertEqual(limiter.active["example.com"], 0)
+
+    def test_limit_per_host(self):
+        """Test that each host has its own limit."""
+        limiter = AdaptiveLimiter(8, latency_target=0.5, initial=4)
+
+        limiter.release(limiter.acquire(self.url), SLOW)
+        limiter.release(limiter.acquire("http://www.example.com/"), FAST)
+
+        self.assertEqual(limiter.limits, {"example.com": 2, "www.example.com": 4.25})
+
+    def test_wrap_limits_concurrent_checks(self):
+        """Test that wrapped check functions never run more checks at once than the limit."""
+        limiter = AdaptiveLimiter(8, latency_target=0.5, initial=2)
+        lock = threading.Lock()
+        running = [0]
+        most_running = [0]
+
+        def check(record):
+            with lock:
+                running[0] += 1
+                most_running[0] = max(most_running[0], running[0])
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+            # Slow responses keep the limit from growing
+            return SLOW
+
+        limited_check = limiter.wrap(check)
+        record = UrlRecord("Page", "list", self.url)
+        threads = [threading.Thread(target=limited_check, args=(record,)) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertLessEqual(most_running[0], 2)
+        self.assertEqual(limiter.active["example.com"], 0)
+
+    def test_report(self):
+        """Test that the report lists the final and peak limit of each host."""
+        limiter = AdaptiveLimiter(4, latency_target=0.5)
+        self.assertEqual(limiter.get_report_lines(), ["No URLs checked with adaptive concurrency"])
+
+        self.release_many(limiter, FAST, 3)
+        self.release_many(limiter, SLOW, 1)
+
+        lines = limiter.get_report_lines()
+        self.assertIn("latency target: 500ms", lines[0])
+        self.assertEqual(lines[2].split(), ["example.com", "1", "3", "1"])
+
+
+class TokenBucketTests(TestCase):
+    def test_burst_then_rate(self):
+        """Test that a full bucket allows a burst, then a check per token refilled."""
+        with patch("wagtail_unveil.helpers.throttle_helpers.time.monotonic", return_value=100.0) as monotonic:
+            bucket = TokenBucket(2, burst=3)
+
+            self.assertEqual([bucket.get_wait() for _ in range(3)], [0, 0, 0])
+            self.assertEqual(bucket.get_wait(), 0.5)
+
+            monotonic.return_value = 100.5
+            self.assertEqual(bucket.get_wait(), 0)
+            self.assertEqual(bucket.get_wait(), 0.5)
+
+    def test_default_burst(self):
+        """Test that the burst defaults to one second's worth of checks."""
+        self.assertEqual(TokenBucket(2.5).burst, 3)
+        self.assertEqual(TokenBucket(0.2).burst, 1)
+
+    def test_wrap_waits_for_token(self):
+        """Test that wrapped check functions sleep until a token is available."""
+        bucket = TokenBucket(10, burst=1)
+        rate_limited_check = bucket.wrap(lambda record: FAST)
+
+        with patch.object(bucket, "get_wait", side_effect=[0.1, 0]), patch(
+            "wagtail_unveil.helpers.throttle_helpers.time.sleep"
+        ) as sleep:
+            self.assertEqual(rate_limited_check(UrlRecord("Page", "list", "http://example.com/")), FAST)
+
+        sleep.assert_called_once_with(0.1)
+
+
+class DeadlineTests(TestCase):
+    def setUp(self):
+        self.record = UrlRecord("Page", "list", "http://example.com/admin/pages/")
+
+    def test_timeout_cut_to_deadline(self):
+        """Test that request timeouts end by the deadline."""
+        deadline = Deadline(5)
+
+        self.assertEqual(deadline.get_timeout(2), 2)
+        self.assertLessEqual(deadline.get_timeout(10), 5)
+
+        deadline.ends_at = time.monotonic() - 1
+        self.assertTrue(deadline.expired)
+        with self.assertRaises(DeadlineExceeded):
+            deadline.get_timeout(10)
+
+    def test_wrap_stops_at_deadline(self):
+        """Test that no URL is checked once the deadline passed."""
+        checked = []
+        deadline = Deadline(60)
+        check_before_deadline = deadline.wrap(lambda record: checked.append(record) or FAST)
+
+        self.assertEqual(check_before_deadline(self.record), FAST)
+        deadline.ends_at = time.monotonic() - 1
+        with self.assertRaises(DeadlineExceeded):
+            check_before_deadline(self.record)
+        self.assertEqual(checked, [self.record])
+
+    def test_wrap_drops_failures_cut_by_deadline(self):
+        """Test that a request cut off by the deadline isn't reported as a failed URL."""
+        deadline = Deadline(60)
+        failed = CheckResult(status="ERROR (Read timed out.)", total=1)
+
+        def check(record):
+            deadline.ends_at = time.monotonic() - 1
+            return failed
+
+        with self.assertRaises(DeadlineExceeded):
+            deadline.wrap(check)(self.record)
+
+        deadline = Deadline(60)
+        self.assertEqual(deadline.wrap(lambda record: failed)(self.record), failed)
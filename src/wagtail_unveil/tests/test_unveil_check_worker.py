@@ -0,0 +1,42 @@
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from io import StringIO
+from unittest.mock import patch
+
+from wagtail_unveil.helpers.job_helpers import create_check_job, lease_batch
+from wagtail_unveil.models import CheckJob
+
+URLS = [
+    ("Admin dashboard", "admin", "http://example.com/admin/"),
+    ("Page", "frontend", "http://example.com/"),
+]
+
+
+@patch("wagtail_unveil.management.commands.unveil_check_worker.create_admin_session", return_value=None)
+class LoginFailureTests(TestCase):
+    def call(self):
+        call_command("unveil_check_worker", "--username", "u", "--password", "p", "--once", stdout=StringIO())
+
+    def test_only_worker_failing_to_log_in_fails_job(self, create_admin_session):
+        """Test that a job isn't left running when its only worker can't log in."""
+        job = create_check_job("http://example.com", 1, URLS)
+
+        with self.assertRaisesMessage(CommandError, f"check job #{job.pk} failed"):
+            self.call()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, CheckJob.STATUS_FAILED)
+        self.assertEqual(job.error, "Failed to authenticate with Wagtail admin at http://example.com")
+
+    def test_job_left_to_other_workers(self, create_admin_session):
+        """Test that a job other workers hold leases on is left as it is."""
+        job = create_check_job("http://example.com", 1, URLS)
+        lease_batch(job, "other", batch_size=1)
+
+        with self.assertRaisesMessage(CommandError, "left to the other workers"):
+            self.call()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, CheckJob.STATUS_PENDING)
+        self.assertEqual(job.results.filter(lease_owner="other").count(), 1)
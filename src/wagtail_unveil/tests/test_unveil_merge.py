@@ -0,0 +1,38 @@
+import os
+import tempfile
+from django.core.management import call_command
+from django.test import TestCase
+from io import StringIO
+
+from wagtail_unveil.helpers.base import UrlRecord
+from wagtail_unveil.helpers.check_helpers import CheckResult
+from wagtail_unveil.helpers.result_helpers import write_results
+
+
+class NotCheckedTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "shard-1.json")
+        write_results(
+            self.path,
+            "http://example.com",
+            [
+                (UrlRecord("Page", "edit", "http://example.com/a/"), CheckResult("OK", 200, total=0.1)),
+                (UrlRecord("Page", "edit", "http://example.com/b/"), CheckResult(None)),
+            ],
+            shard=(1, 1),
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_not_checked_urls_are_not_failures(self):
+        """Test that URLs left unchecked by a shard are counted apart from the failures."""
+        output = StringIO()
+        call_command("unveil_merge", self.path, "--fail-on-error", stdout=output)
+
+        summary = output.getvalue()
+        self.assertIn("Failed URLs: 0", summary)
+        self.assertIn("Not checked URLs: 1", summary)
+        self.assertIn("Success rate: 100.0%", summary)
+        self.assertNotIn("[None]", summary)
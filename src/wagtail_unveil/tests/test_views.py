@@ -0,0 +1,127 @@
+from collections import namedtuple
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from unittest.mock import patch
+
+from wagtail_unveil.models import CheckJob
+
+UrlEntry = namedtuple('UrlEntry', ['id', 'model_name', 'url_type', 'url'])
+
+# Admin pages are rendered without collecting static files first
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+
+class UnveilViewTestMixin:
+    def setUp(self):
+        self.user = get_user_model().objects.create_superuser(
+            username="admin", email="admin@example.com", password="password"
+        )
+        self.client.force_login(self.user)
+
+
+@override_settings(STORAGES=STORAGES)
+@patch('wagtail_unveil.views.UnveilReportView.get_queryset')
+class UnveilReportViewTests(UnveilViewTestMixin, TestCase):
+    def get_entries(self, count):
+        return [
+            UrlEntry(i, 'app.model', 'edit', f'http://localhost:8000/admin/pages/{i}/edit/')
+            for i in range(1, count + 1)
+        ]
+
+    @override_settings(WAGTAIL_UNVEIL_COMPACT_THRESHOLD=10)
+    def test_small_report_uses_full_rows(self, mock_get_queryset):
+        """Test that reports under the threshold render the full row markup."""
+        mock_get_queryset.return_value = self.get_entries(5)
+
+        response = self.client.get(reverse('unveil_report'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.context['compact'])
+        self.assertContains(response, '<use href="#icon-circle-check">', count=5)
+
+    @override_settings(WAGTAIL_UNVEIL_COMPACT_THRESHOLD=10)
+    def test_large_report_uses_compact_rows(self, mock_get_queryset):
+        """Test that reports over the threshold render compact rows in chunks."""
+        mock_get_queryset.return_value = self.get_entries(1200)
+
+        response = self.client.get(reverse('unveil_report'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['compact'])
+        self.assertEqual(
+            [len(chunk) for chunk in response.context['row_chunks']], [500, 500, 200]
+        )
+        self.assertContains(response, 'class="unveil-chunk"', count=3)
+        self.assertContains(response, '<td data-status></td>', count=1200)
+        # The first URL is the table's only tab stop
+        self.assertContains(response, '<td data-link tabindex="0">', count=1)
+        self.assertContains(response, '<td data-link>', count=1199)
+        self.assertNotContains(response, '<use href="#icon-circle-check">')
+
+    @override_settings(WAGTAIL_UNVEIL_COMPACT_THRESHOLD=0)
+    def test_compact_mode_disabled(self, mock_get_queryset):
+        """Test that a threshold of 0 disables compact mode."""
+        mock_get_queryset.return_value = self.get_entries(1200)
+
+        response = self.client.get(reverse('unveil_report'))
+
+        self.assertFalse(response.context['compact'])
+
+
+@override_settings(STORAGES=STORAGES)
+class UnveilCheckJobViewTests(UnveilViewTestMixin, TestCase):
+    def test_post_queues_job(self):
+        """Test that posting queues a job for the host serving the admin."""
+        response = self.client.post(reverse('unveil_check_jobs'))
+
+        self.assertEqual(response.status_code, 201)
+        job = CheckJob.objects.get()
+        self.assertEqual(job.base_url, 'http://testserver')
+        self.assertEqual(job.status, CheckJob.STATUS_PENDING)
+        self.assertEqual(response.json()['id'], job.pk)
+
+    def test_post_requires_superuser(self):
+        """Test that only superusers can queue jobs."""
+        self.user.is_superuser = False
+        self.user.save()
+        self.user.user_permissions.add(Permission.objects.get(codename='access_admin'))
+
+        response = self.client.post(reverse('unveil_check_jobs'))
+
+        # Wagtail redirects permission denied admin requests to the dashboard
+        self.assertRedirects(response, reverse('wagtailadmin_home'))
+        self.assertFalse(CheckJob.objects.exists())
+
+    def test_get_job_status(self):
+        """Test that the progress of a job is returned."""
+        job = CheckJob.objects.create(base_url='http://testserver', total_count=10, checked_count=5)
+
+        response = self.client.get(reverse('unveil_check_jobs'), {'job': job.pk})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['progress'], 50.0)
+
+    def test_get_requires_superuser(self):
+        """Test that only superusers can see the progress of jobs."""
+        CheckJob.objects.create(base_url='http://testserver', total_count=10, checked_count=5)
+        self.user.is_superuser = False
+        self.user.save()
+        self.user.user_permissions.add(Permission.objects.get(codename='access_admin'))
+
+        response = self.client.get(reverse('unveil_check_jobs'))
+
+        self.assertRedirects(response, reverse('wagtailadmin_home'))
+
+    def test_get_unknown_job(self):
+        """Test that unknown or invalid job IDs return a 404."""
+        self.assertEqual(
+            self.client.get(reverse('unveil_check_jobs'), {'job': 'abc'}).status_code, 404
+        )
+        self.assertEqual(
+            self.client.get(reverse('unveil_check_jobs'), {'job': 999}).status_code, 404
+        )
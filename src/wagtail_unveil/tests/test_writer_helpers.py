@@ -0,0 +1,163 @@
+import csv
+import io
+import json
+import os
+import tempfile
+from xml.etree import ElementTree
+from django.core.management.color import color_style
+from django.test import TestCase
+
+from wagtail_unveil.helpers.base import UrlRecord, get_url_id
+from wagtail_unveil.helpers.check_helpers import CheckResult
+from wagtail_unveil.helpers.writer_helpers import (
+    CSV_RESULT_FIELDS,
+    CsvWriter,
+    JUnitWriter,
+    NdjsonWriter,
+    TextWriter,
+)
+
+
+class TextWriterTests(TestCase):
+    def setUp(self):
+        self.writer = TextWriter()
+
+    def tearDown(self):
+        self.writer.close()
+
+    def get_lines(self, style=None):
+        lines = []
+        self.writer.write(lines.append, style)
+        return lines
+
+    def test_sections(self):
+        """Test that URLs are grouped into their sections whatever order they arrive in."""
+        self.writer.add(("BlogPage", "edit", "http://example.com/admin/pages/3/edit/"), CheckResult("OK", 200))
+        self.writer.add(("BlogPage", "frontend", "http://example.com/blog/"), CheckResult("OK", 200))
+        self.writer.add(("Image", "list", "http://example.com/admin/images/"), CheckResult("ERROR (500)", 500))
+        self.writer.add(("Settings", "settings", "http://example.com/admin/settings/"), CheckResult("OK", 200))
+
+        lines = self.get_lines()
+
+        self.assertEqual(
+            lines,
+            [
+                "=" * 50,
+                "FRONTEND URLS",
+                "=" * 50,
+                "BlogPage: http://example.com/blog/ [OK]",
+                "\n" + "=" * 50,
+                "BACKEND URLS",
+                "=" * 50,
+                "\n" + "-" * 25 + " LIST " + "-" * 25,
+                "Image: http://example.com/admin/images/ [ERROR (500)]",
+                "\n" + "-" * 25 + " EDIT " + "-" * 25,
+                "BlogPage: http://example.com/admin/pages/3/edit/ [OK]",
+                "\n" + "-" * 25 + " OTHER " + "-" * 25,
+                "Settings: http://example.com/admin/settings/ [OK]",
+            ],
+        )
+        self.assertEqual(self.writer.count, 4)
+
+    def test_unchecked_urls(self):
+        """Test that URLs without a status are written without one."""
+        self.writer.add(("BlogPage", "frontend", "http://example.com/blog/"))
+
+        self.assertEqual(self.get_lines()[3], "BlogPage: http://example.com/blog/")
+
+    def test_styled_output(self):
+        """Test that the console output starts with a blank line and colours the statuses."""
+        style = color_style(force_color=True)
+        self.writer.add(("Image", "list", "http://example.com/admin/images/"), CheckResult("ERROR (500)", 500))
+
+        lines = self.get_lines(style)
+
+        self.assertEqual(lines[0], "\n" + "=" * 50)
+        self.assertEqual(lines[1], style.SUCCESS("FRONTEND URLS"))
+        self.assertEqual(lines[-1], f"Image: http://example.com/admin/images/ {style.ERROR('[ERROR (500)]')}")
+
+
+class StructuredWriterTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, writer_class, results):
+        path = os.path.join(self.directory.name, "output")
+        writer = writer_class(path, "http://example.com", shard=(1, 2))
+        for record, result in results:
+            writer.add(record, result)
+        writer.close()
+        # Closing again, as the command does when it stops, leaves the file as it is
+        writer.close()
+        self.assertEqual(writer.count, len(results))
+        with open(path) as f:
+            return f.read()
+
+    def test_ndjson(self):
+        """Test that each URL is written as one JSON line with its check result."""
+        content = self.write(
+            NdjsonWriter,
+            [
+                (("BlogPage", "edit", "http://example.com/admin/pages/3/edit/"), CheckResult("OK", 200, total=0.1)),
+                (("BlogPage", "frontend", "http://example.com/blog/"), None),
+            ],
+        )
+
+        first, second = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(first["status"], "OK")
+        self.assertEqual(first["total"], 0.1)
+        self.assertEqual(
+            second,
+            {
+                "model_name": "BlogPage",
+                "url_type": "frontend",
+                "url": "http://example.com/blog/",
+                "url_id": get_url_id("http://example.com/blog/"),
+            },
+        )
+
+    def test_csv(self):
+        """Test that the CSV has a header and one row per URL, without the nested metrics."""
+        content = self.write(
+            CsvWriter,
+            [
+                (
+                    ("BlogPage", "edit", "http://example.com/admin/pages/3/edit/"),
+                    CheckResult("ERROR (500)", 500, total=0.25, metrics={"queries": 3}),
+                ),
+                (("BlogPage", "frontend", "http://example.com/blog/"), None),
+            ],
+        )
+
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(list(rows[0]), [*UrlRecord._fields, "url_id", *CSV_RESULT_FIELDS])
+        self.assertEqual(rows[0]["status_code"], "500")
+        self.assertEqual(rows[0]["total"], "0.25")
+        self.assertEqual(rows[1]["status"], "")
+
+    def test_junit(self):
+        """Test that URLs are testcases grouped into a testsuite per URL type."""
+        content = self.write(
+            JUnitWriter,
+            [
+                (("BlogPage", "edit", "http://example.com/admin/pages/3/edit/"), CheckResult("OK", 200, total=0.5)),
+                (("BlogPage <3>", "edit", "http://example.com/admin/pages/4/edit/?a=1&b=2"), CheckResult("ERROR (500)", 500, total=0.25)),
+                (("BlogPage", "frontend", "http://example.com/blog/"), None),
+            ],
+        )
+
+        root = ElementTree.fromstring(content)
+        self.assertEqual(root.get("name"), "wagtail-unveil http://example.com shard 1/2")
+        self.assertEqual((root.get("tests"), root.get("failures"), root.get("skipped")), ("3", "1", "1"))
+        edit, frontend = root.findall("testsuite")
+        self.assertEqual(edit.get("name"), "edit")
+        self.assertEqual(edit.get("time"), "0.750000")
+        passed, failed = edit.findall("testcase")
+        self.assertIsNone(passed.find("failure"))
+        self.assertEqual(failed.get("name"), "http://example.com/admin/pages/4/edit/?a=1&b=2")
+        self.assertEqual(failed.get("classname"), "BlogPage <3>")
+        self.assertEqual(failed.find("failure").get("message"), "ERROR (500)")
+        self.assertIsNotNone(frontend.find("testcase/skipped"))
@@ -3,12 +3,19 @@ from collections import namedtuple
 from io import StringIO
 from wagtail.admin.widgets.button import HeaderButton
 from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, JsonResponse
+from django.middleware.csrf import get_token
+from django.urls import reverse
+from django.views import View
 
 from .helpers.page_helpers import get_page_urls
 from .helpers.snippet_helpers import get_snippet_urls, get_modelviewset_urls
 from .helpers.modeladmin_helpers import get_modeladmin_urls
 from .helpers.settings_helpers import get_settings_admin_urls
 from .helpers.media_helpers import get_image_admin_urls, get_document_admin_urls
+from .helpers.job_helpers import create_check_job, get_job_summary
+from .models import CheckJob
 
 
 class UnveilReportView(ReportView):
@@ -31,6 +38,8 @@ class UnveilReportView(ReportView):
         "url": "URL",
     }
     paginate_by = None
+    # Rows per <tbody> in compact mode, the browser skips rendering off-screen chunks
+    compact_chunk_size = 500
     
     def get_header_buttons(self):
          return [
@@ -39,10 +48,35 @@ class UnveilReportView(ReportView):
                 icon_name="link",
                 attrs={
                     "data-action": "check-urls",
+                    # Number of URLs the report checks at the same time
+                    "data-concurrency": getattr(settings, "WAGTAIL_UNVEIL_CHECK_CONCURRENCY", 6),
+                },
+            ),
+            HeaderButton(
+                label="Run Checks in Background",
+                icon_name="resubmit",
+                attrs={
+                    "data-action": "queue-check-job",
+                    "data-job-url": reverse("unveil_check_jobs"),
+                    "data-csrf-token": get_token(self.request),
                 },
             ),
         ]
 
+    def get_context_data(self, *args, **kwargs):
+        context = super().get_context_data(*args, **kwargs)
+        # Large reports use a lighter row markup split into chunks
+        # 0 disables compact mode
+        compact_threshold = getattr(settings, "WAGTAIL_UNVEIL_COMPACT_THRESHOLD", 1000)
+        object_list = list(context["object_list"])
+        context["compact"] = bool(compact_threshold) and len(object_list) > compact_threshold
+        if context["compact"]:
+            context["row_chunks"] = [
+                object_list[i:i + self.compact_chunk_size]
+                for i in range(0, len(object_list), self.compact_chunk_size)
+            ]
+        return context
+
     def get_filterset_kwargs(self):
         # Get the base queryset and pass it to the filterset
         kwargs = super().get_filterset_kwargs()
@@ -114,3 +148,33 @@ class UnveilReportView(ReportView):
             counter += 1
             
         return all_urls
+
+
+class UnveilCheckJobView(View):
+    """
+    Queue a background check job (POST) or return the progress of one (GET).
+    Jobs are run by the unveil_check_worker management command. Both are
+    limited to superusers, as job results list every admin URL.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if not request.user.is_superuser:
+            raise PermissionDenied
+        return super().dispatch(request, *args, **kwargs)
+
+    def post(self, request, *args, **kwargs):
+        max_instances = getattr(settings, 'WAGTAIL_UNVEIL_MAX_INSTANCES', 1)
+        # Check against the host serving the admin, the worker discovers the URLs
+        base_url = request.build_absolute_uri("/").rstrip("/")
+        job = create_check_job(base_url, max_instances)
+        return JsonResponse(get_job_summary(job), status=201)
+
+    def get(self, request, *args, **kwargs):
+        job_id = request.GET.get("job", "")
+        if job_id and not job_id.isdigit():
+            raise Http404("Invalid check job ID")
+        jobs = CheckJob.objects.all()
+        job = jobs.filter(pk=job_id).first() if job_id else jobs.first()
+        if job is None:
+            raise Http404("No check job found")
+        return JsonResponse(get_job_summary(job))
@@ -3,7 +3,7 @@ from django.urls import path, reverse
 from wagtail.admin.menu import AdminOnlyMenuItem
 from wagtail import hooks
 
-from .views import UnveilReportView
+from .views import UnveilCheckJobView, UnveilReportView
 
 
 @hooks.register("register_reports_menu_item")
@@ -36,5 +36,10 @@ def register_admin_urls():
             UnveilReportView.as_view(results_only=True),
             name="unveil_report_results",
         ),
+        path(
+            "unveil/report/jobs/",
+            UnveilCheckJobView.as_view(),
+            name="unveil_check_jobs",
+        ),
     ]
 